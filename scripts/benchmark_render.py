@@ -0,0 +1,305 @@
+import argparse
+import json
+import math
+import multiprocessing
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import wave
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from tiktok_bot.adapters.video.factory import RENDERER_NAMES
+from tiktok_bot.ports.video import RENDER_MODES
+
+DEFAULT_CASES = ("3x1200x1800", "10x4000x3000", "30x2000x1500")
+STAGES = ("decode", "resize", "composite", "encode", "mux")
+
+
+@dataclass(frozen=True)
+class BenchmarkCase:
+    image_count: int
+    source_width: int
+    source_height: int
+
+    @property
+    def label(self) -> str:
+        return f"{self.image_count}x{self.source_width}x{self.source_height}"
+
+
+def _parse_case(value: str) -> BenchmarkCase:
+    try:
+        count, width, height = (int(part) for part in value.lower().split("x"))
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(
+            f"Expected COUNTxWIDTHxHEIGHT, got {value!r}"
+        ) from exc
+    return BenchmarkCase(count, width, height)
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark renderers on synthetic image folders."
+    )
+    parser.add_argument(
+        "--case",
+        dest="cases",
+        action="append",
+        type=_parse_case,
+        default=None,
+        help=(
+            "Image set as COUNTxWIDTHxHEIGHT; repeatable "
+            f"(default: {', '.join(DEFAULT_CASES)})."
+        ),
+    )
+    parser.add_argument(
+        "--renderer",
+        dest="renderers",
+        action="append",
+        choices=RENDERER_NAMES,
+        default=None,
+        help="Renderer to benchmark; repeatable (default: all).",
+    )
+    parser.add_argument(
+        "--render-mode",
+        choices=RENDER_MODES,
+        default="single",
+        help="Render mode passed to the renderers that support it.",
+    )
+    parser.add_argument("--width", type=int, default=1080)
+    parser.add_argument("--height", type=int, default=1920)
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument(
+        "--no-music",
+        dest="include_music",
+        action="store_false",
+        help="Render without the synthetic music track.",
+    )
+    parser.add_argument(
+        "--no-streaming",
+        dest="streaming",
+        action="store_false",
+        help="Hold every decoded frame in memory (MoviePy renderer only).",
+    )
+    parser.add_argument(
+        "--output",
+        default=str(ROOT / "outputs" / "benchmarks" / "render.json"),
+        help="Where to write the JSON results.",
+    )
+    return parser.parse_args()
+
+
+def _write_synthetic_images(case: BenchmarkCase, directory: Path) -> None:
+    import numpy as np
+    from PIL import Image
+
+    directory.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(case.image_count)
+    y, x = np.meshgrid(
+        np.linspace(0, 1, case.source_height, dtype=np.float32),
+        np.linspace(0, 1, case.source_width, dtype=np.float32),
+        indexing="ij",
+    )
+    for index in range(case.image_count):
+        phase = index / max(case.image_count, 1)
+        channels = [
+            (x + phase) % 1.0,
+            (y + 2 * phase) % 1.0,
+            0.5 + 0.5 * np.sin(8 * math.pi * (x * y + phase)),
+        ]
+        image = np.stack(channels, axis=-1) * 200
+        image += rng.integers(0, 55, size=image.shape, dtype=np.uint8)
+        Image.fromarray(image.astype(np.uint8)).save(
+            directory / f"{index + 1:06d}.jpg", quality=90
+        )
+
+
+def _write_synthetic_music(path: Path, seconds: float = 20.0, rate: int = 44100) -> None:
+    import numpy as np
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    t = np.arange(int(seconds * rate)) / rate
+    tone = 0.3 * np.sin(2 * math.pi * 220 * t) + 0.2 * np.sin(2 * math.pi * 330 * t)
+    samples = (tone * 32767).astype("<i2")
+    with wave.open(str(path), "wb") as handle:
+        handle.setnchannels(1)
+        handle.setsampwidth(2)
+        handle.setframerate(rate)
+        handle.writeframes(samples.tobytes())
+
+
+def _run_case(
+    renderer_name: str,
+    render_mode: str,
+    image_dir: Path,
+    music_dir: Path,
+    output_path: Path,
+    width: int,
+    height: int,
+    fps: int,
+    include_music: bool,
+    streaming: bool,
+) -> dict:
+    from tiktok_bot.adapters.video.factory import create_renderer
+    from tiktok_bot.domain.models import RenderConfig
+    from tiktok_bot.utils.telemetry import collect_timings
+    from tiktok_bot.workflows.build_video import build_video, choose_images
+
+    config = RenderConfig(
+        width=width,
+        height=height,
+        fps=fps,
+        include_music=include_music,
+        music_dir=music_dir,
+        renderer=renderer_name,
+        render_mode=render_mode,
+        reuse_renders=False,
+        streaming=streaming,
+        # Render every synthetic image, so large cases keep their image count.
+        dedupe_images=False,
+        cap_images=False,
+    )
+    images_rendered = len(choose_images(image_dir, config))
+    renderer = create_renderer(renderer_name)
+    with collect_timings() as timings:
+        started = time.perf_counter()
+        build_video(image_dir, output_path, renderer, config)
+        wall = time.perf_counter() - started
+
+    frames = _count_frames(output_path)
+    return {
+        "images_rendered": images_rendered,
+        "wall_s": round(wall, 3),
+        "frames": frames,
+        "frames_per_s": round(frames / wall, 2) if wall > 0 else None,
+        "stages_s": {stage: round(timings.seconds.get(stage, 0.0), 3) for stage in STAGES},
+        "peak_rss_mb": _max_rss_mb(resource.RUSAGE_SELF),
+        "peak_child_rss_mb": _max_rss_mb(resource.RUSAGE_CHILDREN),
+    }
+
+
+def _count_frames(path: Path) -> int:
+    from tiktok_bot.adapters.video.ffmpeg_tools import find_ffmpeg
+
+    result = subprocess.run(
+        [
+            find_ffmpeg(),
+            "-loglevel",
+            "error",
+            "-i",
+            str(path),
+            "-map",
+            "0:v:0",
+            "-c",
+            "copy",
+            "-f",
+            "framecrc",
+            "-",
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+    )
+    return sum(
+        1 for line in result.stdout.splitlines() if line and not line.startswith("#")
+    )
+
+
+def _max_rss_mb(who: int) -> float:
+    return round(resource.getrusage(who).ru_maxrss / 1024, 1)
+
+
+def _git_commit() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def main() -> None:
+    args = _parse_args()
+    cases = args.cases or [_parse_case(value) for value in DEFAULT_CASES]
+    renderers = list(dict.fromkeys(args.renderers or RENDERER_NAMES))
+    output = Path(args.output)
+    if not output.is_absolute():
+        output = ROOT / output
+
+    results = []
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory(prefix="tiktok-bot-bench-") as work:
+        work_dir = Path(work)
+        music_dir = work_dir / "music"
+        _write_synthetic_music(music_dir / "synthetic.wav")
+        for case in cases:
+            image_dir = work_dir / case.label
+            # Generated out of process: peak RSS survives exec, so a large
+            # parent would inflate every run's figure.
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                executor.submit(_write_synthetic_images, case, image_dir).result()
+            for renderer_name in renderers:
+                print(f"Benchmarking {renderer_name} on {case.label}...")
+                entry = {
+                    "renderer": renderer_name,
+                    "render_mode": args.render_mode,
+                    "case": case.label,
+                    "images": case.image_count,
+                    "source_size": [case.source_width, case.source_height],
+                    "output_size": [args.width, args.height],
+                    "fps": args.fps,
+                    "music": args.include_music,
+                    "streaming": args.streaming,
+                }
+                # A fresh process per run keeps peak RSS figures independent.
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                    future = executor.submit(
+                        _run_case,
+                        renderer_name,
+                        args.render_mode,
+                        image_dir,
+                        music_dir,
+                        work_dir / f"{case.label}-{renderer_name}.mp4",
+                        args.width,
+                        args.height,
+                        args.fps,
+                        args.include_music,
+                        args.streaming,
+                    )
+                    try:
+                        entry.update(future.result())
+                    except Exception as exc:
+                        entry["error"] = f"{type(exc).__name__}: {exc}"
+                print(json.dumps(entry))
+                results.append(entry)
+
+    report = {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": multiprocessing.cpu_count(),
+        "results": results,
+    }
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"Wrote benchmark results to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,13 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from tiktok_bot.cli import main
+
+# Same as `tiktok-bot schedule-daemon`, run against this checkout.
+if __name__ == "__main__":
+    main(["schedule-daemon", *sys.argv[1:]], root=ROOT)
@@ -0,0 +1,160 @@
+import contextvars
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, Sequence
+from urllib.parse import urljoin, urlparse
+
+from ...domain.models import ImageFetchRequest
+from ...ports.image_fetcher import ImageFetcher
+from ...utils.http import ConnectionPool
+from ...utils.paths import SUPPORTED_IMAGE_EXTS
+from ...utils.telemetry import span
+
+_MAX_REDIRECTS = 5
+_RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+
+
+class DownloadError(Exception):
+    def __init__(self, message: str, retryable: bool = True) -> None:
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class HttpImageFetcher(ImageFetcher):
+    def __init__(
+        self,
+        max_workers: int = 8,
+        timeout: float = 30.0,
+        retries: int = 2,
+        chunk_size: int = 64 * 1024,
+    ) -> None:
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1.")
+        self._max_workers = max_workers
+        self._timeout = timeout
+        self._retries = retries
+        self._chunk_size = chunk_size
+
+    def fetch(self, request: ImageFetchRequest) -> Sequence[Path]:
+        request.output_dir.mkdir(parents=True, exist_ok=True)
+        jobs = [
+            (index, url)
+            for index, url in enumerate(request.image_urls, start=1)
+            if url
+        ][: request.max_num]
+        if not jobs:
+            return []
+
+        pool = ConnectionPool(timeout=self._timeout)
+        try:
+            with span("download_images", urls=len(jobs)) as current, ThreadPoolExecutor(
+                max_workers=min(self._max_workers, len(jobs))
+            ) as executor:
+                futures = [
+                    executor.submit(
+                        contextvars.copy_context().run,
+                        self._download,
+                        pool,
+                        index,
+                        url,
+                        request.output_dir,
+                    )
+                    for index, url in jobs
+                ]
+                results = [future.result() for future in futures]
+                downloaded = [path for path in results if path is not None]
+                current.set(
+                    images=len(downloaded),
+                    bytes=sum(path.stat().st_size for path in downloaded),
+                )
+        finally:
+            pool.close()
+        return downloaded
+
+    def _download(
+        self, pool: ConnectionPool, index: int, url: str, output_dir: Path
+    ) -> Optional[Path]:
+        with span("download", url=url) as current:
+            for attempt in range(self._retries + 1):
+                current.set(attempts=attempt + 1)
+                try:
+                    path = self._download_once(pool, index, url, output_dir)
+                    current.set(bytes=path.stat().st_size)
+                    return path
+                except DownloadError as exc:
+                    error: Exception = exc
+                    if not exc.retryable:
+                        break
+                except (OSError, ValueError) as exc:
+                    error = exc
+                if attempt < self._retries:
+                    time.sleep(0.5 * 2**attempt)
+            current.set(failed=str(error))
+        print(f"Failed to download {url}: {error}", file=sys.stderr)
+        return None
+
+    def _download_once(
+        self, pool: ConnectionPool, index: int, url: str, output_dir: Path
+    ) -> Path:
+        deadline = time.monotonic() + self._timeout
+        current_url = url
+        for _ in range(_MAX_REDIRECTS + 1):
+            with pool.open("GET", current_url, headers={"Accept": "image/*"}) as response:
+                if response.status in (301, 302, 303, 307, 308):
+                    location = response.getheader("Location")
+                    if not location:
+                        raise DownloadError(f"Redirect without Location ({response.status})")
+                    current_url = urljoin(current_url, location)
+                    continue
+                if response.status != 200:
+                    raise DownloadError(
+                        f"HTTP {response.status} {response.reason}",
+                        retryable=response.status in _RETRY_STATUSES,
+                    )
+                ext = _choose_extension(
+                    current_url, response.getheader("Content-Type", "")
+                )
+                output_path = output_dir / f"{index:03d}{ext}"
+                part_path = output_dir / f".{index:03d}.part"
+                try:
+                    self._stream_to_file(response, part_path, deadline)
+                    part_path.replace(output_path)
+                finally:
+                    part_path.unlink(missing_ok=True)
+                return output_path
+        raise DownloadError("Too many redirects", retryable=False)
+
+    def _stream_to_file(self, response, path: Path, deadline: float) -> None:
+        expected = response.getheader("Content-Length")
+        received = 0
+        with path.open("wb") as handle:
+            while True:
+                chunk = response.read(self._chunk_size)
+                if not chunk:
+                    break
+                handle.write(chunk)
+                received += len(chunk)
+                if time.monotonic() > deadline:
+                    raise DownloadError(f"Timed out after {self._timeout:.0f}s")
+        if expected is not None and expected.isdigit() and received != int(expected):
+            raise DownloadError(f"Incomplete body: {received} of {expected} bytes")
+
+
+def _choose_extension(url: str, content_type: str) -> str:
+    ext = Path(urlparse(url).path).suffix.lower()
+    if ext in SUPPORTED_IMAGE_EXTS:
+        return ext
+    content_type = content_type.lower()
+    if "png" in content_type:
+        return ".png"
+    if "webp" in content_type:
+        return ".webp"
+    if "bmp" in content_type:
+        return ".bmp"
+    if "tiff" in content_type:
+        return ".tiff"
+    if "jpeg" in content_type or "jpg" in content_type:
+        return ".jpg"
+    return ".jpg"
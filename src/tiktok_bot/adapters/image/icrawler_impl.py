@@ -6,6 +6,7 @@ from icrawler.builtin import BaiduImageCrawler, BingImageCrawler, GoogleImageCra
 from ...domain.models import ImageFetchRequest
 from ...ports.image_fetcher import ImageFetcher
 from ...utils.paths import list_image_files
+from ...utils.telemetry import span
 
 _CRAWLERS = {
     "bing": BingImageCrawler,
@@ -23,6 +24,13 @@ class ICrawlerImageFetcher(ImageFetcher):
     def fetch(self, request: ImageFetchRequest) -> Sequence[Path]:
         request.output_dir.mkdir(parents=True, exist_ok=True)
         crawler_cls = _CRAWLERS[self._provider]
-        crawler = crawler_cls(storage={"root_dir": str(request.output_dir)})
-        crawler.crawl(keyword=request.query, max_num=request.max_num)
-        return list_image_files(request.output_dir)
+        with span(
+            "crawl", provider=self._provider, query=request.query, max_num=request.max_num
+        ) as current:
+            crawler = crawler_cls(storage={"root_dir": str(request.output_dir)})
+            crawler.crawl(keyword=request.query, max_num=request.max_num)
+            images = list_image_files(request.output_dir)
+            current.set(
+                images=len(images), bytes=sum(path.stat().st_size for path in images)
+            )
+        return images
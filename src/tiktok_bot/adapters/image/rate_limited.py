@@ -0,0 +1,23 @@
+import threading
+from pathlib import Path
+from typing import Sequence
+
+from ...domain.models import ImageFetchRequest
+from ...ports.image_fetcher import ImageFetcher
+from ...utils.rate_limit import TokenBucket
+
+
+class RateLimitedImageFetcher(ImageFetcher):
+    def __init__(
+        self, fetcher: ImageFetcher, bucket: TokenBucket, max_concurrent: int = 1
+    ) -> None:
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1.")
+        self._fetcher = fetcher
+        self._bucket = bucket
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+
+    def fetch(self, request: ImageFetchRequest) -> Sequence[Path]:
+        with self._slots:
+            self._bucket.acquire()
+            return self._fetcher.fetch(request)
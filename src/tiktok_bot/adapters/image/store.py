@@ -0,0 +1,247 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+from dataclasses import asdict, replace
+from pathlib import Path
+from typing import Optional, Sequence
+
+from PIL import Image
+
+from ...domain.models import ImageFetchRequest, ImageInfo, RenderConfig
+from ...ports.image_catalog import ImageCatalog
+from ...ports.image_fetcher import ImageFetcher
+from ...utils.hashing import file_sha256
+from ...utils.image_hash import dhash, laplacian_variance, load_thumbnail, oriented_size
+from ...utils.telemetry import span
+
+_FORMAT_SUFFIXES = {
+    "JPEG": ".jpg",
+    "PNG": ".png",
+    "WEBP": ".webp",
+    "BMP": ".bmp",
+    "TIFF": ".tiff",
+}
+
+
+class ImageStore(ImageCatalog):
+    """Images stored once by SHA-256, with metadata computed at ingest.
+
+    Location folders hold hard links into ``blobs/`` (copies where the file
+    system cannot link), so a photo found under many locations is stored,
+    decoded and hashed once. ``urls/`` remembers which blob each download
+    URL produced, so a URL seen before is linked instead of downloaded.
+    Image selection reads the recorded size, hash and sharpness instead of
+    decoding the image again.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self._root = root
+        self._lock = threading.Lock()
+        self._infos: dict[str, ImageInfo] = {}
+
+    def ingest(self, path: Path, url: Optional[str] = None) -> ImageInfo:
+        """Store ``path`` and turn it into a link to its blob."""
+        sha256 = file_sha256(path)
+        info = self.info(sha256)
+        known = info is not None and not _outdated(info)
+        if not known:
+            with span("ingest_image", image=path.name) as current:
+                info = describe_image(path, sha256)
+                current.set(decodes=info.decodes)
+        blob_path = self._blob_path(info)
+        if blob_path.exists():
+            _link(blob_path, path)
+        else:
+            self._add_blob(path, blob_path)
+        if not known:
+            # Written after the blob, so metadata always has its blob.
+            self._write_json(self._info_path(sha256), asdict(info))
+            with self._lock:
+                self._infos[sha256] = info
+        if url:
+            self._write_json(self._url_path(url), {"url": url, "sha256": sha256})
+        return info
+
+    def info(self, sha256: str) -> Optional[ImageInfo]:
+        with self._lock:
+            cached = self._infos.get(sha256)
+        if cached is not None:
+            return cached
+        data = self._read_json(self._info_path(sha256))
+        if data is None:
+            return None
+        try:
+            info = ImageInfo(**data)
+        except TypeError:
+            return None
+        with self._lock:
+            self._infos[sha256] = info
+        return info
+
+    def info_for(self, path: Path) -> Optional[ImageInfo]:
+        """Metadata of the stored copy of ``path``, if it was ingested."""
+        return self.info(file_sha256(path))
+
+    def lookup_url(self, url: str) -> Optional[ImageInfo]:
+        data = self._read_json(self._url_path(url))
+        if data is None or data.get("url") != url:
+            return None
+        info = self.info(str(data.get("sha256")))
+        if info is None or not self._blob_path(info).exists():
+            return None
+        return info
+
+    def link(self, info: ImageInfo, dest: Path) -> Path:
+        """Link the blob of ``info`` to ``dest``, with the blob's suffix."""
+        blob_path = self._blob_path(info)
+        dest = dest.with_suffix(blob_path.suffix)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        _link(blob_path, dest)
+        return dest
+
+    def _add_blob(self, path: Path, blob_path: Path) -> None:
+        blob_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = blob_path.with_name(
+            f".{blob_path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        try:
+            os.link(path, temp_path)
+        except OSError:
+            # Another file system: the store keeps its own copy.
+            shutil.copyfile(path, temp_path)
+        # Concurrent ingests of the same content write identical blobs.
+        os.replace(temp_path, blob_path)
+
+    def _blob_path(self, info: ImageInfo) -> Path:
+        suffix = _FORMAT_SUFFIXES.get(info.format or "", ".img")
+        return self._root / "blobs" / info.sha256[:2] / f"{info.sha256}{suffix}"
+
+    def _info_path(self, sha256: str) -> Path:
+        return self._root / "blobs" / sha256[:2] / f"{sha256}.json"
+
+    def _url_path(self, url: str) -> Path:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self._root / "urls" / key[:2] / f"{key}.json"
+
+    def _read_json(self, path: Path) -> Optional[dict]:
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return data if isinstance(data, dict) else None
+
+    def _write_json(self, path: Path, data: dict) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(
+            f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        temp_path.write_text(json.dumps(data), encoding="utf-8")
+        os.replace(temp_path, path)
+
+
+class StoredImageFetcher(ImageFetcher):
+    """Routes a fetcher's downloads through an ``ImageStore``.
+
+    URLs the store has seen are linked from it and not downloaded again.
+    Every new file is ingested; files that do not decode and repeats of an
+    image already in the folder are removed from it.
+    """
+
+    def __init__(self, fetcher: ImageFetcher, store: ImageStore) -> None:
+        self._fetcher = fetcher
+        self._store = store
+
+    def fetch(self, request: ImageFetchRequest) -> Sequence[Path]:
+        request.output_dir.mkdir(parents=True, exist_ok=True)
+        linked: dict[Path, ImageInfo] = {}
+        urls: dict[int, str] = {}
+        if request.image_urls:
+            # Same numbering as HttpImageFetcher, which names files by the
+            # URL's position; known URLs are blanked so it skips them.
+            jobs = [
+                (index, url)
+                for index, url in enumerate(request.image_urls, start=1)
+                if url
+            ][: request.max_num]
+            remaining = [""] * len(request.image_urls)
+            for index, url in jobs:
+                info = self._store.lookup_url(url)
+                if info is not None and info.decodes:
+                    path = self._store.link(info, request.output_dir / f"{index:03d}")
+                    linked[path] = info
+                else:
+                    remaining[index - 1] = url
+                    urls[index] = url
+            request = replace(request, image_urls=remaining, max_num=len(urls))
+
+        with span("store_images", linked=len(linked)) as current:
+            downloaded = []
+            if urls or not linked:
+                downloaded = list(self._fetcher.fetch(request))
+            kept: dict[str, Path] = {}
+            for path in sorted([*linked, *downloaded], key=lambda item: item.name):
+                if path in linked:
+                    info = linked[path]
+                else:
+                    url = urls.get(int(path.stem)) if path.stem.isdigit() else None
+                    info = self._store.ingest(path, url=url)
+                if info is None or not info.decodes or info.sha256 in kept:
+                    path.unlink(missing_ok=True)
+                    continue
+                kept[info.sha256] = path
+            current.set(
+                downloaded=len(downloaded),
+                images=len(kept),
+                dropped=len(linked) + len(downloaded) - len(kept),
+            )
+        return sorted(kept.values(), key=lambda path: path.name.lower())
+
+
+def image_store_from_config(config: RenderConfig) -> Optional[ImageStore]:
+    if config.image_store_dir is None:
+        return None
+    return ImageStore(config.image_store_dir)
+
+
+def with_image_store(fetcher: ImageFetcher, config: RenderConfig) -> ImageFetcher:
+    store = image_store_from_config(config)
+    if store is None:
+        return fetcher
+    return StoredImageFetcher(fetcher, store)
+
+
+def describe_image(path: Path, sha256: str) -> ImageInfo:
+    """Read the header, then decode one thumbnail for the hash, the sharpness
+    and a clean-decode check."""
+    info = ImageInfo(sha256=sha256, size=path.stat().st_size)
+    try:
+        with Image.open(path) as image:
+            width, height = oriented_size(image)
+            info = replace(info, width=width, height=height, format=image.format)
+            thumbnail = load_thumbnail(image)
+            return replace(
+                info,
+                phash=dhash(thumbnail),
+                sharpness=laplacian_variance(thumbnail),
+                decodes=True,
+            )
+    except (OSError, ValueError, Image.DecompressionBombError) as exc:
+        return replace(info, error=f"{type(exc).__name__}: {exc}")
+
+
+def _outdated(info: ImageInfo) -> bool:
+    # Recorded before sharpness was: its hash came from a different thumbnail.
+    return info.decodes and info.sharpness is None
+
+
+def _link(source: Path, dest: Path) -> None:
+    if dest.exists() and os.path.samefile(source, dest):
+        return
+    temp_path = dest.with_name(f".{dest.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        os.link(source, temp_path)
+    except OSError:
+        shutil.copyfile(source, temp_path)
+    os.replace(temp_path, dest)
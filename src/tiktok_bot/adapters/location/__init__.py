@@ -0,0 +1 @@
+"""Location API adapter implementations."""
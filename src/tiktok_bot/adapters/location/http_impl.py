@@ -0,0 +1,260 @@
+import contextvars
+import hashlib
+import http.client
+import json
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urljoin
+
+from ...domain.models import Location
+from ...ports.location_api import LocationApi
+from ...utils.http import ConnectionPool
+from ...utils.paths import safe_dir_name
+from ...utils.telemetry import span
+
+DEFAULT_ENDPOINT = "api/v1/social-media/location/random"
+
+_MAX_REDIRECTS = 5
+_RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+# Upper bound for one backoff sleep, Retry-After included.
+_MAX_BACKOFF_SECONDS = 30.0
+
+
+class LocationApiError(RuntimeError):
+    def __init__(
+        self,
+        message: str,
+        retryable: bool = True,
+        retry_after: Optional[float] = None,
+    ) -> None:
+        super().__init__(message)
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+
+class HttpLocationApi(LocationApi):
+    """Client for the location endpoint over keep-alive connections.
+
+    Failed requests are retried with jittered exponential backoff. With a
+    ``cache_dir`` every response that carries an ETag is kept on disk and
+    sent back as ``If-None-Match``, so an unchanged response costs a 304.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        endpoint: str = DEFAULT_ENDPOINT,
+        cache_dir: Optional[Path] = None,
+        timeout: float = 30.0,
+        retries: int = 3,
+        backoff: float = 0.5,
+        max_workers: int = 4,
+    ) -> None:
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1.")
+        self._url = urljoin(base_url.rstrip("/") + "/", endpoint.lstrip("/"))
+        self._pool = ConnectionPool(timeout=timeout)
+        self._cache = _ResponseCache(cache_dir) if cache_dir is not None else None
+        self._retries = retries
+        self._backoff = backoff
+        self._max_workers = max_workers
+
+    def __enter__(self) -> "HttpLocationApi":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._pool.close()
+
+    def random_location(self) -> Location:
+        return _parse_location(self._get(self._url), self._url)
+
+    def random_locations(self, count: int, max_rounds: int = 3) -> list[Location]:
+        """Up to ``count`` distinct locations, requested concurrently.
+
+        Locations are told apart by the folder their images go to. Calls that
+        only return repeats are made up for in further rounds, up to
+        ``max_rounds``; a round that adds nothing new ends the search.
+        """
+        if count < 1:
+            raise ValueError("count must be at least 1.")
+        locations: dict[str, Location] = {}
+        error: Optional[Exception] = None
+        with span("location_batch", count=count) as current, ThreadPoolExecutor(
+            max_workers=min(self._max_workers, count)
+        ) as executor:
+            for _ in range(max_rounds):
+                missing = count - len(locations)
+                if missing <= 0:
+                    break
+                futures = [
+                    executor.submit(contextvars.copy_context().run, self.random_location)
+                    for _ in range(missing)
+                ]
+                added = 0
+                for future in futures:
+                    try:
+                        location = future.result()
+                    except RuntimeError as exc:
+                        error = exc
+                        print(f"Location request failed: {exc}", file=sys.stderr)
+                        continue
+                    key = safe_dir_name(location.name)
+                    if key in locations or len(locations) >= count:
+                        continue
+                    locations[key] = location
+                    added += 1
+                if added == 0:
+                    break
+            current.set(locations=len(locations))
+        if not locations and error is not None:
+            raise error
+        return list(locations.values())
+
+    def _get(self, url: str) -> bytes:
+        with span("location_api", url=url) as current:
+            for attempt in range(self._retries + 1):
+                current.set(attempts=attempt + 1)
+                retry_after = None
+                try:
+                    body, cached = self._get_once(url)
+                    current.set(cached=cached)
+                    return body
+                except LocationApiError as exc:
+                    error: Exception = exc
+                    if not exc.retryable:
+                        break
+                    retry_after = exc.retry_after
+                except (OSError, http.client.HTTPException) as exc:
+                    error = exc
+                if attempt < self._retries:
+                    time.sleep(self._backoff_delay(attempt, retry_after))
+            current.set(failed=str(error))
+        raise LocationApiError(f"Request failed: {error}", retryable=False) from error
+
+    def _get_once(self, url: str) -> tuple[bytes, bool]:
+        cached = self._cache.get(url) if self._cache is not None else None
+        headers = {"Accept": "application/json"}
+        if cached is not None:
+            headers["If-None-Match"] = cached.etag
+        current_url = url
+        for _ in range(_MAX_REDIRECTS + 1):
+            with self._pool.open("GET", current_url, headers=headers) as response:
+                if response.status in (301, 302, 303, 307, 308):
+                    location = response.getheader("Location")
+                    if not location:
+                        raise LocationApiError(
+                            f"Redirect without Location ({response.status})",
+                            retryable=False,
+                        )
+                    current_url = urljoin(current_url, location)
+                    continue
+                if response.status == 304 and cached is not None:
+                    return cached.body, True
+                if response.status != 200:
+                    raise LocationApiError(
+                        f"HTTP {response.status} {response.reason}",
+                        retryable=response.status in _RETRY_STATUSES,
+                        retry_after=_retry_after(response.getheader("Retry-After")),
+                    )
+                body = response.read()
+                etag = response.getheader("ETag")
+            if self._cache is not None and etag:
+                self._cache.put(url, etag, body)
+            return body, False
+        raise LocationApiError("Too many redirects", retryable=False)
+
+    def _backoff_delay(self, attempt: int, retry_after: Optional[float]) -> float:
+        # Full jitter: clients that failed together do not retry together.
+        delay = random.uniform(0, self._backoff * 2**attempt)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return min(delay, _MAX_BACKOFF_SECONDS)
+
+
+@dataclass(frozen=True)
+class _CachedResponse:
+    etag: str
+    body: bytes
+
+
+class _ResponseCache:
+    """Last ETag and body per URL, one JSON file each."""
+
+    def __init__(self, cache_dir: Path) -> None:
+        self._cache_dir = cache_dir
+        self._lock = threading.Lock()
+        self._entries: dict[str, Optional[_CachedResponse]] = {}
+
+    def get(self, url: str) -> Optional[_CachedResponse]:
+        with self._lock:
+            if url not in self._entries:
+                self._entries[url] = self._read(url)
+            return self._entries[url]
+
+    def put(self, url: str, etag: str, body: bytes) -> None:
+        entry = _CachedResponse(etag=etag, body=body)
+        with self._lock:
+            if self._entries.get(url) == entry:
+                return
+            self._entries[url] = entry
+        path = self._path(url)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        data = {"url": url, "etag": etag, "body": body.decode("utf-8", errors="replace")}
+        temp_path.write_text(json.dumps(data), encoding="utf-8")
+        os.replace(temp_path, path)
+
+    def _read(self, url: str) -> Optional[_CachedResponse]:
+        try:
+            data = json.loads(self._path(url).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get("url") != url:
+            return None
+        etag = data.get("etag")
+        body = data.get("body")
+        if not isinstance(etag, str) or not isinstance(body, str):
+            return None
+        return _CachedResponse(etag=etag, body=body.encode("utf-8"))
+
+    def _path(self, url: str) -> Path:
+        return self._cache_dir / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.json"
+
+
+def _parse_location(body: bytes, url: str) -> Location:
+    try:
+        data = json.loads(body.decode("utf-8"))
+    except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+        snippet = body[:200].decode("utf-8", errors="replace")
+        raise LocationApiError(
+            f"Expected JSON from {url}, got: {snippet}", retryable=False
+        ) from exc
+    if not isinstance(data, dict):
+        raise LocationApiError(
+            "Unexpected response shape. Expected a JSON object.", retryable=False
+        )
+    name = data.get("name")
+    image_urls = data.get("imageUrls")
+    if not name or not isinstance(image_urls, list):
+        raise LocationApiError("Response is missing name or imageUrls.", retryable=False)
+    return Location(
+        name=str(name),
+        image_urls=tuple(value for value in image_urls if isinstance(value, str)),
+    )
+
+
+def _retry_after(value: Optional[str]) -> Optional[float]:
+    # Only the delta-seconds form; an HTTP date falls back to plain backoff.
+    if value is None or not value.strip().isdigit():
+        return None
+    return float(value.strip())
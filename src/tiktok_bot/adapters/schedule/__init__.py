@@ -0,0 +1 @@
+"""Schedule store adapter implementations."""
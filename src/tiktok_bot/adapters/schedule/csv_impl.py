@@ -0,0 +1,144 @@
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Optional
+
+from ...domain.models import ScheduleRow
+from ...ports.schedule_store import ScheduleStore
+from ...utils.schedule import (
+    find_field,
+    is_truthy,
+    load_schedule,
+    parse_run_at,
+    save_schedule,
+)
+
+NAME_FIELDS = ["Name"]
+RUN_AT_FIELDS = ["Run at"]
+DESCRIPTION_FIELDS = ["Description"]
+FLAG_FIELDS = {
+    "has_images": ["Has images", "Has Images", "HasImages"],
+    "rendered": ["Rendered"],
+    "uploaded": ["Uploaded"],
+}
+
+
+class CsvScheduleStore(ScheduleStore):
+    """The hand-edited ``schedule.csv``; every update rewrites the whole file.
+
+    Only the flag columns the file already has are written.
+    """
+
+    def __init__(self, csv_path: Path) -> None:
+        self.csv_path = csv_path
+
+    def rows(
+        self,
+        has_images: Optional[bool] = None,
+        rendered: Optional[bool] = None,
+        uploaded: Optional[bool] = None,
+    ) -> list[ScheduleRow]:
+        wanted = {"has_images": has_images, "rendered": rendered, "uploaded": uploaded}
+        return [
+            row
+            for row in read_schedule_rows(self.csv_path)
+            if all(
+                value is None or getattr(row, flag) == value
+                for flag, value in wanted.items()
+            )
+        ]
+
+    def pending(self) -> list[ScheduleRow]:
+        rows = self.rows(uploaded=False)
+        return sorted(rows, key=lambda row: _run_at_sort_key(row.run_at))
+
+    def set_flags(
+        self,
+        name: str,
+        has_images: Optional[bool] = None,
+        rendered: Optional[bool] = None,
+        uploaded: Optional[bool] = None,
+    ) -> int:
+        return self.set_flags_many(
+            [name], has_images=has_images, rendered=rendered, uploaded=uploaded
+        )
+
+    def set_flags_many(
+        self,
+        names: Iterable[str],
+        has_images: Optional[bool] = None,
+        rendered: Optional[bool] = None,
+        uploaded: Optional[bool] = None,
+    ) -> int:
+        names = set(names)
+        if not names:
+            return 0
+        updates = {"has_images": has_images, "rendered": rendered, "uploaded": uploaded}
+        updates = {flag: value for flag, value in updates.items() if value is not None}
+        fieldnames, rows = load_schedule(self.csv_path)
+        name_key = find_field(fieldnames, NAME_FIELDS)
+        # The file is the user's; a missing column is an error, not added.
+        columns = {flag: find_field(fieldnames, FLAG_FIELDS[flag]) for flag in updates}
+
+        changed = 0
+        for row in rows:
+            if (row.get(name_key) or "").strip() not in names:
+                continue
+            before = dict(row)
+            for flag, value in updates.items():
+                row[columns[flag]] = "YES" if value else "NO"
+            changed += row != before
+        if changed:
+            save_schedule(self.csv_path, fieldnames, rows)
+        return changed
+
+    def flag_names(self) -> set[str]:
+        fieldnames, _ = load_schedule(self.csv_path)
+        return {
+            flag
+            for flag, candidates in FLAG_FIELDS.items()
+            if optional_field(fieldnames, candidates) is not None
+        }
+
+    def revision(self) -> tuple[int, int]:
+        stat = self.csv_path.stat()
+        return stat.st_mtime_ns, stat.st_size
+
+
+def read_schedule_rows(csv_path: Path) -> list[ScheduleRow]:
+    fieldnames, rows = load_schedule(csv_path)
+    name_key = find_field(fieldnames, NAME_FIELDS)
+    run_at_key = optional_field(fieldnames, RUN_AT_FIELDS)
+    description_key = optional_field(fieldnames, DESCRIPTION_FIELDS)
+    flag_keys = {
+        flag: optional_field(fieldnames, candidates)
+        for flag, candidates in FLAG_FIELDS.items()
+    }
+    result = []
+    for row in rows:
+        name = (row.get(name_key) or "").strip()
+        if not name:
+            continue
+        result.append(
+            ScheduleRow(
+                name=name,
+                run_at=(row.get(run_at_key) or "").strip() if run_at_key else "",
+                description=(row.get(description_key) or "") if description_key else "",
+                **{
+                    flag: bool(key) and is_truthy(row.get(key, ""))
+                    for flag, key in flag_keys.items()
+                },
+            )
+        )
+    return result
+
+
+def optional_field(fieldnames: list[str], candidates: list[str]) -> Optional[str]:
+    try:
+        return find_field(fieldnames, candidates)
+    except KeyError:
+        return None
+
+
+def _run_at_sort_key(value: str) -> tuple[bool, datetime]:
+    run_at = parse_run_at(value)
+    return run_at is None, run_at or datetime.min
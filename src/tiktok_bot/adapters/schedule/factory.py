@@ -0,0 +1,12 @@
+from pathlib import Path
+
+from ...ports.schedule_store import ScheduleStore
+from .csv_impl import CsvScheduleStore
+from .sqlite_impl import SQLITE_SUFFIXES, SqliteScheduleStore
+
+
+def open_schedule_store(path: Path) -> ScheduleStore:
+    """SQLite for ``.db``/``.sqlite``/``.sqlite3`` paths, the CSV file otherwise."""
+    if path.suffix.lower() in SQLITE_SUFFIXES:
+        return SqliteScheduleStore(path)
+    return CsvScheduleStore(path)
@@ -0,0 +1,299 @@
+import json
+import sqlite3
+from contextlib import closing, contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from ...domain.models import ScheduleRow
+from ...ports.schedule_store import ScheduleStore
+from ...utils.schedule import (
+    find_field,
+    is_truthy,
+    load_schedule,
+    parse_run_at,
+    save_schedule,
+)
+from ...utils.telemetry import span
+from .csv_impl import (
+    DESCRIPTION_FIELDS,
+    FLAG_FIELDS,
+    NAME_FIELDS,
+    RUN_AT_FIELDS,
+    optional_field,
+)
+
+SQLITE_SUFFIXES = {".db", ".sqlite", ".sqlite3"}
+_FLAGS = tuple(FLAG_FIELDS)
+_COLUMNS = "name, run_at, description, has_images, rendered, uploaded"
+_DEFAULT_HEADERS = [
+    "Name",
+    "Run at",
+    "Description",
+    "Has images",
+    "Uploaded",
+    "Rendered",
+]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS schedule (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    run_at TEXT NOT NULL DEFAULT '',
+    -- Sortable 'YYYY-MM-DD HH:MM'; NULL when Run at does not parse.
+    run_at_ts TEXT,
+    description TEXT NOT NULL DEFAULT '',
+    has_images INTEGER NOT NULL DEFAULT 0,
+    rendered INTEGER NOT NULL DEFAULT 0,
+    uploaded INTEGER NOT NULL DEFAULT 0,
+    -- Columns without a field of their own, kept for CSV round trips.
+    extra TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS schedule_name ON schedule (name);
+CREATE INDEX IF NOT EXISTS schedule_pending ON schedule (uploaded, run_at_ts);
+CREATE INDEX IF NOT EXISTS schedule_flags ON schedule (has_images, uploaded, rendered);
+
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+INSERT OR IGNORE INTO meta (key, value) VALUES ('revision', '0');
+
+CREATE TRIGGER IF NOT EXISTS schedule_insert AFTER INSERT ON schedule BEGIN
+    UPDATE meta SET value = value + 1 WHERE key = 'revision';
+END;
+CREATE TRIGGER IF NOT EXISTS schedule_update AFTER UPDATE ON schedule BEGIN
+    UPDATE meta SET value = value + 1 WHERE key = 'revision';
+END;
+CREATE TRIGGER IF NOT EXISTS schedule_delete AFTER DELETE ON schedule BEGIN
+    UPDATE meta SET value = value + 1 WHERE key = 'revision';
+END;
+"""
+
+
+class SqliteScheduleStore(ScheduleStore):
+    """Schedule in a SQLite database in WAL mode.
+
+    Each status change is its own small transaction, and readers keep working
+    while another process writes. ``import_csv``/``export_csv`` move the whole
+    table to and from the hand-edited CSV format.
+    """
+
+    def __init__(self, db_path: Path, timeout: float = 30.0) -> None:
+        self.db_path = db_path
+        self._timeout = timeout
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._open()) as connection:
+            # WAL is stored in the database file, so this holds for every
+            # later connection, including other processes.
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(_SCHEMA)
+
+    def rows(
+        self,
+        has_images: Optional[bool] = None,
+        rendered: Optional[bool] = None,
+        uploaded: Optional[bool] = None,
+    ) -> list[ScheduleRow]:
+        wanted = {"has_images": has_images, "rendered": rendered, "uploaded": uploaded}
+        filters = [
+            (flag, int(value)) for flag, value in wanted.items() if value is not None
+        ]
+        where = " AND ".join(f"{flag} = ?" for flag, _ in filters) or "1"
+        with self._read() as connection:
+            cursor = connection.execute(
+                f"SELECT {_COLUMNS} FROM schedule WHERE {where} ORDER BY id",
+                [value for _, value in filters],
+            )
+            return [_to_row(record) for record in cursor]
+
+    def pending(self) -> list[ScheduleRow]:
+        with self._read() as connection:
+            connection.execute("BEGIN")
+            timed = connection.execute(
+                f"SELECT {_COLUMNS} FROM schedule "
+                "WHERE uploaded = 0 AND run_at_ts IS NOT NULL ORDER BY run_at_ts, id"
+            ).fetchall()
+            untimed = connection.execute(
+                f"SELECT {_COLUMNS} FROM schedule "
+                "WHERE uploaded = 0 AND run_at_ts IS NULL ORDER BY id"
+            ).fetchall()
+            connection.execute("COMMIT")
+        return [_to_row(record) for record in timed + untimed]
+
+    def set_flags(
+        self,
+        name: str,
+        has_images: Optional[bool] = None,
+        rendered: Optional[bool] = None,
+        uploaded: Optional[bool] = None,
+    ) -> int:
+        return self.set_flags_many(
+            [name], has_images=has_images, rendered=rendered, uploaded=uploaded
+        )
+
+    def set_flags_many(
+        self,
+        names: Iterable[str],
+        has_images: Optional[bool] = None,
+        rendered: Optional[bool] = None,
+        uploaded: Optional[bool] = None,
+    ) -> int:
+        names = list(dict.fromkeys(names))
+        updates = {"has_images": has_images, "rendered": rendered, "uploaded": uploaded}
+        updates = {
+            flag: int(value) for flag, value in updates.items() if value is not None
+        }
+        if not updates or not names:
+            return 0
+        assignments = ", ".join(f"{flag} = ?" for flag in updates)
+        # Only touch rows that actually change so the revision stays put
+        # when nothing did.
+        differs = " OR ".join(f"{flag} != ?" for flag in updates)
+        changed = 0
+        with self._write() as connection:
+            for name in names:
+                cursor = connection.execute(
+                    f"UPDATE schedule SET {assignments} WHERE name = ? AND ({differs})",
+                    [*updates.values(), name, *updates.values()],
+                )
+                changed += cursor.rowcount
+        return changed
+
+    def flag_names(self) -> set[str]:
+        return set(_FLAGS)
+
+    def revision(self) -> int:
+        with self._read() as connection:
+            (value,) = connection.execute(
+                "SELECT value FROM meta WHERE key = 'revision'"
+            ).fetchone()
+            return int(value)
+
+    def import_csv(self, csv_path: Path) -> int:
+        """Replace the stored schedule with the rows of ``csv_path``."""
+        fieldnames, rows = load_schedule(csv_path)
+        name_key = find_field(fieldnames, NAME_FIELDS)
+        keys = {
+            "run_at": optional_field(fieldnames, RUN_AT_FIELDS),
+            "description": optional_field(fieldnames, DESCRIPTION_FIELDS),
+            **{
+                flag: optional_field(fieldnames, candidates)
+                for flag, candidates in FLAG_FIELDS.items()
+            },
+        }
+        known = {name_key, *(key for key in keys.values() if key is not None)}
+        records = []
+        for row in rows:
+            name = (row.get(name_key) or "").strip()
+            if not name:
+                continue
+            run_at = (row.get(keys["run_at"]) or "").strip() if keys["run_at"] else ""
+            parsed = parse_run_at(run_at)
+            records.append(
+                (
+                    name,
+                    run_at,
+                    parsed.strftime("%Y-%m-%d %H:%M") if parsed else None,
+                    (row.get(keys["description"]) or "") if keys["description"] else "",
+                    *(
+                        int(bool(keys[flag]) and is_truthy(row.get(keys[flag], "")))
+                        for flag in _FLAGS
+                    ),
+                    json.dumps(
+                        {
+                            field: row.get(field) or ""
+                            for field in fieldnames
+                            if field not in known
+                        }
+                    ),
+                )
+            )
+        with span("schedule_import", rows=len(records)), self._write() as connection:
+            connection.execute("DELETE FROM schedule")
+            connection.executemany(
+                "INSERT INTO schedule (name, run_at, run_at_ts, description, "
+                "has_images, rendered, uploaded, extra) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                records,
+            )
+            connection.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('columns', ?)",
+                (json.dumps(fieldnames),),
+            )
+        return len(records)
+
+    def export_csv(self, csv_path: Path) -> int:
+        """Write the stored schedule to ``csv_path`` in the imported column order."""
+        with self._read() as connection:
+            connection.execute("BEGIN")
+            stored = connection.execute(
+                "SELECT value FROM meta WHERE key = 'columns'"
+            ).fetchone()
+            records = connection.execute(
+                f"SELECT {_COLUMNS}, extra FROM schedule ORDER BY id"
+            ).fetchall()
+            connection.execute("COMMIT")
+
+        fieldnames = json.loads(stored[0]) if stored else list(_DEFAULT_HEADERS)
+        keys = {"name": find_field(fieldnames, NAME_FIELDS)}
+        candidates = {
+            "run_at": RUN_AT_FIELDS,
+            "description": DESCRIPTION_FIELDS,
+            **FLAG_FIELDS,
+        }
+        for field, names in candidates.items():
+            keys[field] = optional_field(fieldnames, names) or names[0]
+
+        rows = []
+        for record in records:
+            row = _to_row(record[:-1])
+            exported = dict(json.loads(record[-1]))
+            exported[keys["name"]] = row.name
+            exported[keys["run_at"]] = row.run_at
+            exported[keys["description"]] = row.description
+            for flag in _FLAGS:
+                exported[keys[flag]] = "YES" if getattr(row, flag) else "NO"
+            rows.append(exported)
+        # Columns the CSV did not have are only added once they hold data.
+        defaults = {"", "NO"}
+        for key in keys.values():
+            if key not in fieldnames and any(row[key] not in defaults for row in rows):
+                fieldnames.append(key)
+        rows = [{field: row.get(field, "") for field in fieldnames} for row in rows]
+        save_schedule(csv_path, fieldnames, rows)
+        return len(rows)
+
+    def _open(self) -> sqlite3.Connection:
+        # Autocommit; transactions are opened explicitly where needed.
+        connection = sqlite3.connect(
+            self.db_path, timeout=self._timeout, isolation_level=None
+        )
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    @contextmanager
+    def _read(self) -> Iterator[sqlite3.Connection]:
+        with closing(self._open()) as connection:
+            yield connection
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        with closing(self._open()) as connection:
+            # Take the write lock up front instead of upgrading a read
+            # transaction, which can fail with SQLITE_BUSY without waiting.
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+
+def _to_row(record: tuple) -> ScheduleRow:
+    name, run_at, description, has_images, rendered, uploaded = record
+    return ScheduleRow(
+        name=name,
+        run_at=run_at,
+        description=description,
+        has_images=bool(has_images),
+        rendered=bool(rendered),
+        uploaded=bool(uploaded),
+    )
+
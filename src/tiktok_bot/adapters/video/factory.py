@@ -0,0 +1,22 @@
+from ...ports.video import VideoRenderer
+
+RENDERER_NAMES = ("moviepy", "numpy", "ffmpeg")
+# Renderers that read cover-cropped frames from the frame cache; the ffmpeg
+# renderer scales inside its filtergraph instead.
+FRAME_CACHE_RENDERERS = ("moviepy", "numpy")
+
+
+def create_renderer(name: str) -> VideoRenderer:
+    if name == "moviepy":
+        from .moviepy_impl import MoviePyRenderer
+
+        return MoviePyRenderer()
+    if name == "numpy":
+        from .numpy_impl import NumpyFfmpegRenderer
+
+        return NumpyFfmpegRenderer()
+    if name == "ffmpeg":
+        from .ffmpeg_impl import FfmpegFilterRenderer
+
+        return FfmpegFilterRenderer()
+    raise ValueError(f"Unsupported renderer: {name}")
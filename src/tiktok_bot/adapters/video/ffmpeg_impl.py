@@ -0,0 +1,158 @@
+import math
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Optional, Sequence
+
+from ...domain.models import OutputVariant, RenderConfig, RenderRequest
+from ...ports.video import RENDER_MODE_SINGLE, VideoRenderer
+from ...utils.music import choose_music_file
+from ...utils.telemetry import span
+from .ffmpeg_tools import (
+    DEFAULT_CODEC,
+    find_ffmpeg,
+    run_ffmpeg,
+    variant_filter_chains,
+    variant_output_args,
+)
+from .frames import Segment, plan_segments
+from .music_cache import optional_music
+
+
+class FfmpegFilterRenderer(VideoRenderer):
+    """Render the whole slideshow with a single ffmpeg filtergraph."""
+
+    def render(self, request: RenderRequest) -> Path:
+        with span("render", renderer="ffmpeg", images=len(request.images)):
+            return self._render(request)
+
+    def _render(self, request: RenderRequest) -> Path:
+        config = request.config
+        if not request.images:
+            raise ValueError("No images provided for rendering.")
+        if config.render_mode != RENDER_MODE_SINGLE:
+            raise ValueError(
+                f"FfmpegFilterRenderer does not support render mode: {config.render_mode}"
+            )
+
+        ffmpeg = find_ffmpeg()
+        segments = plan_segments(request.images, config.image_duration, config.fps)
+        duration = segments[-1].start + segments[-1].duration
+        output_path = request.output_path
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        for variant in request.variants:
+            variant.output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        music_path = None
+        if config.include_music:
+            music_path = request.music_path or choose_music_file(config.music_dir)
+        with ExitStack() as stack:
+            audio = None
+            if music_path is not None:
+                print(f"Selected music: {music_path}")
+                # A bad track falls back to silence; a failed encode does not
+                # get a second, silent attempt.
+                audio = stack.enter_context(
+                    optional_music(ffmpeg, music_path, duration, config)
+                )
+            attrs = {"music": music_path.name} if audio is not None else {}
+            with span("encode", **attrs):
+                run_ffmpeg(
+                    slideshow_command(
+                        ffmpeg,
+                        segments,
+                        config,
+                        duration,
+                        output_path,
+                        audio,
+                        variants=request.variants,
+                    )
+                )
+        return output_path
+
+
+def slideshow_command(
+    ffmpeg: str,
+    segments: Sequence[Segment],
+    config: RenderConfig,
+    duration: float,
+    output_path: Path,
+    audio_path: Optional[Path] = None,
+    codec: str = DEFAULT_CODEC,
+    preset: Optional[str] = None,
+    variants: Sequence[OutputVariant] = (),
+) -> list[str]:
+    command = [ffmpeg, "-y", "-loglevel", "error"]
+    for segment in segments:
+        command.extend(["-framerate", str(config.fps), "-i", str(segment.image)])
+    if audio_path is not None:
+        # Already trimmed or looped to ``duration``; every output copies it.
+        command.extend(["-i", str(audio_path)])
+
+    pix_fmt = "yuv420p" if config.width % 2 == 0 and config.height % 2 == 0 else None
+    chains = [
+        f"[{segment.index}:v]{_segment_filters(segment, config, pix_fmt)}[v{segment.index}]"
+        for segment in segments
+        if segment.frame_count > 0
+    ]
+    labels = "".join(
+        f"[v{segment.index}]" for segment in segments if segment.frame_count > 0
+    )
+    chains.append(f"{labels}concat=n={labels.count('[')}:v=1:a=0[v]")
+    preset = preset or config.preset
+    outputs = [
+        OutputVariant(output_path, config.width, config.height, preset=preset),
+        *variants,
+    ]
+    if variants:
+        chains.extend(variant_filter_chains("v", outputs, config.fps))
+    command.extend(["-filter_complex", ";".join(chains)])
+
+    for index, output in enumerate(outputs):
+        if variants:
+            command.extend(variant_output_args(output, f"out{index}", config.fps))
+        else:
+            command.extend(["-map", "[v]", "-c:v", codec, "-preset", preset])
+            command.extend(["-r", str(config.fps)])
+            if pix_fmt is not None:
+                command.extend(["-pix_fmt", pix_fmt])
+        if audio_path is not None:
+            command.extend(["-map", f"{len(segments)}:a:0", "-c:a", "copy"])
+        command.extend(["-t", f"{duration:.3f}", str(output.output_path)])
+    return command
+
+
+def _segment_filters(
+    segment: Segment, config: RenderConfig, pix_fmt: Optional[str]
+) -> str:
+    width, height = config.width, config.height
+    # Decode and scale the still once, then repeat the finished frame; a
+    # looped input would decode and rescale the full-size image every frame.
+    filters = [
+        f"scale={width}:{height}:force_original_aspect_ratio=increase:flags=lanczos",
+        f"crop={width}:{height}",
+        "setsar=1",
+    ]
+    if pix_fmt is not None:
+        filters.append(f"format={pix_fmt}")
+    filters.append(f"loop=loop={segment.frame_count - 1}:size=1:start=0")
+    filters.append(f"settb=1/{config.fps}")
+    filters.append("setpts=N")
+    if config.fade_duration > 0:
+        # ffmpeg's time-based fade starts on the first frame at or after
+        # ``st``, which drifts by a frame when a segment does not begin on the
+        # 1/fps grid, so the ramps are given in frames of this segment instead.
+        # Exact when image_duration * fps is whole, within half a frame if not.
+        fps = config.fps
+        first = segment.first_frame / fps - segment.start
+        fade_frames = max(1, _round_half_up(config.fade_duration * fps))
+        fade_in = max(1, _round_half_up((config.fade_duration - first) * fps))
+        fade_out = _round_half_up(
+            (segment.duration - config.fade_duration - first) * fps
+        )
+        filters.append(f"fade=t=in:s=0:n={fade_in}")
+        filters.append(f"fade=t=out:s={fade_out}:n={fade_frames}")
+    return ",".join(filters)
+
+
+def _round_half_up(value: float) -> int:
+    return math.floor(value + 0.5 + 1e-9)
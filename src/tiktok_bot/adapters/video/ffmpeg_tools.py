@@ -0,0 +1,225 @@
+import os
+import shutil
+import subprocess
+from pathlib import Path
+from typing import Iterable, Sequence
+
+from ...domain.models import OutputVariant
+from ...utils.telemetry import span, stage
+
+DEFAULT_CODEC = "libx264"
+DEFAULT_PRESET = "medium"
+
+
+def find_ffmpeg() -> str:
+    configured = os.environ.get("FFMPEG_BINARY")
+    if configured:
+        return configured
+    try:
+        import imageio_ffmpeg
+
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception:
+        pass
+    found = shutil.which("ffmpeg")
+    if found:
+        return found
+    raise RuntimeError(
+        "ffmpeg executable not found. Install imageio-ffmpeg or put ffmpeg on PATH."
+    )
+
+
+def raw_video_encoder_command(
+    ffmpeg: str,
+    width: int,
+    height: int,
+    fps: int,
+    output_path: Path,
+    codec: str = DEFAULT_CODEC,
+    preset: str = DEFAULT_PRESET,
+) -> list[str]:
+    command = _raw_video_input(ffmpeg, width, height, fps)
+    command.extend(["-vcodec", codec, "-preset", preset])
+    if codec == "libx264" and width % 2 == 0 and height % 2 == 0:
+        command.extend(["-pix_fmt", "yuv420p"])
+    command.append(str(output_path))
+    return command
+
+
+def raw_video_variants_command(
+    ffmpeg: str,
+    width: int,
+    height: int,
+    fps: int,
+    outputs: Sequence[tuple[OutputVariant, Path]],
+) -> list[str]:
+    """Encode one raw frame stream to every output with a ``split`` filter."""
+    command = _raw_video_input(ffmpeg, width, height, fps)
+    variants = [variant for variant, _ in outputs]
+    chains = variant_filter_chains("0:v", variants, fps)
+    command.extend(["-filter_complex", ";".join(chains)])
+    for index, (variant, video_path) in enumerate(outputs):
+        command.extend(variant_output_args(variant, f"out{index}", fps))
+        command.append(str(video_path))
+    return command
+
+
+def transcode_variants(
+    ffmpeg: str,
+    source_path: Path,
+    fps: int,
+    outputs: Sequence[tuple[OutputVariant, Path]],
+) -> None:
+    """Decode ``source_path`` once and encode it to every output, copying audio."""
+    variants = [variant for variant, _ in outputs]
+    command = [
+        ffmpeg,
+        "-y",
+        "-loglevel",
+        "error",
+        "-i",
+        str(source_path),
+        "-filter_complex",
+        ";".join(variant_filter_chains("0:v", variants, fps)),
+    ]
+    for index, (variant, video_path) in enumerate(outputs):
+        command.extend(variant_output_args(variant, f"out{index}", fps))
+        command.extend(["-map", "0:a?", "-c:a", "copy", str(video_path)])
+    with span("encode", variants=len(outputs)):
+        run_ffmpeg(command)
+
+
+def variant_filter_chains(
+    source: str, variants: Sequence[OutputVariant], fps: int
+) -> list[str]:
+    """Fan ``source`` out to one ``[outN]`` stream per variant, cover-scaled."""
+    if len(variants) == 1:
+        return [f"[{source}]{_variant_filters(variants[0], fps)}[out0]"]
+    chains = [
+        f"[{source}]split={len(variants)}"
+        + "".join(f"[split{index}]" for index in range(len(variants)))
+    ]
+    for index, variant in enumerate(variants):
+        chains.append(f"[split{index}]{_variant_filters(variant, fps)}[out{index}]")
+    return chains
+
+
+def variant_output_args(variant: OutputVariant, label: str, fps: int) -> list[str]:
+    args = [
+        "-map",
+        f"[{label}]",
+        "-vcodec",
+        DEFAULT_CODEC,
+        "-preset",
+        variant.preset or DEFAULT_PRESET,
+        "-r",
+        str(variant.fps or fps),
+    ]
+    if variant.bitrate:
+        args.extend(["-b:v", variant.bitrate])
+    return args
+
+
+def _variant_filters(variant: OutputVariant, fps: int) -> str:
+    width, height = variant.width, variant.height
+    filters = [
+        f"scale={width}:{height}:force_original_aspect_ratio=increase:flags=lanczos",
+        f"crop={width}:{height}",
+        "setsar=1",
+    ]
+    if variant.fps is not None and variant.fps != fps:
+        filters.append(f"fps={variant.fps}")
+    if width % 2 == 0 and height % 2 == 0:
+        filters.append("format=yuv420p")
+    return ",".join(filters)
+
+
+def _raw_video_input(ffmpeg: str, width: int, height: int, fps: int) -> list[str]:
+    return [
+        ffmpeg,
+        "-y",
+        "-loglevel",
+        "error",
+        "-f",
+        "rawvideo",
+        "-vcodec",
+        "rawvideo",
+        "-s",
+        f"{width}x{height}",
+        "-pix_fmt",
+        "rgb24",
+        "-r",
+        f"{fps:.02f}",
+        "-an",
+        "-i",
+        "-",
+    ]
+
+
+def mux_audio(
+    ffmpeg: str,
+    video_path: Path,
+    audio_path: Path,
+    duration: float,
+    output_path: Path,
+) -> None:
+    """Mux an already encoded audio clip, stream-copying video and audio."""
+    with span("mux", audio=audio_path.name):
+        run_ffmpeg(
+            [
+                ffmpeg,
+                "-y",
+                "-loglevel",
+                "error",
+                "-i",
+                str(video_path),
+                "-i",
+                str(audio_path),
+                "-map",
+                "0:v:0",
+                "-map",
+                "1:a:0",
+                "-c",
+                "copy",
+                "-t",
+                f"{duration:.3f}",
+                str(output_path),
+            ]
+        )
+
+
+def pipe_frames(command: Sequence[str], frames: Iterable) -> None:
+    process = subprocess.Popen(
+        command,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+    )
+    try:
+        for frame in frames:
+            with stage("encode"):
+                process.stdin.write(frame.data)
+    except BrokenPipeError:
+        pass
+    finally:
+        with stage("encode"):
+            try:
+                process.stdin.close()
+            except BrokenPipeError:
+                pass
+            stderr = process.stderr.read()
+            returncode = process.wait()
+    if returncode != 0:
+        message = stderr.decode("utf-8", errors="replace").strip()
+        raise RuntimeError(f"ffmpeg failed ({returncode}): {message}")
+
+
+def run_ffmpeg(command: Sequence[str]) -> None:
+    result = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        message = result.stderr.decode("utf-8", errors="replace").strip()
+        raise RuntimeError(f"ffmpeg failed ({result.returncode}): {message}")
+
+
+def temporary_sibling(path: Path, tag: str) -> Path:
+    return path.with_name(f".{path.stem}.{tag}{path.suffix}")
@@ -0,0 +1,58 @@
+from pathlib import Path
+from typing import Optional, Sequence
+
+import numpy as np
+
+from ...domain.models import RenderConfig
+from ...utils.disk_cache import LruDiskCache
+from ...utils.hashing import file_sha256
+from ...utils.telemetry import span
+from .frames import DECODE_VERSION, load_cover_frame
+
+_SUFFIX = ".npy"
+
+
+class FrameCache:
+    def __init__(self, root: Path, max_bytes: int) -> None:
+        self._store = LruDiskCache(root, max_bytes)
+
+    def load(self, image_path: Path, width: int, height: int) -> np.ndarray:
+        key = f"{file_sha256(image_path)}-{width}x{height}-v{DECODE_VERSION}"
+        cached = self._store.get(key, _SUFFIX)
+        if cached is not None:
+            try:
+                with span("decode", image=image_path.name, cached=True):
+                    return np.load(cached, mmap_mode="r")
+            except (OSError, ValueError):
+                cached.unlink(missing_ok=True)
+
+        frame = load_cover_frame(image_path, width, height)
+        temp_path = self._store.temp_path(key, _SUFFIX)
+        with temp_path.open("wb") as handle:
+            np.save(handle, frame)
+        self._store.commit(temp_path, key, _SUFFIX)
+        return frame
+
+
+def frame_cache_from_config(config: RenderConfig) -> Optional[FrameCache]:
+    if config.frame_cache_dir is None or config.frame_cache_max_mb <= 0:
+        return None
+    return FrameCache(config.frame_cache_dir, config.frame_cache_max_mb * 1024 * 1024)
+
+
+def warm_frame_cache(images: Sequence[Path], config: RenderConfig) -> int:
+    """Decode ``images`` into the frame cache ahead of a render at ``config``."""
+    cache = frame_cache_from_config(config)
+    if cache is None:
+        return 0
+    for image_path in images:
+        cache.load(image_path, config.width, config.height)
+    return len(images)
+
+
+def load_frame(
+    image_path: Path, width: int, height: int, cache: Optional[FrameCache]
+) -> np.ndarray:
+    if cache is None:
+        return load_cover_frame(image_path, width, height)
+    return cache.load(image_path, width, height)
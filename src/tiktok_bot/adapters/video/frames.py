@@ -0,0 +1,131 @@
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Sequence
+
+import numpy as np
+from PIL import Image, ImageOps
+
+from ...utils.telemetry import span, stage
+
+# Bump when load_cover_frame output changes so cached frames and segments
+# decoded the old way are not reused.
+DECODE_VERSION = 2
+
+_EXIF_ORIENTATION = 0x0112
+_TRANSPOSED = {5, 6, 7, 8}
+# Pillow box-reduces down to this multiple of the target before LANCZOS.
+_REDUCING_GAP = 3.0
+
+
+@dataclass(frozen=True)
+class Segment:
+    index: int
+    image: Path
+    start: float
+    duration: float
+    first_frame: int
+    frame_count: int
+
+
+def load_cover_frame(image_path: Path, target_w: int, target_h: int) -> np.ndarray:
+    with Image.open(image_path) as image:
+        with span("decode", image=image_path.name) as current:
+            orientation = image.getexif().get(_EXIF_ORIENTATION, 1)
+            transposed = orientation in _TRANSPOSED
+            w, h = (image.height, image.width) if transposed else image.size
+            scale = max(target_w / w, target_h / h)
+            new_w = max(target_w, int(w * scale))
+            new_h = max(target_h, int(h * scale))
+            if image.format == "JPEG" and scale < 1:
+                # Let libjpeg decode at 1/2, 1/4 or 1/8 scale while staying at
+                # least as large as the cover size.
+                need = (new_h, new_w) if transposed else (new_w, new_h)
+                image.draft("RGB", need)
+            image.load()
+            current.set(source=[w, h], decoded=list(image.size))
+            if orientation != 1:
+                image = ImageOps.exif_transpose(image)
+            image = _to_rgb(image)
+        with span("resize", image=image_path.name):
+            if (new_w, new_h) != image.size:
+                image = image.resize(
+                    (new_w, new_h), Image.Resampling.LANCZOS, reducing_gap=_REDUCING_GAP
+                )
+            frame = np.asarray(image, dtype=np.uint8)
+            x1 = int(new_w / 2 - target_w / 2)
+            y1 = int(new_h / 2 - target_h / 2)
+            return np.ascontiguousarray(frame[y1 : y1 + target_h, x1 : x1 + target_w])
+
+
+def plan_segments(
+    images: Sequence[Path], image_duration: float, fps: int
+) -> list[Segment]:
+    starts = [0.0]
+    for _ in images:
+        starts.append(starts[-1] + image_duration)
+    total_frames = int(starts[-1] * fps)
+
+    counts = [0] * len(images)
+    index = 0
+    for frame_index in range(total_frames):
+        t = frame_index / fps
+        while index + 1 < len(images) and starts[index + 1] <= t:
+            index += 1
+        counts[index] += 1
+
+    segments = []
+    first_frame = 0
+    for index, image in enumerate(images):
+        segments.append(
+            Segment(
+                index=index,
+                image=image,
+                start=starts[index],
+                duration=image_duration,
+                first_frame=first_frame,
+                frame_count=counts[index],
+            )
+        )
+        first_frame += counts[index]
+    return segments
+
+
+def fade_levels(segment: Segment, fps: int, fade_duration: float) -> np.ndarray:
+    frame_times = (
+        np.arange(segment.first_frame, segment.first_frame + segment.frame_count) / fps
+        - segment.start
+    )
+    levels = np.ones(segment.frame_count, dtype=np.float64)
+    if fade_duration <= 0:
+        return levels
+    fading_in = frame_times < fade_duration
+    levels[fading_in] *= frame_times[fading_in] / fade_duration
+    remaining = segment.duration - frame_times
+    fading_out = remaining < fade_duration
+    levels[fading_out] *= remaining[fading_out] / fade_duration
+    return levels
+
+
+def iter_segment_frames(
+    frame: np.ndarray, levels: np.ndarray
+) -> Iterator[np.ndarray]:
+    scratch = np.empty(frame.shape, dtype=np.float32)
+    blended = np.empty(frame.shape, dtype=np.uint8)
+    for level in levels:
+        if level >= 1.0:
+            yield frame
+            continue
+        with stage("composite"):
+            np.multiply(frame, np.float32(level), out=scratch)
+            np.copyto(blended, scratch, casting="unsafe")
+        yield blended
+
+
+def _to_rgb(image: Image.Image) -> Image.Image:
+    if image.mode == "RGB":
+        return image
+    if "A" in image.getbands() or "transparency" in image.info:
+        rgba = image.convert("RGBA")
+        background = Image.new("RGBA", rgba.size, (0, 0, 0, 255))
+        return Image.alpha_composite(background, rgba).convert("RGB")
+    return image.convert("RGB")
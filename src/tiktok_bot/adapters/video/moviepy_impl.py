@@ -1,54 +1,100 @@
-import random
+from bisect import bisect_right
+from contextlib import ExitStack
 from pathlib import Path
 
-from moviepy.audio.fx.all import audio_loop
-from moviepy.editor import AudioFileClip, ImageClip, concatenate_videoclips
+import numpy as np
+from moviepy.editor import ImageClip, VideoClip, concatenate_videoclips
 
 from ...domain.models import RenderRequest
-from ...ports.video import VideoRenderer
-
-SUPPORTED_AUDIO_EXTS = {".mp3", ".m4a", ".aac", ".wav", ".flac", ".ogg", ".opus"}
+from ...ports.video import RENDER_MODE_SINGLE, VideoRenderer
+from ...utils.music import choose_music_file
+from ...utils.telemetry import span
+from .ffmpeg_tools import find_ffmpeg, transcode_variants
+from .frame_cache import frame_cache_from_config, load_frame
+from .frames import plan_segments
+from .music_cache import prepared_music
+from .streaming import FrameWindow
 
 
 class MoviePyRenderer(VideoRenderer):
     def render(self, request: RenderRequest) -> Path:
+        with span("render", renderer="moviepy", images=len(request.images)):
+            return self._render(request)
+
+    def _render(self, request: RenderRequest) -> Path:
         _ensure_pillow_compat()
         config = request.config
         if not request.images:
             raise ValueError("No images provided for rendering.")
+        if config.render_mode != RENDER_MODE_SINGLE:
+            raise ValueError(
+                f"MoviePyRenderer does not support render mode: {config.render_mode}"
+            )
 
         clips = []
         video = None
-        audio_clip = None
-        audio_source = None
+        window = None
+        frame_cache = frame_cache_from_config(config)
+        music = ExitStack()
         try:
-            for image_path in request.images:
-                clip = ImageClip(str(image_path))
-                clip = _cover_and_center(clip, config.width, config.height)
-                clip = clip.set_duration(config.image_duration)
-                if config.fade_duration > 0:
-                    clip = clip.fadein(config.fade_duration).fadeout(config.fade_duration)
-                clips.append(clip)
-
-            video = concatenate_videoclips(clips, method="compose")
-            if config.include_music:
-                audio_source, audio_clip = _build_audio_clip(
-                    config.music_dir, video.duration
+            if config.streaming:
+                segments = plan_segments(request.images, config.image_duration, config.fps)
+                window = FrameWindow(segments, config.width, config.height, frame_cache)
+                video = _streaming_clip(
+                    window,
+                    [segment.start for segment in segments],
+                    config.image_duration,
+                    config.fade_duration,
                 )
-                if audio_clip is not None:
-                    video = video.set_audio(audio_clip)
+            else:
+                for image_path in request.images:
+                    clip = ImageClip(
+                        load_frame(image_path, config.width, config.height, frame_cache)
+                    )
+                    clip = clip.set_duration(config.image_duration)
+                    if config.fade_duration > 0:
+                        clip = clip.fadein(config.fade_duration).fadeout(
+                            config.fade_duration
+                        )
+                    clips.append(clip)
+                video = concatenate_videoclips(clips, method="compose")
+            audio_path = None
+            music_path = None
+            if config.include_music:
+                music_path = request.music_path or choose_music_file(config.music_dir)
+            if music_path is not None:
+                print(f"Selected music: {music_path}")
+                try:
+                    audio_path = music.enter_context(
+                        prepared_music(
+                            find_ffmpeg(), music_path, video.duration, config
+                        )
+                    )
+                except RuntimeError as exc:
+                    print(f"Skipping music {music_path}: {exc}")
 
             output_path = request.output_path
             output_path.parent.mkdir(parents=True, exist_ok=True)
-            write_kwargs = {
-                "fps": config.fps,
-                "codec": "libx264",
-                "audio": audio_clip is not None,
-                "preset": "medium",
-            }
-            if audio_clip is not None:
-                write_kwargs["audio_codec"] = "aac"
-            video.write_videofile(str(output_path), **write_kwargs)
+            with span("encode"):
+                # A file name as ``audio`` is muxed with stream copy.
+                video.write_videofile(
+                    str(output_path),
+                    fps=config.fps,
+                    codec="libx264",
+                    audio=str(audio_path) if audio_path is not None else False,
+                    preset=config.preset,
+                )
+            if request.variants:
+                # MoviePy writes one file per pass; derive the rest from it in
+                # a single ffmpeg split instead of compositing again.
+                for variant in request.variants:
+                    variant.output_path.parent.mkdir(parents=True, exist_ok=True)
+                transcode_variants(
+                    find_ffmpeg(),
+                    output_path,
+                    config.fps,
+                    [(variant, variant.output_path) for variant in request.variants],
+                )
             return output_path
         finally:
             if video is not None:
@@ -56,33 +102,46 @@ class MoviePyRenderer(VideoRenderer):
                     video.close()
                 except Exception:
                     pass
-            if audio_clip is not None and audio_clip is not audio_source:
-                try:
-                    audio_clip.close()
-                except Exception:
-                    pass
-            if audio_source is not None:
-                try:
-                    audio_source.close()
-                except Exception:
-                    pass
+            music.close()
             for clip in clips:
                 try:
                     clip.close()
                 except Exception:
                     pass
-
-
-def _cover_and_center(clip: ImageClip, target_w: int, target_h: int) -> ImageClip:
-    w, h = clip.size
-    scale = max(target_w / w, target_h / h)
-    clip = clip.resize(scale)
-    return clip.crop(
-        x_center=clip.w / 2,
-        y_center=clip.h / 2,
-        width=target_w,
-        height=target_h,
-    )
+            if window is not None:
+                window.close()
+
+
+def _streaming_clip(
+    window: FrameWindow,
+    starts: list[float],
+    image_duration: float,
+    fade_duration: float,
+) -> VideoClip:
+    """Build the slideshow as one clip that decodes each image when it comes up.
+
+    Matches ``fadein``/``fadeout`` on concatenated ``ImageClip``s, but only the
+    current and next frames are held in memory.
+    """
+
+    def make_frame(t: float) -> np.ndarray:
+        index = min(max(bisect_right(starts, t) - 1, 0), len(starts) - 1)
+        frame = window.get(index)
+        if fade_duration <= 0:
+            return frame
+        local = t - starts[index]
+        remaining = image_duration - local
+        if local >= fade_duration and remaining >= fade_duration:
+            return frame
+        # Same float64 arithmetic, in the same order, as fadein then fadeout.
+        faded = frame
+        if local < fade_duration:
+            faded = (local / fade_duration) * faded
+        if remaining < fade_duration:
+            faded = (remaining / fade_duration) * faded
+        return faded.astype(np.uint8)
+
+    return VideoClip(make_frame, duration=image_duration * len(starts))
 
 
 def _ensure_pillow_compat() -> None:
@@ -94,39 +153,3 @@ def _ensure_pillow_compat() -> None:
     if not hasattr(Image, "ANTIALIAS"):
         Image.ANTIALIAS = Image.Resampling.LANCZOS
 
-
-def _build_audio_clip(
-    music_dir: Path, target_duration: float
-) -> tuple[AudioFileClip | None, AudioFileClip | None]:
-    music_path = _choose_music_file(music_dir)
-    if music_path is None:
-        return None, None
-    try:
-        source = AudioFileClip(str(music_path))
-    except Exception:
-        return None, None
-    print(f"Selected music: {music_path}")
-    if target_duration <= 0:
-        return source, source
-    if source.duration is None:
-        return source, source
-    if source.duration >= target_duration:
-        return source, source.subclip(0, target_duration)
-    try:
-        looped = source.fx(audio_loop, duration=target_duration)
-        return source, looped
-    except Exception:
-        return source, source
-
-
-def _choose_music_file(music_dir: Path) -> Path | None:
-    if not music_dir.exists():
-        return None
-    candidates = [
-        path
-        for path in music_dir.iterdir()
-        if path.is_file() and path.suffix.lower() in SUPPORTED_AUDIO_EXTS
-    ]
-    if not candidates:
-        return None
-    return random.choice(candidates)
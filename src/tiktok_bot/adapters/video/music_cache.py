@@ -0,0 +1,319 @@
+import hashlib
+import json
+import os
+import re
+import subprocess
+import tempfile
+import threading
+from contextlib import ExitStack, contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from ...domain.models import RenderConfig
+from ...utils.disk_cache import LruDiskCache
+from ...utils.hashing import file_sha256
+from ...utils.music import list_music_files
+from ...utils.telemetry import span
+from ...utils.timing_table import SLIDESHOW_IMAGE_DURATIONS
+from .ffmpeg_tools import run_ffmpeg
+
+# Audio settings every renderer muxes with; clips are stream-copied as is.
+AUDIO_CODEC = "aac"
+AUDIO_SAMPLE_RATE = 44100
+AUDIO_CHANNELS = 2
+
+_CLIP_SUFFIX = ".m4a"
+_INDEX_VERSION = 1
+_DURATION = re.compile(r"Duration: (\d+):(\d+):(\d+(?:\.\d+)?)")
+_DECODED = re.compile(r"time=(\d+):(\d+):(\d+(?:\.\d+)?)")
+_STREAM = re.compile(r"Stream #\d+:\d+.*?: Audio: .*?(\d+) Hz, ([^,]+)")
+_LOUDNESS = re.compile(r"I:\s+(-?\d+(?:\.\d+)?) LUFS")
+_CHANNELS = {"mono": 1, "stereo": 2}
+_CHANNEL_COUNT = re.compile(r"(\d+) channels")
+
+
+@dataclass(frozen=True)
+class MusicTrack:
+    path: Path
+    size: int
+    mtime_ns: int
+    sha256: str
+    duration: Optional[float] = None
+    sample_rate: Optional[int] = None
+    channels: Optional[int] = None
+    # Integrated loudness (EBU R128) in LUFS.
+    loudness: Optional[float] = None
+    error: Optional[str] = None
+
+    @property
+    def playable(self) -> bool:
+        return self.error is None and bool(self.duration)
+
+
+class MusicIndex:
+    """Probe results per music file, kept in a JSON file.
+
+    A file is probed once and again only when its size or mtime changes.
+    """
+
+    def __init__(self, index_path: Path, ffmpeg: str) -> None:
+        self._index_path = index_path
+        self._ffmpeg = ffmpeg
+        self._tracks: Optional[dict[str, MusicTrack]] = None
+
+    def tracks(self, music_dir: Path) -> list[MusicTrack]:
+        return [self.track(path) for path in list_music_files(music_dir)]
+
+    def track(self, path: Path) -> MusicTrack:
+        tracks = self._load()
+        key = str(path.resolve())
+        stat = path.stat()
+        known = tracks.get(key)
+        if (
+            known is not None
+            and known.size == stat.st_size
+            and known.mtime_ns == stat.st_mtime_ns
+        ):
+            return known
+        with span("probe_music", music=path.name):
+            track = probe_track(self._ffmpeg, path, stat.st_size, stat.st_mtime_ns)
+        tracks[key] = track
+        self._save(tracks)
+        return track
+
+    def _load(self) -> dict[str, MusicTrack]:
+        if self._tracks is not None:
+            return self._tracks
+        self._tracks = {}
+        try:
+            data = json.loads(self._index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return self._tracks
+        if not isinstance(data, dict) or data.get("version") != _INDEX_VERSION:
+            return self._tracks
+        for key, fields in data.get("tracks", {}).items():
+            try:
+                fields = {**fields, "path": Path(fields["path"])}
+                self._tracks[key] = MusicTrack(**fields)
+            except (KeyError, TypeError):
+                continue
+        return self._tracks
+
+    def _save(self, tracks: dict[str, MusicTrack]) -> None:
+        data = {
+            "version": _INDEX_VERSION,
+            "tracks": {
+                key: {**asdict(track), "path": str(track.path)}
+                for key, track in tracks.items()
+                if Path(key).exists()
+            },
+        }
+        self._index_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self._index_path.with_name(
+            f".{self._index_path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        temp_path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        # Concurrent renders may both write; the loser's probe is redone later.
+        os.replace(temp_path, self._index_path)
+
+
+class MusicCache:
+    """AAC clips of each track, already trimmed or looped to a slideshow length.
+
+    Renderers mux a clip with stream copy instead of decoding the track and
+    encoding its audio again for every output.
+    """
+
+    def __init__(self, root: Path, max_bytes: int, ffmpeg: str) -> None:
+        self._ffmpeg = ffmpeg
+        self._store = LruDiskCache(root / "clips", max_bytes)
+        self.index = MusicIndex(root / "index.json", ffmpeg)
+
+    def clip(self, music_path: Path, duration: float) -> Path:
+        track = self.index.track(music_path)
+        if not track.playable:
+            raise RuntimeError(f"Unreadable music file: {track.error or 'no audio'}")
+        key = clip_key(track, duration)
+        cached = self._store.get(key, _CLIP_SUFFIX)
+        if cached is not None:
+            with span("audio", music=music_path.name, cached=True):
+                return cached
+        temp_path = self._store.temp_path(key, _CLIP_SUFFIX)
+        try:
+            with span("audio", music=music_path.name, cached=False):
+                encode_clip(self._ffmpeg, music_path, duration, temp_path)
+        except RuntimeError:
+            temp_path.unlink(missing_ok=True)
+            raise
+        return self._store.commit(temp_path, key, _CLIP_SUFFIX)
+
+    def warm(
+        self, music_dir: Path, durations: Iterable[float] = ()
+    ) -> tuple[list[MusicTrack], int]:
+        """Index ``music_dir`` and encode a clip per track and duration."""
+        tracks = self.index.tracks(music_dir)
+        encoded = 0
+        for track in tracks:
+            if not track.playable:
+                continue
+            for duration in durations:
+                self.clip(track.path, duration)
+                encoded += 1
+        return tracks, encoded
+
+
+def music_cache_from_config(config: RenderConfig, ffmpeg: str) -> Optional[MusicCache]:
+    if config.music_cache_dir is None or config.music_cache_max_mb <= 0:
+        return None
+    return MusicCache(
+        config.music_cache_dir, config.music_cache_max_mb * 1024 * 1024, ffmpeg
+    )
+
+
+def slideshow_durations() -> list[float]:
+    """Video lengths the timing table produces, one per image count."""
+    return sorted(
+        {count * duration for count, duration in SLIDESHOW_IMAGE_DURATIONS.items()}
+    )
+
+
+@contextmanager
+def prepared_music(
+    ffmpeg: str, music_path: Path, duration: float, config: RenderConfig
+) -> Iterator[Path]:
+    """Yield an AAC clip of ``music_path`` that is exactly ``duration`` long."""
+    cache = music_cache_from_config(config, ffmpeg)
+    if cache is not None:
+        yield cache.clip(music_path, duration)
+        return
+    # Without a cache the clip is still encoded once and shared by every output.
+    with tempfile.TemporaryDirectory(prefix="tiktok-bot-music-") as temp_dir:
+        clip_path = Path(temp_dir) / f"clip{_CLIP_SUFFIX}"
+        with span("audio", music=music_path.name, cached=False):
+            encode_clip(ffmpeg, music_path, duration, clip_path)
+        yield clip_path
+
+
+@contextmanager
+def optional_music(
+    ffmpeg: str, music_path: Path, duration: float, config: RenderConfig
+) -> Iterator[Optional[Path]]:
+    """``prepared_music``, or None with a message when the clip cannot be made.
+
+    Only preparing the clip is guarded; errors raised by the caller while the
+    clip is in use, such as a failed mux, propagate.
+    """
+    with ExitStack() as stack:
+        try:
+            audio = stack.enter_context(
+                prepared_music(ffmpeg, music_path, duration, config)
+            )
+        except RuntimeError as exc:
+            print(f"Skipping music {music_path}: {exc}")
+            audio = None
+        yield audio
+
+
+def clip_key(track: MusicTrack, duration: float) -> str:
+    parts = {
+        "music": track.sha256,
+        "duration_ms": round(duration * 1000),
+        "codec": AUDIO_CODEC,
+        "sample_rate": AUDIO_SAMPLE_RATE,
+        "channels": AUDIO_CHANNELS,
+    }
+    payload = json.dumps(parts, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+def encode_clip(
+    ffmpeg: str, music_path: Path, duration: float, output_path: Path
+) -> None:
+    # -stream_loop repeats a short track; -t trims a long one.
+    run_ffmpeg(
+        [
+            ffmpeg,
+            "-y",
+            "-loglevel",
+            "error",
+            "-stream_loop",
+            "-1",
+            "-i",
+            str(music_path),
+            "-map",
+            "0:a:0",
+            "-vn",
+            "-c:a",
+            AUDIO_CODEC,
+            "-ar",
+            str(AUDIO_SAMPLE_RATE),
+            "-ac",
+            str(AUDIO_CHANNELS),
+            "-t",
+            f"{duration:.3f}",
+            "-f",
+            "mp4",
+            str(output_path),
+        ]
+    )
+
+
+def probe_track(ffmpeg: str, path: Path, size: int, mtime_ns: int) -> MusicTrack:
+    """Read duration, sample rate and channels, and measure loudness, in one decode."""
+    sha256 = file_sha256(path)
+    result = subprocess.run(
+        [
+            ffmpeg,
+            "-hide_banner",
+            "-nostats",
+            "-i",
+            str(path),
+            "-map",
+            "0:a:0",
+            "-af",
+            "ebur128=framelog=verbose",
+            "-f",
+            "null",
+            "-",
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+    )
+    output = result.stderr.decode("utf-8", errors="replace")
+    if result.returncode != 0:
+        lines = output.strip().splitlines()
+        return MusicTrack(
+            path, size, mtime_ns, sha256, error=lines[-1] if lines else "probe failed"
+        )
+    # The decoded length is exact; the header duration is an estimate for VBR.
+    decoded = _DECODED.findall(output)
+    header = _DURATION.search(output)
+    duration = None
+    if decoded:
+        duration = _seconds(*decoded[-1])
+    elif header is not None:
+        duration = _seconds(*header.groups())
+    stream = _STREAM.search(output)
+    loudness = _LOUDNESS.search(output)
+    return MusicTrack(
+        path=path,
+        size=size,
+        mtime_ns=mtime_ns,
+        sha256=sha256,
+        duration=duration,
+        sample_rate=int(stream.group(1)) if stream else None,
+        channels=_channels(stream.group(2).strip()) if stream else None,
+        loudness=float(loudness.group(1)) if loudness else None,
+    )
+
+
+def _channels(layout: str) -> Optional[int]:
+    if layout in _CHANNELS:
+        return _CHANNELS[layout]
+    count = _CHANNEL_COUNT.match(layout)
+    return int(count.group(1)) if count else None
+
+
+def _seconds(hours: str, minutes: str, seconds: str) -> float:
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
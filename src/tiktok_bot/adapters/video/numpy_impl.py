@@ -0,0 +1,125 @@
+from pathlib import Path
+
+from ...domain.models import OutputVariant, RenderRequest
+from ...ports.video import RENDER_MODE_SEGMENTS, RENDER_MODE_SINGLE, VideoRenderer
+from ...utils.music import choose_music_file
+from ...utils.telemetry import span
+from .ffmpeg_tools import (
+    find_ffmpeg,
+    mux_audio,
+    pipe_frames,
+    raw_video_encoder_command,
+    raw_video_variants_command,
+    temporary_sibling,
+    transcode_variants,
+)
+from .frame_cache import frame_cache_from_config
+from .frames import fade_levels, iter_segment_frames, plan_segments
+from .music_cache import optional_music
+from .segments import encode_segmented
+from .streaming import FrameWindow
+
+
+class NumpyFfmpegRenderer(VideoRenderer):
+    def render(self, request: RenderRequest) -> Path:
+        with span(
+            "render",
+            renderer="numpy",
+            mode=request.config.render_mode,
+            images=len(request.images),
+        ):
+            return self._render(request)
+
+    def _render(self, request: RenderRequest) -> Path:
+        config = request.config
+        if not request.images:
+            raise ValueError("No images provided for rendering.")
+        if config.render_mode not in (RENDER_MODE_SINGLE, RENDER_MODE_SEGMENTS):
+            raise ValueError(f"Unsupported render mode: {config.render_mode}")
+
+        ffmpeg = find_ffmpeg()
+        segments = plan_segments(request.images, config.image_duration, config.fps)
+        duration = segments[-1].start + segments[-1].duration
+
+        output_path = request.output_path
+        outputs = [
+            OutputVariant(
+                output_path, config.width, config.height, preset=config.preset
+            ),
+            *request.variants,
+        ]
+        video_paths = [
+            temporary_sibling(output.output_path, "video") for output in outputs
+        ]
+        for output in outputs:
+            output.output_path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            if config.render_mode == RENDER_MODE_SEGMENTS:
+                encode_segmented(
+                    segments,
+                    config,
+                    ffmpeg,
+                    video_paths[0],
+                    max_workers=config.segment_workers or None,
+                )
+                if request.variants:
+                    transcode_variants(
+                        ffmpeg,
+                        video_paths[0],
+                        config.fps,
+                        list(zip(request.variants, video_paths[1:])),
+                    )
+            else:
+                if request.variants:
+                    command = raw_video_variants_command(
+                        ffmpeg,
+                        config.width,
+                        config.height,
+                        config.fps,
+                        list(zip(outputs, video_paths)),
+                    )
+                else:
+                    command = raw_video_encoder_command(
+                        ffmpeg,
+                        config.width,
+                        config.height,
+                        config.fps,
+                        video_paths[0],
+                        preset=config.preset,
+                    )
+                with FrameWindow(
+                    segments,
+                    config.width,
+                    config.height,
+                    frame_cache_from_config(config),
+                ) as window:
+                    pipe_frames(
+                        command,
+                        (
+                            output_frame
+                            for segment in segments
+                            if segment.frame_count > 0
+                            for output_frame in iter_segment_frames(
+                                window.get(segment.index),
+                                fade_levels(segment, config.fps, config.fade_duration),
+                            )
+                        ),
+                    )
+            music_path = None
+            if config.include_music:
+                music_path = request.music_path or choose_music_file(config.music_dir)
+            if music_path is not None:
+                print(f"Selected music: {music_path}")
+                with optional_music(ffmpeg, music_path, duration, config) as audio:
+                    if audio is not None:
+                        for output, video_path in zip(outputs, video_paths):
+                            mux_audio(
+                                ffmpeg, video_path, audio, duration, output.output_path
+                            )
+                        return output_path
+            for output, video_path in zip(outputs, video_paths):
+                video_path.replace(output.output_path)
+            return output_path
+        finally:
+            for video_path in video_paths:
+                video_path.unlink(missing_ok=True)
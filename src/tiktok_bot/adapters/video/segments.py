@@ -0,0 +1,174 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Sequence
+
+from ...domain.models import RenderConfig
+from ...utils.disk_cache import LruDiskCache
+from ...utils.hashing import file_sha256
+from ...utils.telemetry import span
+from .ffmpeg_tools import (
+    DEFAULT_CODEC,
+    pipe_frames,
+    raw_video_encoder_command,
+    run_ffmpeg,
+)
+from .frame_cache import frame_cache_from_config, load_frame
+from .frames import DECODE_VERSION, Segment, fade_levels, iter_segment_frames
+
+
+_SEGMENT_SUFFIX = ".mp4"
+
+
+@dataclass(frozen=True)
+class SegmentJob:
+    segment: Segment
+    config: RenderConfig
+    ffmpeg: str
+    output_path: Path
+
+
+class SegmentCache:
+    def __init__(self, root: Path, max_bytes: int) -> None:
+        self._store = LruDiskCache(root, max_bytes)
+
+    def get(self, key: str) -> Optional[Path]:
+        return self._store.get(key, _SEGMENT_SUFFIX)
+
+    def put(self, key: str, segment_path: Path) -> None:
+        temp_path = self._store.temp_path(key, _SEGMENT_SUFFIX)
+        shutil.copyfile(segment_path, temp_path)
+        self._store.commit(temp_path, key, _SEGMENT_SUFFIX)
+
+
+def segment_cache_from_config(config: RenderConfig) -> Optional[SegmentCache]:
+    if config.segment_cache_dir is None or config.segment_cache_max_mb <= 0:
+        return None
+    return SegmentCache(
+        config.segment_cache_dir, config.segment_cache_max_mb * 1024 * 1024
+    )
+
+
+def segment_key(segment: Segment, config: RenderConfig) -> str:
+    parts = {
+        "image": file_sha256(segment.image),
+        "decode": DECODE_VERSION,
+        "start": segment.start,
+        "duration": segment.duration,
+        "first_frame": segment.first_frame,
+        "frame_count": segment.frame_count,
+        "fade": config.fade_duration,
+        "size": [config.width, config.height],
+        "fps": config.fps,
+        "codec": DEFAULT_CODEC,
+        "preset": config.preset,
+        "pix_fmt": "yuv420p",
+    }
+    payload = json.dumps(parts, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+def encode_segmented(
+    segments: Sequence[Segment],
+    config: RenderConfig,
+    ffmpeg: str,
+    output_path: Path,
+    max_workers: Optional[int] = None,
+) -> None:
+    cache = segment_cache_from_config(config)
+    segments = [segment for segment in segments if segment.frame_count > 0]
+    keys = [segment_key(segment, config) for segment in segments] if cache else []
+
+    with tempfile.TemporaryDirectory(
+        prefix=".segments-", dir=output_path.parent
+    ) as work_dir:
+        segment_paths: list[Optional[Path]] = [None] * len(segments)
+        jobs = []
+        for position, segment in enumerate(segments):
+            cached = cache.get(keys[position]) if cache else None
+            if cached is not None:
+                segment_paths[position] = cached
+                continue
+            jobs.append(
+                (
+                    position,
+                    SegmentJob(
+                        segment=segment,
+                        config=config,
+                        ffmpeg=ffmpeg,
+                        output_path=Path(work_dir) / f"segment_{segment.index:04d}.mp4",
+                    ),
+                )
+            )
+        if cache:
+            print(f"Reusing {len(segments) - len(jobs)}/{len(segments)} cached segments")
+
+        if jobs:
+            workers = max_workers or os.cpu_count() or 1
+            with span("encode"), ProcessPoolExecutor(
+                max_workers=min(workers, len(jobs))
+            ) as executor:
+                encoded = executor.map(encode_segment, [job for _, job in jobs])
+                for (position, _), path in zip(jobs, encoded):
+                    segment_paths[position] = path
+
+        with span("mux"):
+            concat_segments(ffmpeg, segment_paths, output_path)
+        if cache:
+            for position, job in jobs:
+                cache.put(keys[position], job.output_path)
+
+
+def encode_segment(job: SegmentJob) -> Path:
+    config = job.config
+    frame = load_frame(
+        job.segment.image, config.width, config.height, frame_cache_from_config(config)
+    )
+    levels = fade_levels(job.segment, config.fps, config.fade_duration)
+    pipe_frames(
+        raw_video_encoder_command(
+            job.ffmpeg,
+            config.width,
+            config.height,
+            config.fps,
+            job.output_path,
+            preset=config.preset,
+        ),
+        iter_segment_frames(frame, levels),
+    )
+    return job.output_path
+
+
+def concat_segments(ffmpeg: str, segment_paths: Sequence[Path], output_path: Path) -> None:
+    list_path = output_path.with_name(f".{output_path.stem}.concat.txt")
+    lines = [f"file '{_escape_concat_path(path)}'" for path in segment_paths]
+    list_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    try:
+        run_ffmpeg(
+            [
+                ffmpeg,
+                "-y",
+                "-loglevel",
+                "error",
+                "-f",
+                "concat",
+                "-safe",
+                "0",
+                "-i",
+                str(list_path),
+                "-c",
+                "copy",
+                str(output_path),
+            ]
+        )
+    finally:
+        list_path.unlink(missing_ok=True)
+
+
+def _escape_concat_path(path: Path) -> str:
+    return str(path.resolve()).replace("'", "'\\''")
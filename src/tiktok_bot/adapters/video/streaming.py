@@ -0,0 +1,54 @@
+import contextvars
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional, Sequence
+
+import numpy as np
+
+from .frame_cache import FrameCache, load_frame
+from .frames import Segment
+
+
+class FrameWindow:
+    """Decode segment frames on demand, keeping only the current and next one."""
+
+    def __init__(
+        self,
+        segments: Sequence[Segment],
+        width: int,
+        height: int,
+        cache: Optional[FrameCache] = None,
+    ) -> None:
+        self._segments = segments
+        self._width = width
+        self._height = height
+        self._cache = cache
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch")
+        self._frames: dict[int, Future] = {}
+
+    def get(self, index: int) -> np.ndarray:
+        wanted = {index, index + 1}
+        for stale in [key for key in self._frames if key not in wanted]:
+            self._frames.pop(stale).cancel()
+        for key in sorted(wanted):
+            if key < len(self._segments) and key not in self._frames:
+                self._frames[key] = self._executor.submit(
+                    contextvars.copy_context().run, self._load, key
+                )
+        return self._frames[index].result()
+
+    def close(self) -> None:
+        for future in self._frames.values():
+            future.cancel()
+        self._frames.clear()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> "FrameWindow":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _load(self, index: int) -> np.ndarray:
+        return load_frame(
+            self._segments[index].image, self._width, self._height, self._cache
+        )
@@ -0,0 +1,63 @@
+"""The ``tiktok-bot`` command line.
+
+Each subcommand lives in its own module and registers itself on the parser.
+Module-level imports stay light; renderers and crawlers are imported inside
+the commands that use them, so ``--help`` and worker clients start fast.
+"""
+
+import argparse
+from pathlib import Path
+from typing import Optional, Sequence
+
+from ..utils.config import load_telemetry_sink
+from ..utils.paths import resolve_relative
+from ..utils.telemetry import instrument_run, resolve_sink
+from . import fetch, music, pipeline, render, schedule, startup, worker
+
+COMMAND_MODULES = (render, fetch, pipeline, schedule, music, worker, startup)
+
+
+def build_parser(prog: str = "tiktok-bot") -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog=prog,
+        description="Fetch images, render videos and run the posting schedule.",
+    )
+    parser.add_argument(
+        "--root",
+        default=None,
+        help="Project directory that relative paths resolve against (default: cwd).",
+    )
+    parser.add_argument(
+        "--config",
+        default=None,
+        help="Config file (default: config.ini in the project directory).",
+    )
+    instrumented = argparse.ArgumentParser(add_help=False)
+    instrumented.add_argument(
+        "--telemetry",
+        default=None,
+        help="JSON-lines file for timing spans, or - for stderr (default from config.ini).",
+    )
+    instrumented.add_argument(
+        "--profile",
+        default=None,
+        help="Write a cProfile dump (.prof) or pyinstrument report (.html) for this run.",
+    )
+    subparsers = parser.add_subparsers(dest="command", metavar="COMMAND", required=True)
+    for module in COMMAND_MODULES:
+        module.register(subparsers, [instrumented])
+    return parser
+
+
+def main(
+    argv: Optional[Sequence[str]] = None,
+    root: Optional[Path] = None,
+    prog: str = "tiktok-bot",
+) -> None:
+    args = build_parser(prog).parse_args(argv)
+    args.root = Path(args.root or root or Path.cwd()).resolve()
+    args.config = resolve_relative(Path(args.config or "config.ini"), args.root)
+    sink = resolve_sink(args.telemetry or load_telemetry_sink(args.config), args.root)
+    profile = resolve_relative(Path(args.profile), args.root) if args.profile else None
+    with instrument_run(args.command.replace("-", "_"), sink=sink, profile=profile):
+        args.run(args)
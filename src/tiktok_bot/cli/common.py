@@ -0,0 +1,203 @@
+import argparse
+from dataclasses import replace
+from pathlib import Path
+from typing import Mapping, Optional, Sequence
+
+from ..adapters.video.factory import RENDERER_NAMES
+from ..domain.models import OutputVariant, RenderConfig
+from ..ports.schedule_store import ScheduleStore
+from ..ports.video import RENDER_MODES
+from ..service.client import WorkerClient
+from ..utils.config import load_render_config, resolve_config_paths
+from ..utils.paths import resolve_output_path, resolve_relative
+from ..utils.variants import parse_variant
+from ..workflows.fetch_images import fetch_request
+
+PROVIDERS = ("bing", "google", "baidu")
+DRAFT_HELP = (
+    "Quick QA render at reduced size and fps with an ultrafast preset, "
+    "written next to the output as .draft.mp4 plus a contact sheet."
+)
+
+# RenderConfig fields that every render option maps onto one to one.
+_RENDER_OVERRIDES = (
+    "width",
+    "height",
+    "fps",
+    "image_duration",
+    "fade_duration",
+    "include_music",
+    "renderer",
+    "render_mode",
+    "draft",
+)
+
+
+def storable_flags(store: ScheduleStore, flags: Mapping[str, bool]) -> dict[str, bool]:
+    """The part of ``flags`` the schedule has columns for.
+
+    A hand-edited CSV is never given new columns; flags it cannot hold are
+    reported and left out.
+    """
+    supported = store.flag_names()
+    missing = [flag for flag in flags if flag not in supported]
+    if missing:
+        columns = ", ".join(flag.replace("_", " ").capitalize() for flag in missing)
+        print(f"Schedule has no {columns} column; not recording it")
+    return {flag: value for flag, value in flags.items() if flag in supported}
+
+
+def project_path(args: argparse.Namespace, value: str) -> Path:
+    """Resolve a path option against the project root."""
+    return resolve_relative(Path(value), args.root)
+
+
+def add_renderer_option(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--renderer",
+        choices=RENDERER_NAMES,
+        default=None,
+        help="Video renderer implementation (default from config.ini).",
+    )
+
+
+def add_draft_option(parser: argparse.ArgumentParser, help: str = DRAFT_HELP) -> None:
+    parser.add_argument(
+        "--draft",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help=help,
+    )
+
+
+def add_worker_option(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--worker",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help=(
+            "Submit to the warm worker (tiktok-bot worker); by default only "
+            "when it is running."
+        ),
+    )
+
+
+def add_render_options(parser: argparse.ArgumentParser) -> None:
+    """Options that override ``[render]`` in config.ini for a single video."""
+    parser.add_argument("--width", type=int, default=None)
+    parser.add_argument("--height", type=int, default=None)
+    parser.add_argument("--fps", type=int, default=None)
+    parser.add_argument(
+        "--image-duration",
+        type=float,
+        default=None,
+        help="Ignored; per-image durations are hardcoded in timing_table.py.",
+    )
+    parser.add_argument(
+        "--fade-duration",
+        type=float,
+        default=None,
+        help="Ignored; fade is fixed at 0.2s when rendering.",
+    )
+    parser.add_argument(
+        "--music",
+        dest="include_music",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="Include background music from the music directory.",
+    )
+    parser.add_argument(
+        "--music-dir",
+        default=None,
+        help="Directory containing background music files.",
+    )
+    add_renderer_option(parser)
+    parser.add_argument(
+        "--render-mode",
+        choices=RENDER_MODES,
+        default=None,
+        help="Encode in one pass or as parallel per-image segments.",
+    )
+    add_draft_option(parser)
+    parser.add_argument(
+        "--variant",
+        dest="variants",
+        action="append",
+        nargs=2,
+        metavar=("SPEC", "OUTPUT"),
+        default=[],
+        help=(
+            "Extra output from the same render, SPEC as "
+            "WIDTHxHEIGHT[@FPS][:BITRATE[:PRESET]]; repeatable."
+        ),
+    )
+
+
+def load_config(args: argparse.Namespace) -> tuple[RenderConfig, Optional[str]]:
+    """``[render]`` from config.ini with the command's overrides applied."""
+    file_config, file_output = load_render_config(args.config)
+    overrides = {
+        field: getattr(args, field)
+        for field in _RENDER_OVERRIDES
+        if getattr(args, field, None) is not None
+    }
+    music_dir = getattr(args, "music_dir", None)
+    if music_dir is not None:
+        overrides["music_dir"] = Path(music_dir)
+    config = replace(file_config, **overrides)
+    return resolve_config_paths(config, args.root), file_output
+
+
+def output_variants(args: argparse.Namespace) -> list[OutputVariant]:
+    try:
+        return [
+            parse_variant(spec, resolve_output_path(project_path(args, path)))
+            for spec, path in args.variants
+        ]
+    except ValueError as exc:
+        raise SystemExit(str(exc)) from exc
+
+
+def report_outputs(
+    output_path: Path, config: RenderConfig, variants: Sequence[OutputVariant]
+) -> None:
+    print(f"Wrote video to {output_path}")
+    if config.draft:
+        return
+    for variant in variants:
+        print(
+            f"Wrote {variant.width}x{variant.height} variant to {variant.output_path}"
+        )
+
+
+def fetch_keyword_images(
+    worker: Optional[WorkerClient],
+    query: str,
+    output_base: Path,
+    provider: str,
+    max_num: int,
+    output_dir_name: Optional[str] = None,
+    config: Optional[RenderConfig] = None,
+) -> Sequence[Path]:
+    """Search ``provider`` for ``query`` on the worker, or here without one.
+
+    Fetching here goes through the image store of ``config``, if it has one.
+    """
+    if worker is not None:
+        request = fetch_request(query, output_base, max_num, output_dir_name)
+        return worker.fetch_images(request, provider)
+    # Only imported when fetching here; a worker client skips the cost.
+    from ..adapters.image.icrawler_impl import ICrawlerImageFetcher
+    from ..adapters.image.store import with_image_store
+    from ..workflows.fetch_images import fetch_images
+
+    fetcher = ICrawlerImageFetcher(provider=provider)
+    if config is not None:
+        fetcher = with_image_store(fetcher, config)
+    return fetch_images(
+        query=query,
+        output_base_dir=output_base,
+        fetcher=fetcher,
+        max_num=max_num,
+        output_dir_name=output_dir_name,
+    )
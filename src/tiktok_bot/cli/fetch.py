@@ -0,0 +1,183 @@
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from ..adapters.image.rate_limited import RateLimitedImageFetcher
+from ..adapters.schedule.factory import open_schedule_store
+from ..service.client import connect_worker
+from ..utils.config import load_worker_url
+from ..utils.paths import list_image_files
+from ..utils.rate_limit import TokenBucket
+from ..workflows.fetch_images import fetch_images
+from .common import (
+    PROVIDERS,
+    add_worker_option,
+    fetch_keyword_images,
+    load_config,
+    project_path,
+)
+
+
+def register(subparsers: argparse._SubParsersAction, parents: list) -> None:
+    parser = subparsers.add_parser(
+        "fetch-images",
+        parents=parents,
+        help="Download images for a keyword.",
+        description="Download images for a keyword using icrawler.",
+    )
+    parser.add_argument("query", help="Search keyword, e.g. 'sunset beach'")
+    parser.add_argument(
+        "--provider",
+        choices=PROVIDERS,
+        default="bing",
+        help="Image search provider.",
+    )
+    parser.add_argument(
+        "--max-num",
+        type=int,
+        default=30,
+        help="Maximum number of images to download.",
+    )
+    parser.add_argument(
+        "--output-base",
+        default="assets/images",
+        help="Base directory for downloaded images.",
+    )
+    parser.add_argument(
+        "--output-dir-name",
+        default=None,
+        help="Optional folder name under the base directory.",
+    )
+    add_worker_option(parser)
+    parser.set_defaults(run=run_fetch_images)
+
+    parser = subparsers.add_parser(
+        "fetch-missing-images",
+        parents=parents,
+        help="Fetch images for schedule rows missing images.",
+        description="Fetch images for schedule rows missing images.",
+    )
+    parser.add_argument(
+        "--schedule",
+        "--csv",
+        dest="schedule",
+        default="schedule.csv",
+        help="Schedule CSV, or a .db/.sqlite file for the SQLite store.",
+    )
+    parser.add_argument(
+        "--provider",
+        dest="providers",
+        action="append",
+        choices=PROVIDERS,
+        default=None,
+        help="Image search provider; repeat to spread rows across providers.",
+    )
+    parser.add_argument(
+        "--max-num",
+        type=int,
+        default=30,
+        help="Maximum number of images to download per row.",
+    )
+    parser.add_argument(
+        "--output-base",
+        default="assets/images",
+        help="Base directory for downloaded images.",
+    )
+    parser.add_argument(
+        "--per-provider",
+        type=int,
+        default=2,
+        help="Maximum concurrent fetches per provider.",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=0.5,
+        help="Fetches started per second per provider.",
+    )
+    parser.add_argument(
+        "--burst",
+        type=float,
+        default=2.0,
+        help="Fetches a provider may start back to back before --rate applies.",
+    )
+    parser.set_defaults(run=run_fetch_missing_images)
+
+
+def run_fetch_images(args: argparse.Namespace) -> None:
+    output_base_dir = project_path(args, args.output_base)
+    config, _ = load_config(args)
+    worker = connect_worker(load_worker_url(args.config), args.worker)
+    images = fetch_keyword_images(
+        worker,
+        args.query,
+        output_base_dir,
+        args.provider,
+        args.max_num,
+        output_dir_name=args.output_dir_name,
+        config=config,
+    )
+    if images:
+        print(f"Downloaded {len(images)} images to {images[0].parent}")
+    else:
+        print("No images were downloaded.")
+
+
+def run_fetch_missing_images(args: argparse.Namespace) -> None:
+    # icrawler is only imported by the commands that crawl.
+    from ..adapters.image.icrawler_impl import ICrawlerImageFetcher
+    from ..adapters.image.store import with_image_store
+
+    schedule_path = project_path(args, args.schedule)
+    output_base = project_path(args, args.output_base)
+    store = open_schedule_store(schedule_path)
+    config, _ = load_config(args)
+
+    providers = list(dict.fromkeys(args.providers or ["bing"]))
+    fetchers = {
+        provider: with_image_store(
+            RateLimitedImageFetcher(
+                ICrawlerImageFetcher(provider=provider),
+                TokenBucket(rate=args.rate, capacity=args.burst),
+                max_concurrent=args.per_provider,
+            ),
+            config,
+        )
+        for provider in providers
+    }
+    updated = 0
+    pending = []
+
+    for name in dict.fromkeys(row.name for row in store.rows(has_images=False)):
+        output_dir = output_base / name
+        if output_dir.exists() and list_image_files(output_dir):
+            updated += store.set_flags(name, has_images=True)
+            continue
+        pending.append(name)
+
+    def _fetch_row(name: str, provider: str) -> bool:
+        images = fetch_images(
+            query=name,
+            output_base_dir=output_base,
+            fetcher=fetchers[provider],
+            max_num=args.max_num,
+            output_dir_name=name,
+        )
+        return bool(images)
+
+    max_workers = max(1, len(providers) * args.per_provider)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(_fetch_row, name, providers[index % len(providers)]): name
+            for index, name in enumerate(pending)
+        }
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                if not future.result():
+                    continue
+            except Exception as exc:
+                print(f"Failed to fetch images for '{name}': {exc}")
+                continue
+            updated += store.set_flags(name, has_images=True)
+
+    print(f"Updated {updated} rows in {schedule_path}")
@@ -0,0 +1,52 @@
+import argparse
+
+from ..adapters.video.ffmpeg_tools import find_ffmpeg
+from ..adapters.video.music_cache import music_cache_from_config, slideshow_durations
+from .common import load_config
+
+
+def register(subparsers: argparse._SubParsersAction, parents: list) -> None:
+    parser = subparsers.add_parser(
+        "music-index",
+        parents=parents,
+        help="Probe the music library and pre-encode its audio clips.",
+        description=(
+            "Probe every track in the music directory (duration, sample rate, "
+            "loudness) and optionally encode AAC clips for each slideshow length."
+        ),
+    )
+    parser.add_argument(
+        "--music-dir",
+        default=None,
+        help="Directory containing background music files.",
+    )
+    parser.add_argument(
+        "--warm",
+        action="store_true",
+        help="Encode a clip per track for every length in the timing table.",
+    )
+    parser.set_defaults(run=run_music_index)
+
+
+def run_music_index(args: argparse.Namespace) -> None:
+    config, _ = load_config(args)
+    cache = music_cache_from_config(config, find_ffmpeg())
+    if cache is None:
+        raise SystemExit(
+            "Music cache is disabled. Set [render].music_cache_dir and "
+            "music_cache_max_mb in config.ini."
+        )
+    durations = slideshow_durations() if args.warm else ()
+    tracks, encoded = cache.warm(config.music_dir, durations)
+    for track in tracks:
+        if not track.playable:
+            print(f"{track.path.name}: unreadable ({track.error or 'no audio'})")
+            continue
+        loudness = f"{track.loudness:.1f} LUFS" if track.loudness is not None else "?"
+        print(
+            f"{track.path.name}: {track.duration:.2f}s, "
+            f"{track.sample_rate or '?'} Hz, {track.channels or '?'} ch, {loudness}"
+        )
+    print(f"Indexed {len(tracks)} tracks in {config.music_dir}")
+    if args.warm:
+        print(f"Cached {encoded} clips for {len(durations)} slideshow lengths")
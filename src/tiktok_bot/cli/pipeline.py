@@ -0,0 +1,247 @@
+import argparse
+import signal
+import threading
+from pathlib import Path
+from typing import Iterator
+
+from ..adapters.schedule.factory import open_schedule_store
+from ..adapters.video.factory import FRAME_CACHE_RENDERERS, create_renderer
+from ..domain.models import ImageFetchRequest
+from ..ports.location_api import LocationApi
+from ..utils.paths import list_image_files
+from ..workflows.pipeline import PipelineJob, PipelineResult, run_pipeline
+from .common import (
+    PROVIDERS,
+    add_draft_option,
+    add_renderer_option,
+    load_config,
+    project_path,
+    storable_flags,
+)
+from .render import add_location_options, location_api, random_location_request
+
+SOURCE_SCHEDULE = "schedule"
+SOURCE_RANDOM_LOCATION = "random-location"
+
+
+def register(subparsers: argparse._SubParsersAction, parents: list) -> None:
+    parser = subparsers.add_parser(
+        "pipeline",
+        parents=parents,
+        help="Fetch and render many locations with downloads overlapping renders.",
+        description=(
+            "Fetch images, warm the frame cache and render videos for many "
+            "locations at once: the next locations download while the current "
+            "one renders."
+        ),
+    )
+    parser.add_argument(
+        "source",
+        choices=[SOURCE_SCHEDULE, SOURCE_RANDOM_LOCATION],
+        help=(
+            "schedule: rows not rendered or uploaded yet; "
+            "random-location: --count calls to the location endpoint."
+        ),
+    )
+    parser.add_argument(
+        "--count",
+        type=int,
+        default=5,
+        help="Locations to request from the endpoint (random-location only).",
+    )
+    parser.add_argument(
+        "--schedule",
+        "--csv",
+        dest="schedule",
+        default="schedule.csv",
+        help="Schedule CSV, or a .db/.sqlite file for the SQLite store.",
+    )
+    parser.add_argument(
+        "--images-base",
+        default="assets/images",
+        help="Base directory containing one image folder per location.",
+    )
+    parser.add_argument(
+        "--output-base",
+        default="outputs/renders",
+        help="Directory for rendered videos.",
+    )
+    parser.add_argument(
+        "--provider",
+        choices=PROVIDERS,
+        default="bing",
+        help="Image search provider for schedule rows without images.",
+    )
+    parser.add_argument(
+        "--max-num",
+        type=int,
+        default=30,
+        help="Maximum number of images to download per schedule row.",
+    )
+    parser.add_argument(
+        "--fetch-workers",
+        type=int,
+        default=2,
+        help="Locations downloaded at the same time.",
+    )
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=1,
+        help="Locations each stage may hold ready for the next one.",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-render schedule rows already marked as Rendered.",
+    )
+    add_location_options(parser)
+    add_renderer_option(parser)
+    add_draft_option(parser, help="Render quick drafts; rows are not marked Rendered.")
+    parser.set_defaults(run=run_pipeline_command)
+
+
+def run_pipeline_command(args: argparse.Namespace) -> None:
+    # The pipeline renders in this process, so it always needs the render stack.
+    from ..adapters.image.store import image_store_from_config, with_image_store
+    from ..workflows.build_video import build_video, choose_images, draft_config
+
+    if args.count < 1:
+        raise SystemExit("--count must be at least 1.")
+    if args.fetch_workers < 1 or args.queue_size < 1:
+        raise SystemExit("--fetch-workers and --queue-size must be at least 1.")
+
+    images_base = project_path(args, args.images_base)
+    output_base = project_path(args, args.output_base)
+    config, _ = load_config(args)
+    renderer = create_renderer(config.renderer)
+    catalog = image_store_from_config(config)
+    store = None
+    flags: dict[str, bool] = {}
+    api = None
+
+    if args.source == SOURCE_SCHEDULE:
+        # icrawler is only imported by the commands that crawl.
+        from ..adapters.image.icrawler_impl import ICrawlerImageFetcher
+
+        schedule_path = project_path(args, args.schedule)
+        store = open_schedule_store(schedule_path)
+        rows = store.rows(
+            uploaded=False,
+            rendered=None if args.force or config.draft else False,
+        )
+        names = list(dict.fromkeys(row.name for row in rows))
+        jobs: Iterator[PipelineJob] = iter(
+            [
+                PipelineJob(
+                    name=name,
+                    request=ImageFetchRequest(
+                        query=name,
+                        output_dir=images_base / name,
+                        max_num=args.max_num,
+                    ),
+                    output_path=output_base / f"{name}.mp4",
+                )
+                for name in names
+            ]
+        )
+        fetcher = with_image_store(ICrawlerImageFetcher(provider=args.provider), config)
+        wanted = {"has_images": True}
+        if not config.draft:
+            wanted["rendered"] = True
+        flags = storable_flags(store, wanted)
+        print(f"Running {len(names)} rows from {schedule_path}")
+    else:
+        from ..adapters.image.http_impl import HttpImageFetcher
+
+        api = location_api(args)
+        jobs = _random_location_jobs(api, args.count, images_base, output_base)
+        fetcher = with_image_store(
+            HttpImageFetcher(max_workers=args.download_workers), config
+        )
+        print(f"Running {args.count} random locations")
+
+    def fetch(job: PipelineJob) -> list[Path]:
+        # Rows fetched by an earlier run are rendered from what is on disk.
+        if job.image_dir.exists():
+            existing = list_image_files(job.image_dir)
+            if existing:
+                return existing
+        return fetcher.fetch(job.request)
+
+    render_config = draft_config(config) if config.draft else config
+    # Images chosen by the preprocess thread, handed to the render by job name.
+    chosen: dict[str, list[Path]] = {}
+
+    def preprocess(job: PipelineJob) -> None:
+        images = choose_images(job.image_dir, config, catalog)
+        if config.renderer in FRAME_CACHE_RENDERERS:
+            # Imports numpy; the ffmpeg renderer never gets here.
+            from ..adapters.video.frame_cache import warm_frame_cache
+
+            # Only the images the render will pick, not every file fetched.
+            warm_frame_cache(images, render_config)
+        chosen[job.name] = images
+
+    def render(job: PipelineJob) -> Path:
+        return build_video(
+            image_dir=job.image_dir,
+            output_path=job.output_path,
+            renderer=renderer,
+            config=config,
+            images=chosen.pop(job.name, None),
+        )
+
+    def on_result(result: PipelineResult) -> None:
+        name = result.job.name
+        if not result.ok:
+            print(f"Failed to {result.stage} '{name}': {result.error}")
+            return
+        if store is not None and flags:
+            store.set_flags(name, **flags)
+        print(f"Wrote video to {result.output_path}")
+
+    stop = threading.Event()
+
+    def _request_stop(signum, _frame) -> None:
+        print(f"Received {signal.Signals(signum).name}, stopping")
+        stop.set()
+
+    signal.signal(signal.SIGINT, _request_stop)
+    signal.signal(signal.SIGTERM, _request_stop)
+    try:
+        results = run_pipeline(
+            jobs,
+            fetch,
+            render,
+            preprocess=preprocess,
+            fetch_workers=args.fetch_workers,
+            queue_size=args.queue_size,
+            on_result=on_result,
+            stop=stop,
+        )
+    finally:
+        if api is not None:
+            api.close()
+    rendered = sum(1 for result in results if result.ok)
+    print(f"Rendered {rendered}/{len(results)} locations")
+
+
+def _random_location_jobs(
+    api: LocationApi, count: int, images_base: Path, output_base: Path
+) -> Iterator[PipelineJob]:
+    # Called lazily by the fetch workers, so endpoint calls overlap renders too.
+    seen: set[Path] = set()
+    for _ in range(count):
+        location = api.random_location()
+        request = random_location_request(images_base, location)
+        # The endpoint may pick a location twice; render it once.
+        if request.output_dir in seen:
+            print(f"Skipping repeated location '{location.name}'")
+            continue
+        seen.add(request.output_dir)
+        yield PipelineJob(
+            name=location.name,
+            request=request,
+            output_path=output_base / f"{request.output_dir.name}.mp4",
+        )
@@ -0,0 +1,251 @@
+import argparse
+from pathlib import Path
+from typing import Sequence
+
+from ..adapters.location.http_impl import DEFAULT_ENDPOINT, HttpLocationApi
+from ..adapters.video.factory import create_renderer
+from ..domain.models import ImageFetchRequest, Location, OutputVariant, RenderConfig
+from ..service.client import connect_worker
+from ..service.protocol import FETCHER_HTTP
+from ..utils.config import (
+    load_server_base_url,
+    load_server_cache_dir,
+    load_worker_url,
+)
+from ..utils.paths import resolve_output_path, safe_dir_name
+from .common import (
+    PROVIDERS,
+    add_draft_option,
+    add_render_options,
+    add_renderer_option,
+    add_worker_option,
+    fetch_keyword_images,
+    load_config,
+    output_variants,
+    project_path,
+    report_outputs,
+)
+
+
+def register(subparsers: argparse._SubParsersAction, parents: list) -> None:
+    parser = subparsers.add_parser(
+        "render",
+        parents=parents,
+        help="Render a video from a folder of images.",
+        description="Render a TikTok-style video from a folder of images.",
+    )
+    parser.add_argument(
+        "--input-dir",
+        default="assets/images",
+        help="Directory containing input images.",
+    )
+    parser.add_argument(
+        "--output",
+        default=None,
+        help="Output file path or directory.",
+    )
+    add_render_options(parser)
+    add_worker_option(parser)
+    parser.set_defaults(run=run_render)
+
+    parser = subparsers.add_parser(
+        "fetch-and-render",
+        parents=parents,
+        help="Download images for a keyword and render them.",
+        description="Download images for a keyword and render a video.",
+    )
+    parser.add_argument("name", help="Keyword and folder name.")
+    parser.add_argument(
+        "--provider",
+        choices=PROVIDERS,
+        default="bing",
+        help="Image search provider.",
+    )
+    parser.add_argument(
+        "--max-num",
+        type=int,
+        default=30,
+        help="Maximum number of images to download.",
+    )
+    parser.add_argument(
+        "--output-base",
+        default="assets/images",
+        help="Base directory for downloaded images.",
+    )
+    add_render_options(parser)
+    add_worker_option(parser)
+    parser.set_defaults(run=run_fetch_and_render)
+
+    parser = subparsers.add_parser(
+        "fetch-random-location",
+        parents=parents,
+        help="Fetch a random location from the server and render it.",
+        description="Fetch a random location from the configured server endpoint.",
+    )
+    parser.add_argument(
+        "--count",
+        type=int,
+        default=1,
+        help="Distinct locations to fetch, requested concurrently, and render.",
+    )
+    add_location_options(parser)
+    add_renderer_option(parser)
+    add_draft_option(parser)
+    add_worker_option(parser)
+    parser.set_defaults(run=run_fetch_random_location)
+
+
+def run_render(args: argparse.Namespace) -> None:
+    input_dir = project_path(args, args.input_dir)
+    config, file_output = load_config(args)
+    output_raw = args.output or file_output or "outputs/renders/render.mp4"
+    output_path = resolve_output_path(project_path(args, output_raw))
+    variants = output_variants(args)
+    worker = connect_worker(load_worker_url(args.config), args.worker)
+    if worker is not None:
+        output_path = worker.build_video(input_dir, output_path, config, variants)
+    else:
+        output_path = _build_video(input_dir, output_path, config, variants)
+    report_outputs(output_path, config, variants)
+
+
+def run_fetch_and_render(args: argparse.Namespace) -> None:
+    name = args.name
+    output_base = project_path(args, args.output_base)
+
+    config, _ = load_config(args)
+    worker = connect_worker(load_worker_url(args.config), args.worker)
+    images = fetch_keyword_images(
+        worker,
+        name,
+        output_base,
+        args.provider,
+        args.max_num,
+        output_dir_name=name,
+        config=config,
+    )
+    if not images:
+        raise RuntimeError("No images were downloaded.")
+
+    output_path = resolve_output_path(
+        project_path(args, f"outputs/renders/{name}.mp4")
+    )
+    variants = output_variants(args)
+    if worker is not None:
+        output_path = worker.build_video(
+            output_base / name, output_path, config, variants
+        )
+    else:
+        output_path = _build_video(output_base / name, output_path, config, variants)
+    report_outputs(output_path, config, variants)
+
+
+def run_fetch_random_location(args: argparse.Namespace) -> None:
+    if args.count < 1:
+        raise SystemExit("--count must be at least 1.")
+    with location_api(args) as api:
+        try:
+            locations = api.random_locations(args.count)
+        except RuntimeError as exc:
+            raise SystemExit(str(exc)) from exc
+    if len(locations) < args.count:
+        print(f"The server returned {len(locations)} distinct locations")
+
+    config, _ = load_config(args)
+    worker = connect_worker(load_worker_url(args.config), args.worker)
+    fetcher = None
+    if worker is None:
+        # Only imported when working here; a worker client skips the cost.
+        from ..adapters.image.http_impl import HttpImageFetcher
+        from ..adapters.image.store import with_image_store
+
+        fetcher = with_image_store(
+            HttpImageFetcher(max_workers=args.download_workers), config
+        )
+
+    failed = 0
+    for location in locations:
+        location_request = random_location_request(
+            project_path(args, "assets/images"), location
+        )
+        images_dir = location_request.output_dir
+        if worker is not None:
+            downloaded = worker.fetch_images(location_request, FETCHER_HTTP)
+        else:
+            downloaded = fetcher.fetch(location_request)
+        if not downloaded:
+            print(f"No images were downloaded from imageUrls for '{location.name}'.")
+            failed += 1
+            continue
+
+        output_path = project_path(args, f"outputs/renders/{images_dir.name}.mp4")
+        if worker is not None:
+            output_path = worker.build_video(images_dir, output_path, config)
+        else:
+            output_path = _build_video(images_dir, output_path, config, [])
+        print(f"Saved {len(downloaded)} images to {images_dir}")
+        print(f"Wrote video to {output_path}")
+    if failed:
+        raise SystemExit(f"Failed to render {failed} of {len(locations)} locations.")
+
+
+def add_location_options(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--base-url",
+        default=None,
+        help="Override the server base URL from config.ini.",
+    )
+    parser.add_argument(
+        "--endpoint",
+        default=DEFAULT_ENDPOINT,
+        help=f"Endpoint path to call (default: {DEFAULT_ENDPOINT}).",
+    )
+    parser.add_argument(
+        "--download-workers",
+        type=int,
+        default=8,
+        help="Maximum number of concurrent image downloads.",
+    )
+
+
+def location_api(args: argparse.Namespace) -> HttpLocationApi:
+    base_url = args.base_url or load_server_base_url(args.config)
+    if not base_url:
+        raise SystemExit(
+            "Server base URL is not configured. Set [server].base_url in config.ini or pass --base-url."
+        )
+    cache_dir = load_server_cache_dir(args.config)
+    return HttpLocationApi(
+        base_url,
+        endpoint=args.endpoint,
+        cache_dir=project_path(args, cache_dir) if cache_dir is not None else None,
+    )
+
+
+def random_location_request(images_base: Path, location: Location) -> ImageFetchRequest:
+    return ImageFetchRequest(
+        query=location.name,
+        output_dir=images_base / safe_dir_name(location.name),
+        max_num=len(location.image_urls),
+        image_urls=location.image_urls,
+    )
+
+
+def _build_video(
+    image_dir: Path,
+    output_path: Path,
+    config: RenderConfig,
+    variants: Sequence[OutputVariant],
+) -> Path:
+    # Only imported when rendering here; a worker client skips the cost.
+    from ..adapters.image.store import image_store_from_config
+    from ..workflows.build_video import build_video
+
+    return build_video(
+        image_dir=image_dir,
+        output_path=output_path,
+        renderer=create_renderer(config.renderer),
+        config=config,
+        variants=variants,
+        catalog=image_store_from_config(config),
+    )
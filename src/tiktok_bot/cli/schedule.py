@@ -0,0 +1,299 @@
+import argparse
+import shlex
+import signal
+import subprocess
+import sys
+import threading
+from datetime import timedelta
+from pathlib import Path
+
+from ..adapters.schedule.factory import open_schedule_store
+from ..adapters.schedule.sqlite_impl import SqliteScheduleStore
+from ..adapters.video.factory import create_renderer
+from ..utils.paths import list_image_files
+from ..workflows.fetch_images import fetch_images
+from ..workflows.scheduler import ScheduledItem, Scheduler
+from .common import (
+    PROVIDERS,
+    add_draft_option,
+    add_renderer_option,
+    load_config,
+    project_path,
+    storable_flags,
+)
+
+
+def register(subparsers: argparse._SubParsersAction, parents: list) -> None:
+    parser = subparsers.add_parser(
+        "render-schedule",
+        parents=parents,
+        help="Render every schedule row that has images and is not uploaded.",
+        description="Render every schedule row that has images and is not uploaded yet.",
+    )
+    _add_schedule_option(parser)
+    _add_base_options(parser)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of render processes (default: CPU count).",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-render rows already marked as Rendered.",
+    )
+    add_renderer_option(parser)
+    add_draft_option(
+        parser,
+        help=(
+            "Quick QA renders at reduced size and fps with an ultrafast preset, "
+            "plus contact sheets; rows are not marked Rendered."
+        ),
+    )
+    parser.set_defaults(run=run_render_schedule)
+
+    parser = subparsers.add_parser(
+        "schedule-daemon",
+        parents=parents,
+        help="Render each schedule row ahead of its Run at.",
+        description=(
+            "Watch the schedule and have each row's video rendered before its Run at."
+        ),
+    )
+    _add_schedule_option(parser)
+    _add_base_options(parser)
+    parser.add_argument(
+        "--lead-minutes",
+        type=float,
+        default=30.0,
+        help="Start fetching and rendering this long before Run at.",
+    )
+    parser.add_argument(
+        "--max-lateness-minutes",
+        type=float,
+        default=15.0,
+        help="Skip rows whose Run at passed more than this long ago.",
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=5.0,
+        help="Seconds between checks of the CSV for edits.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Rows prepared at the same time.",
+    )
+    parser.add_argument(
+        "--provider",
+        choices=PROVIDERS,
+        default="bing",
+        help="Image search provider for rows without images.",
+    )
+    parser.add_argument(
+        "--max-num",
+        type=int,
+        default=30,
+        help="Maximum number of images to download per row.",
+    )
+    add_renderer_option(parser)
+    add_draft_option(parser, help="Render quick drafts instead of full videos.")
+    parser.add_argument(
+        "--on-due",
+        default=None,
+        metavar="COMMAND",
+        help=(
+            "Command run at Run at with the video path and row name appended; "
+            "exit status 0 marks the row Uploaded."
+        ),
+    )
+    parser.set_defaults(run=run_schedule_daemon)
+
+    parser = subparsers.add_parser(
+        "schedule-db",
+        parents=parents,
+        help="Copy the schedule between CSV and SQLite.",
+        description="Copy the schedule between the CSV file and the SQLite store.",
+    )
+    parser.add_argument(
+        "action",
+        choices=["import", "export"],
+        help="import: replace the database with the CSV; export: write the CSV.",
+    )
+    parser.add_argument(
+        "--csv",
+        default="schedule.csv",
+        help="Path to schedule CSV.",
+    )
+    parser.add_argument(
+        "--db",
+        default="schedule.db",
+        help="Path to the SQLite schedule database.",
+    )
+    parser.set_defaults(run=run_schedule_db)
+
+
+def _add_schedule_option(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--schedule",
+        "--csv",
+        dest="schedule",
+        default="schedule.csv",
+        help="Schedule CSV, or a .db/.sqlite file for the SQLite store.",
+    )
+
+
+def _add_base_options(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--images-base",
+        default="assets/images",
+        help="Base directory containing one image folder per row name.",
+    )
+    parser.add_argument(
+        "--output-base",
+        default="outputs/renders",
+        help="Directory for rendered videos.",
+    )
+
+
+def run_render_schedule(args: argparse.Namespace) -> None:
+    # Pulls in the render stack; only this command needs it.
+    from ..adapters.image.store import image_store_from_config
+    from ..workflows.batch_render import BatchJob, batch_render
+
+    schedule_path = project_path(args, args.schedule)
+    images_base = project_path(args, args.images_base)
+    output_base = project_path(args, args.output_base)
+    store = open_schedule_store(schedule_path)
+    config, _ = load_config(args)
+
+    due_rows = store.rows(
+        has_images=True,
+        uploaded=False,
+        rendered=None if args.force or config.draft else False,
+    )
+    jobs = [
+        BatchJob(
+            name=name,
+            image_dir=images_base / name,
+            output_path=output_base / f"{name}.mp4",
+        )
+        for name in dict.fromkeys(row.name for row in due_rows)
+    ]
+
+    print(f"Rendering {len(jobs)} rows from {schedule_path}")
+    results = batch_render(
+        jobs,
+        config,
+        create_renderer,
+        max_workers=args.workers,
+        catalog_factory=image_store_from_config,
+    )
+
+    rendered = []
+    for result in results:
+        if result.ok:
+            rendered.append(result.job.name)
+            print(f"Wrote video to {result.output_path}")
+        else:
+            print(f"Failed to render '{result.job.name}': {result.error}")
+    # One write for the whole batch instead of one per row.
+    if rendered and not config.draft:
+        flags = storable_flags(store, {"rendered": True})
+        if flags:
+            store.set_flags_many(rendered, **flags)
+
+    print(f"Rendered {len(rendered)}/{len(jobs)} rows")
+
+
+def run_schedule_daemon(args: argparse.Namespace) -> None:
+    # The daemon stays up, so pay for the render and crawl stacks at startup.
+    from ..adapters.image.icrawler_impl import ICrawlerImageFetcher
+    from ..adapters.image.store import image_store_from_config, with_image_store
+    from ..workflows.build_video import build_video
+
+    schedule_path = project_path(args, args.schedule)
+    images_base = project_path(args, args.images_base)
+    output_base = project_path(args, args.output_base)
+    config, _ = load_config(args)
+    # Created once so the renderer's imports are paid at startup, not per row.
+    renderer = create_renderer(config.renderer)
+    fetcher = with_image_store(ICrawlerImageFetcher(provider=args.provider), config)
+    catalog = image_store_from_config(config)
+    on_due_command = shlex.split(args.on_due) if args.on_due else None
+
+    def prepare(item: ScheduledItem) -> Path:
+        image_dir = images_base / item.name
+        if not (image_dir.exists() and list_image_files(image_dir)):
+            images = fetch_images(
+                query=item.name,
+                output_base_dir=images_base,
+                fetcher=fetcher,
+                max_num=args.max_num,
+                output_dir_name=item.name,
+            )
+            if not images:
+                raise RuntimeError("No images were downloaded.")
+        return build_video(
+            image_dir=image_dir,
+            output_path=output_base / f"{item.name}.mp4",
+            renderer=renderer,
+            config=config,
+            catalog=catalog,
+        )
+
+    def on_due(item: ScheduledItem, video_path: Path) -> bool:
+        if on_due_command is None:
+            print(f"'{item.name}' is due: {video_path}")
+            return False
+        result = subprocess.run([*on_due_command, str(video_path), item.name])
+        if result.returncode != 0:
+            print(
+                f"On-due command failed for '{item.name}' "
+                f"with exit status {result.returncode}",
+                file=sys.stderr,
+            )
+        return result.returncode == 0
+
+    store = open_schedule_store(schedule_path)
+    scheduler = Scheduler(
+        store,
+        prepare,
+        on_due,
+        lead=timedelta(minutes=args.lead_minutes),
+        max_lateness=timedelta(minutes=args.max_lateness_minutes),
+        poll_interval=args.poll_interval,
+        prepare_workers=args.workers,
+        prepared_flags=(
+            {}
+            if config.draft
+            else storable_flags(store, {"has_images": True, "rendered": True})
+        ),
+        due_flags={} if config.draft else storable_flags(store, {"uploaded": True}),
+    )
+
+    stop = threading.Event()
+
+    def _request_stop(signum, _frame) -> None:
+        print(f"Received {signal.Signals(signum).name}, stopping")
+        stop.set()
+
+    signal.signal(signal.SIGINT, _request_stop)
+    signal.signal(signal.SIGTERM, _request_stop)
+    print(f"Watching {schedule_path}")
+    scheduler.run_forever(stop)
+
+
+def run_schedule_db(args: argparse.Namespace) -> None:
+    csv_path = project_path(args, args.csv)
+    db_path = project_path(args, args.db)
+    store = SqliteScheduleStore(db_path)
+    if args.action == "import":
+        count = store.import_csv(csv_path)
+        print(f"Imported {count} rows from {csv_path} into {db_path}")
+    else:
+        count = store.export_csv(csv_path)
+        print(f"Exported {count} rows from {db_path} to {csv_path}")
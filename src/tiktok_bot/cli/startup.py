@@ -0,0 +1,117 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+# Imported only by the commands that render or crawl; none of them may load
+# while the CLI starts up.
+HEAVY_MODULES = (
+    "moviepy",
+    "icrawler",
+    "numpy",
+    "PIL",
+    "imageio",
+    "imageio_ffmpeg",
+)
+DEFAULT_BUDGET_MS = 100.0
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+from tiktok_bot.cli import build_parser
+build_parser()
+elapsed = time.perf_counter() - start
+heavy = sorted({name.split(".")[0] for name in sys.modules} & set(sys.argv[1:]))
+print(json.dumps({"ms": elapsed * 1000, "heavy": heavy}))
+"""
+
+
+def register(subparsers: argparse._SubParsersAction, parents: list) -> None:
+    parser = subparsers.add_parser(
+        "check-startup",
+        parents=parents,
+        help="Check that the CLI starts within its import-time budget.",
+        description=(
+            "Import the CLI and build its parser in fresh interpreters and fail "
+            "if that takes longer than the budget or loads a render or crawl "
+            "library."
+        ),
+    )
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=DEFAULT_BUDGET_MS,
+        help=f"Allowed import time in milliseconds (default: {DEFAULT_BUDGET_MS:g}).",
+    )
+    parser.add_argument(
+        "--runs",
+        type=int,
+        default=5,
+        help="Fresh interpreters to time; the fastest run counts.",
+    )
+    parser.set_defaults(run=run_check_startup)
+
+
+def run_check_startup(args: argparse.Namespace) -> None:
+    if args.runs < 1:
+        raise SystemExit("--runs must be at least 1.")
+    best, heavy = measure_startup(args.runs)
+    print(
+        f"CLI import: {best:.1f} ms "
+        f"(budget {args.budget_ms:g} ms, best of {args.runs})"
+    )
+    failures = []
+    if heavy:
+        failures.append(f"loaded at startup: {', '.join(sorted(heavy))}")
+    if best > args.budget_ms:
+        failures.append(f"{best:.1f} ms is over the {args.budget_ms:g} ms budget")
+    if not failures:
+        return
+    print("Slowest imports:")
+    for micros, name in _slowest_imports(10):
+        print(f"  {micros / 1000:8.1f} ms  {name}")
+    raise SystemExit("Startup check failed: " + "; ".join(failures))
+
+
+def measure_startup(runs: int = 5) -> tuple[float, set[str]]:
+    """Fastest CLI import time in milliseconds over ``runs`` fresh
+    interpreters, and the ``HEAVY_MODULES`` any of them loaded."""
+    timings = []
+    heavy: set[str] = set()
+    for _ in range(runs):
+        probe = _probe([sys.executable, "-c", _PROBE, *HEAVY_MODULES])
+        result = json.loads(probe.stdout)
+        timings.append(result["ms"])
+        heavy.update(result["heavy"])
+    return min(timings), heavy
+
+
+def _probe(command: list[str]) -> subprocess.CompletedProcess:
+    env = dict(os.environ)
+    # Point the child at this copy of the package, installed or not.
+    package_parent = str(Path(__file__).resolve().parents[2])
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [package_parent, env.get("PYTHONPATH")])
+    )
+    result = subprocess.run(
+        command, env=env, capture_output=True, text=True, check=False
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Startup probe failed:\n{result.stderr.strip()}")
+    return result
+
+
+def _slowest_imports(limit: int) -> list[tuple[int, str]]:
+    probe = _probe(
+        [sys.executable, "-X", "importtime", "-c", "import tiktok_bot.cli"]
+    )
+    entries = []
+    # Lines look like "import time:  self [us] | cumulative | imported package".
+    for line in probe.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        entries.append((int(parts[1]), parts[2].strip()))
+    return sorted(entries, reverse=True)[:limit]
@@ -0,0 +1,124 @@
+import argparse
+import ipaddress
+import signal
+import threading
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from ..adapters.video.factory import RENDERER_NAMES
+from ..service.protocol import FETCHER_HTTP
+from ..utils.config import load_render_config, load_worker_url, resolve_config_paths
+from ..utils.paths import resolve_relative
+from .common import PROVIDERS
+
+DEFAULT_URL = "http://127.0.0.1:8765"
+
+
+def register(subparsers: argparse._SubParsersAction, parents: list) -> None:
+    parser = subparsers.add_parser(
+        "worker",
+        parents=parents,
+        help="Run the warm worker that other commands submit jobs to.",
+        description=(
+            "Keep renderers and image fetchers loaded and run jobs submitted by "
+            "the other commands."
+        ),
+    )
+    parser.add_argument(
+        "--url",
+        default=None,
+        help=f"Address to listen on (default from config.ini, else {DEFAULT_URL}).",
+    )
+    parser.add_argument(
+        "--render-slots",
+        type=int,
+        default=1,
+        help="Renders run at the same time; extra render jobs wait.",
+    )
+    parser.add_argument(
+        "--warm",
+        dest="renderers",
+        action="append",
+        choices=RENDERER_NAMES,
+        default=None,
+        help="Renderer to load at startup; repeatable (default from config.ini).",
+    )
+    parser.add_argument(
+        "--warm-fetcher",
+        dest="fetchers",
+        action="append",
+        choices=[*PROVIDERS, FETCHER_HTTP],
+        default=None,
+        help="Image fetcher to load at startup; repeatable (default: bing).",
+    )
+    parser.add_argument(
+        "--output-root",
+        default=None,
+        help=(
+            "Directory jobs may write videos, images and caches under "
+            "(default: the project root)."
+        ),
+    )
+    parser.add_argument(
+        "--allow-remote",
+        action="store_true",
+        help=(
+            "Allow listening on a non-loopback address. The worker has no "
+            "authentication, so anyone who can reach it can submit jobs."
+        ),
+    )
+    parser.set_defaults(run=run_worker)
+
+
+def run_worker(args: argparse.Namespace) -> None:
+    # The server module imports build_video and with it the render stack.
+    from ..adapters.image.store import image_store_from_config
+    from ..service.server import WorkerService, serve
+
+    url = urlsplit(args.url or load_worker_url(args.config) or DEFAULT_URL)
+    if url.scheme != "http" or not url.hostname or url.port is None:
+        raise SystemExit(
+            f"Worker URL must look like http://HOST:PORT, got {url.geturl()}"
+        )
+    if not args.allow_remote and not _is_loopback(url.hostname):
+        raise SystemExit(
+            f"Refusing to listen on {url.hostname}: the worker has no "
+            "authentication. Use a loopback address or pass --allow-remote."
+        )
+
+    config, _ = load_render_config(args.config)
+    config = resolve_config_paths(config, args.root)
+    output_root = (
+        resolve_relative(Path(args.output_root), args.root)
+        if args.output_root
+        else args.root
+    )
+    service = WorkerService(
+        render_slots=args.render_slots,
+        image_store=image_store_from_config(config),
+        output_root=output_root,
+    )
+    service.warm(args.renderers or [config.renderer], args.fetchers or ["bing"])
+    server = serve(service, url.hostname, url.port)
+
+    def _request_stop(signum, _frame) -> None:
+        print(f"Received {signal.Signals(signum).name}, stopping")
+        # shutdown() waits for serve_forever to return, so not from its thread.
+        threading.Thread(target=server.shutdown).start()
+
+    signal.signal(signal.SIGINT, _request_stop)
+    signal.signal(signal.SIGTERM, _request_stop)
+    print(f"Worker listening on {url.geturl()}, writing under {output_root}")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+def _is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Sequence
+from typing import Optional, Sequence
 
 
 @dataclass(frozen=True)
@@ -12,6 +12,37 @@ class RenderConfig:
     fade_duration: float = 0.2
     include_music: bool = True
     music_dir: Path = Path("assets/music")
+    renderer: str = "moviepy"
+    frame_cache_dir: Optional[Path] = None
+    frame_cache_max_mb: int = 2048
+    render_mode: str = "single"
+    segment_workers: int = 0
+    segment_cache_dir: Optional[Path] = None
+    segment_cache_max_mb: int = 1024
+    music_cache_dir: Optional[Path] = None
+    music_cache_max_mb: int = 256
+    image_store_dir: Optional[Path] = None
+    dedupe_images: bool = True
+    # Hash bits two images may differ in and still count as the same picture.
+    dedupe_distance: int = 10
+    # Render at most the timing table's largest image count, best first.
+    cap_images: bool = True
+    reuse_renders: bool = True
+    streaming: bool = True
+    preset: str = "medium"
+    draft: bool = False
+    draft_scale: float = 0.25
+    draft_fps: int = 15
+
+
+@dataclass(frozen=True)
+class OutputVariant:
+    output_path: Path
+    width: int
+    height: int
+    fps: Optional[int] = None
+    preset: Optional[str] = None
+    bitrate: Optional[str] = None
 
 
 @dataclass(frozen=True)
@@ -19,6 +50,8 @@ class RenderRequest:
     images: Sequence[Path]
     output_path: Path
     config: RenderConfig
+    music_path: Optional[Path] = None
+    variants: Sequence[OutputVariant] = ()
 
 
 @dataclass(frozen=True)
@@ -26,3 +59,35 @@ class ImageFetchRequest:
     query: str
     output_dir: Path
     max_num: int = 30
+    image_urls: Sequence[str] = ()
+
+
+@dataclass(frozen=True)
+class ImageInfo:
+    sha256: str
+    size: int
+    width: Optional[int] = None
+    height: Optional[int] = None
+    format: Optional[str] = None
+    # 64-bit difference hash as 16 hex digits.
+    phash: Optional[str] = None
+    # Variance of the Laplacian of the hashed thumbnail; higher is sharper.
+    sharpness: Optional[float] = None
+    decodes: bool = False
+    error: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class Location:
+    name: str
+    image_urls: Sequence[str] = ()
+
+
+@dataclass(frozen=True)
+class ScheduleRow:
+    name: str
+    run_at: str = ""
+    description: str = ""
+    has_images: bool = False
+    rendered: bool = False
+    uploaded: bool = False
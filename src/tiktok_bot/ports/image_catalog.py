@@ -0,0 +1,10 @@
+from pathlib import Path
+from typing import Optional, Protocol
+
+from ..domain.models import ImageInfo
+
+
+class ImageCatalog(Protocol):
+    def info_for(self, path: Path) -> Optional[ImageInfo]:
+        """Metadata recorded for the content of ``path``, if any."""
+        raise NotImplementedError
@@ -0,0 +1,16 @@
+from typing import Protocol
+
+from ..domain.models import Location
+
+
+class LocationApi(Protocol):
+    def random_location(self) -> Location:
+        """One location picked by the server."""
+        raise NotImplementedError
+
+    def random_locations(self, count: int) -> list[Location]:
+        """Up to ``count`` locations with distinct names.
+
+        Fewer come back when the server keeps repeating the same ones.
+        """
+        raise NotImplementedError
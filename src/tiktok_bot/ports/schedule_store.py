@@ -0,0 +1,55 @@
+from typing import Hashable, Iterable, Optional, Protocol
+
+from ..domain.models import ScheduleRow
+
+
+class ScheduleStore(Protocol):
+    def rows(
+        self,
+        has_images: Optional[bool] = None,
+        rendered: Optional[bool] = None,
+        uploaded: Optional[bool] = None,
+    ) -> list[ScheduleRow]:
+        """Rows in schedule order, filtered on the flags that are not None."""
+        raise NotImplementedError
+
+    def pending(self) -> list[ScheduleRow]:
+        """Rows not uploaded yet, earliest ``Run at`` first.
+
+        Rows whose ``Run at`` cannot be parsed come last.
+        """
+        raise NotImplementedError
+
+    def set_flags(
+        self,
+        name: str,
+        has_images: Optional[bool] = None,
+        rendered: Optional[bool] = None,
+        uploaded: Optional[bool] = None,
+    ) -> int:
+        """Update the flags that are not None on every row called ``name``.
+
+        Returns the number of rows that changed.
+        """
+        raise NotImplementedError
+
+    def set_flags_many(
+        self,
+        names: Iterable[str],
+        has_images: Optional[bool] = None,
+        rendered: Optional[bool] = None,
+        uploaded: Optional[bool] = None,
+    ) -> int:
+        """``set_flags`` for every name in ``names`` as one write.
+
+        Returns the number of rows that changed.
+        """
+        raise NotImplementedError
+
+    def flag_names(self) -> set[str]:
+        """The ``set_flags`` keywords this store can record."""
+        raise NotImplementedError
+
+    def revision(self) -> Hashable:
+        """A value that changes whenever the stored schedule changes."""
+        raise NotImplementedError
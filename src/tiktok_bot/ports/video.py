@@ -3,8 +3,18 @@ from typing import Protocol
 
 from ..domain.models import RenderRequest
 
+RENDER_MODE_SINGLE = "single"
+RENDER_MODE_SEGMENTS = "segments"
+RENDER_MODES = (RENDER_MODE_SINGLE, RENDER_MODE_SEGMENTS)
+
 
 class VideoRenderer(Protocol):
     def render(self, request: RenderRequest) -> Path:
-        """Render a video from the provided request."""
+        """Render a video from the provided request.
+
+        ``request.config.render_mode`` selects between a single encode and
+        per-image segments encoded in parallel and joined by stream copy.
+        ``request.variants`` are extra outputs at other sizes or rates that
+        must come from the same render rather than a render each.
+        """
         raise NotImplementedError
@@ -0,0 +1 @@
+"""Warm local worker that runs render and fetch jobs for the scripts."""
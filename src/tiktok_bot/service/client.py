@@ -0,0 +1,94 @@
+import json
+from pathlib import Path
+from typing import Optional, Sequence
+
+from ..domain.models import ImageFetchRequest, OutputVariant, RenderConfig
+from ..utils.http import ConnectionPool
+from .protocol import JOB_BUILD_VIDEO, JOB_FETCH_IMAGES, encode
+
+HEALTH_TIMEOUT = 1.0
+# Renders can take minutes; the worker answers when the job is done.
+JOB_TIMEOUT = 3600.0
+
+
+class WorkerClient:
+    def __init__(self, url: str) -> None:
+        self.url = url.rstrip("/")
+        self._pool = ConnectionPool(timeout=JOB_TIMEOUT)
+
+    def is_running(self) -> bool:
+        pool = ConnectionPool(timeout=HEALTH_TIMEOUT)
+        try:
+            with pool.open("GET", f"{self.url}/health") as response:
+                return response.status == 200
+        except OSError:
+            return False
+        finally:
+            pool.close()
+
+    def build_video(
+        self,
+        image_dir: Path,
+        output_path: Path,
+        config: RenderConfig,
+        variants: Sequence[OutputVariant] = (),
+    ) -> Path:
+        result = self._submit(
+            JOB_BUILD_VIDEO,
+            {
+                "image_dir": str(image_dir),
+                "output_path": str(output_path),
+                "config": encode(config),
+                "variants": [encode(variant) for variant in variants],
+            },
+        )
+        return Path(result["output_path"])
+
+    def fetch_images(self, request: ImageFetchRequest, fetcher: str) -> list[Path]:
+        result = self._submit(
+            JOB_FETCH_IMAGES, {"request": encode(request), "fetcher": fetcher}
+        )
+        return [Path(path) for path in result["images"]]
+
+    def close(self) -> None:
+        self._pool.close()
+
+    def _submit(self, kind: str, payload: dict) -> dict:
+        body = json.dumps(payload).encode("utf-8")
+        with self._pool.open(
+            "POST",
+            f"{self.url}/jobs/{kind}",
+            headers={"Content-Type": "application/json"},
+            body=body,
+        ) as response:
+            result = json.loads(response.read() or b"{}")
+            if response.status != 200:
+                raise RuntimeError(
+                    f"Worker {kind} job failed: {result.get('error', response.status)}"
+                )
+        return result
+
+
+def connect_worker(
+    url: Optional[str], use_worker: Optional[bool]
+) -> Optional[WorkerClient]:
+    """Client for a running worker, or None to do the work in this process.
+
+    ``use_worker`` None submits only if the worker answers, True requires it
+    and False never contacts it.
+    """
+    if use_worker is False:
+        return None
+    if not url:
+        if use_worker:
+            raise RuntimeError(
+                "Worker URL is not configured. Set [worker].url in config.ini."
+            )
+        return None
+    client = WorkerClient(url)
+    if client.is_running():
+        print(f"Submitting to worker at {client.url}")
+        return client
+    if use_worker:
+        raise RuntimeError(f"Worker is not running at {client.url}.")
+    return None
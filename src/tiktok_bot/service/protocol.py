@@ -0,0 +1,41 @@
+from dataclasses import fields
+from pathlib import Path
+from typing import Any, Optional, Type, TypeVar
+
+T = TypeVar("T")
+
+JOB_BUILD_VIDEO = "build_video"
+JOB_FETCH_IMAGES = "fetch_images"
+FETCHER_HTTP = "http"
+
+_PATH_TYPES = (Path, Optional[Path])
+
+
+def encode(value: Any) -> dict:
+    """JSON-ready dict of a request dataclass, with paths as strings."""
+    return {
+        field.name: _encode_value(getattr(value, field.name)) for field in fields(value)
+    }
+
+
+def decode(cls: Type[T], data: dict) -> T:
+    known = {field.name: field for field in fields(cls)}
+    unknown = set(data) - set(known)
+    if unknown:
+        raise ValueError(f"Unknown {cls.__name__} fields: {', '.join(sorted(unknown))}")
+    values = {}
+    for name, value in data.items():
+        if value is not None and known[name].type in _PATH_TYPES:
+            value = Path(value)
+        elif isinstance(value, list):
+            value = tuple(value)
+        values[name] = value
+    return cls(**values)
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, Path):
+        return str(value)
+    if isinstance(value, (list, tuple)):
+        return [_encode_value(item) for item in value]
+    return value
@@ -0,0 +1,177 @@
+import json
+import os
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Iterable, Optional
+
+from ..adapters.image.store import ImageStore, StoredImageFetcher
+from ..adapters.video.factory import create_renderer
+from ..adapters.video.ffmpeg_tools import find_ffmpeg
+from ..domain.models import ImageFetchRequest, OutputVariant, RenderConfig
+from ..ports.image_fetcher import ImageFetcher
+from ..ports.video import VideoRenderer
+from ..utils.telemetry import span
+from ..workflows.build_video import build_video
+from .protocol import FETCHER_HTTP, JOB_BUILD_VIDEO, JOB_FETCH_IMAGES, decode
+
+
+class WorkerService:
+    """Keeps renderers and fetchers alive between jobs.
+
+    Renders take one of ``render_slots`` at a time, since each render already
+    uses every core; fetches are I/O bound and run as they arrive.
+    """
+
+    def __init__(
+        self,
+        render_slots: int = 1,
+        image_store: Optional[ImageStore] = None,
+        output_root: Optional[Path] = None,
+    ) -> None:
+        if render_slots < 1:
+            raise ValueError("render_slots must be at least 1.")
+        self._image_store = image_store
+        # Jobs choose their own paths; with a root they may only write inside it.
+        self._output_root = output_root.resolve() if output_root is not None else None
+        self._render_slots = threading.Semaphore(render_slots)
+        self._lock = threading.Lock()
+        self._renderers: dict[str, VideoRenderer] = {}
+        self._fetchers: dict[str, ImageFetcher] = {}
+
+    def warm(self, renderers: Iterable[str], fetchers: Iterable[str] = ()) -> None:
+        for name in renderers:
+            with span("warm", renderer=name):
+                self.renderer(name)
+        with span("warm", ffmpeg=True):
+            find_ffmpeg()
+        for name in fetchers:
+            with span("warm", fetcher=name):
+                self.fetcher(name)
+
+    def renderer(self, name: str) -> VideoRenderer:
+        with self._lock:
+            if name not in self._renderers:
+                self._renderers[name] = create_renderer(name)
+            return self._renderers[name]
+
+    def fetcher(self, name: str) -> ImageFetcher:
+        with self._lock:
+            if name not in self._fetchers:
+                fetcher = _create_fetcher(name)
+                if self._image_store is not None:
+                    fetcher = StoredImageFetcher(fetcher, self._image_store)
+                self._fetchers[name] = fetcher
+            return self._fetchers[name]
+
+    def run_job(self, kind: str, payload: dict) -> dict:
+        with span("job", kind=kind) as current:
+            if kind == JOB_BUILD_VIDEO:
+                config = decode(RenderConfig, payload["config"])
+                variants = [decode(OutputVariant, item) for item in payload["variants"]]
+                output_path = Path(payload["output_path"])
+                self._check_writable(
+                    output_path,
+                    *(variant.output_path for variant in variants),
+                    config.frame_cache_dir,
+                    config.segment_cache_dir,
+                    config.music_cache_dir,
+                )
+                renderer = self.renderer(config.renderer)
+                with self._render_slots:
+                    output_path = build_video(
+                        image_dir=Path(payload["image_dir"]),
+                        output_path=output_path,
+                        renderer=renderer,
+                        config=config,
+                        variants=variants,
+                        catalog=self._image_store,
+                    )
+                return {"output_path": str(output_path)}
+            if kind == JOB_FETCH_IMAGES:
+                request = decode(ImageFetchRequest, payload["request"])
+                self._check_writable(request.output_dir)
+                fetcher = self.fetcher(payload["fetcher"])
+                with span("fetch_images", query=request.query, max_num=request.max_num):
+                    images = fetcher.fetch(request)
+                current.set(images=len(images))
+                return {"images": [str(path) for path in images]}
+            raise ValueError(f"Unsupported job: {kind}")
+
+    def _check_writable(self, *paths: Optional[Path]) -> None:
+        if self._output_root is None:
+            return
+        for path in paths:
+            if path is None:
+                continue
+            resolved = (self._output_root / path).resolve()
+            if not resolved.is_relative_to(self._output_root):
+                raise ValueError(f"{path} is outside {self._output_root}")
+
+
+def serve(service: WorkerService, host: str, port: int) -> ThreadingHTTPServer:
+    """Bind the worker's HTTP endpoint; call ``serve_forever`` on the result."""
+    handler = type("WorkerHandler", (_WorkerHandler,), {"service": service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+class _WorkerHandler(BaseHTTPRequestHandler):
+    service: WorkerService
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        if self.path != "/health":
+            self._reply(HTTPStatus.NOT_FOUND, {"error": f"Unknown path: {self.path}"})
+            return
+        self._reply(HTTPStatus.OK, {"ok": True, "pid": os.getpid()})
+
+    def do_POST(self) -> None:
+        prefix = "/jobs/"
+        if not self.path.startswith(prefix):
+            self._reply(HTTPStatus.NOT_FOUND, {"error": f"Unknown path: {self.path}"})
+            return
+        kind = self.path[len(prefix) :]
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError as exc:
+            self._reply(HTTPStatus.BAD_REQUEST, {"error": f"Invalid JSON: {exc}"})
+            return
+        print(f"Running {kind} job")
+        try:
+            result = self.service.run_job(kind, payload)
+        except Exception as exc:
+            print(f"{kind} job failed: {exc}")
+            status = (
+                HTTPStatus.BAD_REQUEST
+                if isinstance(exc, (KeyError, TypeError, ValueError))
+                else HTTPStatus.INTERNAL_SERVER_ERROR
+            )
+            self._reply(status, {"error": f"{type(exc).__name__}: {exc}"})
+            return
+        self._reply(HTTPStatus.OK, result)
+
+    def log_message(self, format: str, *args) -> None:
+        # Jobs print their own progress; skip the per-request access log.
+        pass
+
+    def _reply(self, status: HTTPStatus, body: dict) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def _create_fetcher(name: str) -> ImageFetcher:
+    if name == FETCHER_HTTP:
+        from ..adapters.image.http_impl import HttpImageFetcher
+
+        return HttpImageFetcher()
+    from ..adapters.image.icrawler_impl import ICrawlerImageFetcher
+
+    return ICrawlerImageFetcher(provider=name)
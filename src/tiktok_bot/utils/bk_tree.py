@@ -0,0 +1,57 @@
+from typing import Callable, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class BKTree(Generic[T]):
+    """Items under a metric, indexed for "everything within distance d" lookups.
+
+    Each child hangs off its parent by their distance, so a search only walks
+    children whose edge is within ``d`` of the query's distance to the parent.
+    """
+
+    def __init__(self, distance: Callable[[T, T], int]) -> None:
+        self._distance = distance
+        self._root: Optional[_Node[T]] = None
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, item: T) -> None:
+        self._size += 1
+        if self._root is None:
+            self._root = _Node(item)
+            return
+        node = self._root
+        while True:
+            distance = self._distance(item, node.item)
+            child = node.children.get(distance)
+            if child is None:
+                node.children[distance] = _Node(item)
+                return
+            node = child
+
+    def search(self, item: T, max_distance: int) -> list[tuple[int, T]]:
+        """``(distance, item)`` for every stored item within ``max_distance``."""
+        found = []
+        pending = [self._root] if self._root is not None else []
+        while pending:
+            node = pending.pop()
+            distance = self._distance(item, node.item)
+            if distance <= max_distance:
+                found.append((distance, node.item))
+            low = distance - max_distance
+            high = distance + max_distance
+            pending.extend(
+                child for edge, child in node.children.items() if low <= edge <= high
+            )
+        return sorted(found, key=lambda match: match[0])
+
+
+class _Node(Generic[T]):
+    __slots__ = ("item", "children")
+
+    def __init__(self, item: T) -> None:
+        self.item = item
+        self.children: dict[int, _Node[T]] = {}
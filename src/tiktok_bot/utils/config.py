@@ -1,8 +1,10 @@
 import configparser
+from dataclasses import replace
 from pathlib import Path
 from typing import Optional, Tuple
 
 from ..domain.models import RenderConfig
+from .paths import resolve_relative
 
 
 def load_render_config(config_path: Path) -> Tuple[RenderConfig, Optional[str]]:
@@ -35,7 +37,16 @@ def load_render_config(config_path: Path) -> Tuple[RenderConfig, Optional[str]]:
             return False
         return default
 
-    def _get_path(key: str, default: Path) -> Path:
+    def _get_str(key: str, default: str) -> str:
+        if key not in section:
+            return default
+        value = section.get(key)
+        if value is None:
+            return default
+        value = value.strip()
+        return value or default
+
+    def _get_path(key: str, default: Optional[Path]) -> Optional[Path]:
         if key not in section:
             return default
         value = section.get(key)
@@ -52,11 +63,52 @@ def load_render_config(config_path: Path) -> Tuple[RenderConfig, Optional[str]]:
         fade_duration=_get_value("fade_duration", float, defaults.fade_duration),
         include_music=_get_bool("include_music", defaults.include_music),
         music_dir=_get_path("music_dir", defaults.music_dir),
+        renderer=_get_str("renderer", defaults.renderer),
+        frame_cache_dir=_get_path("frame_cache_dir", defaults.frame_cache_dir),
+        frame_cache_max_mb=_get_value(
+            "frame_cache_max_mb", int, defaults.frame_cache_max_mb
+        ),
+        render_mode=_get_str("render_mode", defaults.render_mode),
+        segment_workers=_get_value("segment_workers", int, defaults.segment_workers),
+        segment_cache_dir=_get_path("segment_cache_dir", defaults.segment_cache_dir),
+        segment_cache_max_mb=_get_value(
+            "segment_cache_max_mb", int, defaults.segment_cache_max_mb
+        ),
+        music_cache_dir=_get_path("music_cache_dir", defaults.music_cache_dir),
+        music_cache_max_mb=_get_value(
+            "music_cache_max_mb", int, defaults.music_cache_max_mb
+        ),
+        image_store_dir=_get_path("image_store_dir", defaults.image_store_dir),
+        dedupe_images=_get_bool("dedupe_images", defaults.dedupe_images),
+        dedupe_distance=_get_value(
+            "dedupe_distance", int, defaults.dedupe_distance
+        ),
+        cap_images=_get_bool("cap_images", defaults.cap_images),
+        reuse_renders=_get_bool("reuse_renders", defaults.reuse_renders),
+        streaming=_get_bool("streaming", defaults.streaming),
+        preset=_get_str("preset", defaults.preset),
+        draft=_get_bool("draft", defaults.draft),
+        draft_scale=_get_value("draft_scale", float, defaults.draft_scale),
+        draft_fps=_get_value("draft_fps", int, defaults.draft_fps),
     )
     output = section.get("output") if "output" in section else None
     return config, output
 
 
+def resolve_config_paths(config: RenderConfig, root: Path) -> RenderConfig:
+    def _resolve(path: Optional[Path]) -> Optional[Path]:
+        return resolve_relative(path, root) if path is not None else None
+
+    return replace(
+        config,
+        music_dir=resolve_relative(config.music_dir, root),
+        frame_cache_dir=_resolve(config.frame_cache_dir),
+        segment_cache_dir=_resolve(config.segment_cache_dir),
+        music_cache_dir=_resolve(config.music_cache_dir),
+        image_store_dir=_resolve(config.image_store_dir),
+    )
+
+
 def load_server_base_url(config_path: Path) -> Optional[str]:
     if not config_path.exists():
         return None
@@ -68,3 +120,42 @@ def load_server_base_url(config_path: Path) -> Optional[str]:
 
     base_url = parser["server"].get("base_url", "").strip()
     return base_url or None
+
+
+def load_server_cache_dir(config_path: Path) -> Optional[Path]:
+    if not config_path.exists():
+        return None
+
+    parser = configparser.ConfigParser()
+    parser.read(config_path)
+    if not parser.has_section("server"):
+        return None
+
+    cache_dir = parser["server"].get("cache_dir", "").strip()
+    return Path(cache_dir) if cache_dir else None
+
+
+def load_telemetry_sink(config_path: Path) -> Optional[str]:
+    if not config_path.exists():
+        return None
+
+    parser = configparser.ConfigParser()
+    parser.read(config_path)
+    if not parser.has_section("telemetry"):
+        return None
+
+    sink = parser["telemetry"].get("sink", "").strip()
+    return sink or None
+
+
+def load_worker_url(config_path: Path) -> Optional[str]:
+    if not config_path.exists():
+        return None
+
+    parser = configparser.ConfigParser()
+    parser.read(config_path)
+    if not parser.has_section("worker"):
+        return None
+
+    url = parser["worker"].get("url", "").strip()
+    return url or None
@@ -0,0 +1,50 @@
+import math
+from pathlib import Path
+from typing import Sequence
+
+from PIL import Image, ImageOps
+
+from .telemetry import span
+
+
+def write_contact_sheet(
+    images: Sequence[Path],
+    output_path: Path,
+    thumb_width: int,
+    thumb_height: int,
+    columns: int = 5,
+    gap: int = 4,
+) -> Path:
+    """Tile one cover-cropped thumbnail per image into a single JPEG."""
+    if not images:
+        raise ValueError("No images provided for the contact sheet.")
+    columns = max(1, min(columns, len(images)))
+    rows = math.ceil(len(images) / columns)
+    sheet = Image.new(
+        "RGB",
+        (
+            columns * thumb_width + (columns + 1) * gap,
+            rows * thumb_height + (rows + 1) * gap,
+        ),
+        (0, 0, 0),
+    )
+    with span("contact_sheet", images=len(images)):
+        for index, image_path in enumerate(images):
+            with Image.open(image_path) as image:
+                # JPEGs decode straight at 1/2..1/8 scale when that is enough.
+                image.draft("RGB", (thumb_width, thumb_height))
+                image = ImageOps.exif_transpose(image).convert("RGB")
+                thumb = ImageOps.fit(
+                    image, (thumb_width, thumb_height), Image.Resampling.LANCZOS
+                )
+            row, column = divmod(index, columns)
+            sheet.paste(
+                thumb,
+                (
+                    gap + column * (thumb_width + gap),
+                    gap + row * (thumb_height + gap),
+                ),
+            )
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        sheet.save(output_path, quality=85)
+    return output_path
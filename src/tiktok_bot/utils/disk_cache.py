@@ -0,0 +1,61 @@
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+
+
+class LruDiskCache:
+    """Size-bounded cache directory; hits bump mtime, eviction drops oldest first."""
+
+    def __init__(self, root: Path, max_bytes: int) -> None:
+        self._root = root
+        self._max_bytes = max_bytes
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    def path_for(self, key: str, suffix: str) -> Path:
+        return self._root / key[:2] / f"{key}{suffix}"
+
+    def get(self, key: str, suffix: str) -> Optional[Path]:
+        path = self.path_for(key, suffix)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def temp_path(self, key: str, suffix: str) -> Path:
+        path = self.path_for(key, suffix)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Unique per thread too: threads filling the same key must not share
+        # a temp file, or the second commit finds it already moved.
+        return path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+    def commit(self, temp_path: Path, key: str, suffix: str) -> Path:
+        path = self.path_for(key, suffix)
+        os.replace(temp_path, path)
+        self.evict()
+        return path
+
+    def evict(self) -> None:
+        entries = []
+        total = 0
+        for path in self._root.glob("*/*"):
+            if path.name.startswith("."):
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        if total <= self._max_bytes:
+            return
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self._max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
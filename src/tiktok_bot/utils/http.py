@@ -0,0 +1,110 @@
+import http.client
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Mapping, Optional
+from urllib.parse import urlsplit
+
+USER_AGENT = "tiktok-bot/1.0"
+
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+
+
+class ConnectionPool:
+    """Keep-alive HTTP(S) connections, one per host for each calling thread."""
+
+    def __init__(self, timeout: float = 30.0) -> None:
+        self._timeout = timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._all: list[http.client.HTTPConnection] = []
+
+    @contextmanager
+    def open(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Mapping[str, str]] = None,
+        body: Optional[bytes] = None,
+    ) -> Iterator[http.client.HTTPResponse]:
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"Unsupported URL: {url}")
+        key = (parts.scheme, parts.hostname, parts.port)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+        request_headers = {"User-Agent": USER_AGENT}
+        request_headers.update(headers or {})
+
+        response = self._send(key, method, path, request_headers, body)
+        try:
+            yield response
+            response.read()
+        except BaseException:
+            self._discard(key)
+            raise
+        if response.will_close:
+            self._discard(key)
+
+    def close(self) -> None:
+        with self._lock:
+            connections, self._all = self._all, []
+        for connection in connections:
+            connection.close()
+
+    def _send(
+        self,
+        key: tuple,
+        method: str,
+        path: str,
+        headers: Mapping[str, str],
+        body: Optional[bytes],
+    ) -> http.client.HTTPResponse:
+        while True:
+            connection, reused = self._connection(key)
+            try:
+                connection.request(method, path, body=body, headers=dict(headers))
+                return connection.getresponse()
+            except _STALE_CONNECTION_ERRORS:
+                self._discard(key)
+                if not reused:
+                    raise
+            except BaseException:
+                self._discard(key)
+                raise
+
+    def _connection(self, key: tuple) -> tuple[http.client.HTTPConnection, bool]:
+        connections = self._connections()
+        connection = connections.get(key)
+        if connection is not None:
+            return connection, True
+        scheme, host, port = key
+        connection_cls = (
+            http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        )
+        connection = connection_cls(host, port, timeout=self._timeout)
+        connections[key] = connection
+        with self._lock:
+            self._all.append(connection)
+        return connection, False
+
+    def _discard(self, key: tuple) -> None:
+        connection = self._connections().pop(key, None)
+        if connection is None:
+            return
+        connection.close()
+        with self._lock:
+            if connection in self._all:
+                self._all.remove(connection)
+
+    def _connections(self) -> dict:
+        connections = getattr(self._local, "connections", None)
+        if connections is None:
+            connections = {}
+            self._local.connections = connections
+        return connections
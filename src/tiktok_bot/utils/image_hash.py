@@ -0,0 +1,81 @@
+from typing import Sequence
+
+import numpy as np
+from PIL import Image, ImageOps
+
+# Long edge of the grayscale thumbnail every image is hashed and measured on.
+# JPEGs are decoded straight to about this size by libjpeg.
+THUMBNAIL_SIZE = 256
+
+# dHash compares each pixel of a 9x8 grayscale thumbnail with its right
+# neighbour, giving 64 bits that survive rescaling and recompression.
+_HASH_WIDTH = 9
+_HASH_HEIGHT = 8
+_EXIF_ORIENTATION = 0x0112
+_TRANSPOSED = {5, 6, 7, 8}
+
+
+def oriented_size(image: Image.Image) -> tuple[int, int]:
+    """Header size of an open image, swapped when EXIF turns it sideways."""
+    width, height = image.size
+    if image.getexif().get(_EXIF_ORIENTATION, 1) in _TRANSPOSED:
+        return height, width
+    return width, height
+
+
+def load_thumbnail(image: Image.Image) -> Image.Image:
+    """Decode an open image as an upright grayscale thumbnail.
+
+    The image store and image selection both hash and measure this thumbnail,
+    so their hashes and sharpness values agree.
+    """
+    if image.format == "JPEG":
+        image.draft("L", (THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+    image.load()
+    thumbnail = ImageOps.exif_transpose(image).convert("L")
+    thumbnail.thumbnail((THUMBNAIL_SIZE, THUMBNAIL_SIZE), Image.Resampling.BOX)
+    return thumbnail
+
+
+def dhash(image: Image.Image) -> str:
+    """64-bit difference hash of ``image`` as 16 hex digits."""
+    return dhash_batch([image])[0]
+
+
+def dhash_batch(images: Sequence[Image.Image]) -> list[str]:
+    """``dhash`` of every image, compared and packed as one array."""
+    if not images:
+        return []
+    grids = np.stack(
+        [
+            np.asarray(
+                image.convert("L").resize(
+                    (_HASH_WIDTH, _HASH_HEIGHT), Image.Resampling.BOX
+                ),
+                dtype=np.uint8,
+            )
+            for image in images
+        ]
+    )
+    bits = grids[:, :, :-1] > grids[:, :, 1:]
+    packed = np.packbits(bits.reshape(len(images), -1), axis=1)
+    return [row.tobytes().hex() for row in packed]
+
+
+def hamming_distance(left: str, right: str) -> int:
+    return (int(left, 16) ^ int(right, 16)).bit_count()
+
+
+def laplacian_variance(image: Image.Image) -> float:
+    """Variance of the Laplacian of a grayscale image; higher is sharper."""
+    pixels = np.asarray(image, dtype=np.float32)
+    if pixels.shape[0] < 3 or pixels.shape[1] < 3:
+        return 0.0
+    laplacian = (
+        pixels[:-2, 1:-1]
+        + pixels[2:, 1:-1]
+        + pixels[1:-1, :-2]
+        + pixels[1:-1, 2:]
+        - 4 * pixels[1:-1, 1:-1]
+    )
+    return float(laplacian.var())
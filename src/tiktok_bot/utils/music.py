@@ -0,0 +1,25 @@
+import random
+from pathlib import Path
+from typing import Optional
+
+SUPPORTED_AUDIO_EXTS = {".mp3", ".m4a", ".aac", ".wav", ".flac", ".ogg", ".opus"}
+
+
+def list_music_files(music_dir: Path) -> list[Path]:
+    if not music_dir.exists():
+        return []
+    files = [
+        path
+        for path in music_dir.iterdir()
+        if path.is_file() and path.suffix.lower() in SUPPORTED_AUDIO_EXTS
+    ]
+    return sorted(files, key=lambda path: path.name.lower())
+
+
+def choose_music_file(music_dir: Path, seed: Optional[str] = None) -> Path | None:
+    candidates = list_music_files(music_dir)
+    if not candidates:
+        return None
+    if seed is None:
+        return random.choice(candidates)
+    return random.Random(seed).choice(candidates)
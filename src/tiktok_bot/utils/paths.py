@@ -25,3 +25,12 @@ def resolve_relative(path: Path, root: Path) -> Path:
     if not path.is_absolute():
         return root / path
     return path
+
+
+def resolve_output_path(path: Path) -> Path:
+    """Force an ``.mp4`` file name; a bare directory gets ``render.mp4``."""
+    if path.suffix.lower() != ".mp4":
+        if path.suffix == "":
+            return path / "render.mp4"
+        return path.with_suffix(".mp4")
+    return path
@@ -0,0 +1,29 @@
+import threading
+import time
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float = 1.0) -> None:
+        if rate <= 0:
+            raise ValueError("Rate must be positive.")
+        if capacity < 1:
+            raise ValueError("Capacity must be at least 1.")
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self._capacity, self._tokens + (now - self._updated) * self._rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self._rate
+            time.sleep(wait)
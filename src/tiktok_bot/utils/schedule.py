@@ -1,6 +1,10 @@
 import csv
+import os
+from datetime import datetime
 from pathlib import Path
-from typing import Iterable, List, Tuple
+from typing import Iterable, List, Optional, Tuple
+
+RUN_AT_FORMAT = "%d.%m.%Y %H:%M"
 
 
 def load_schedule(csv_path: Path) -> Tuple[List[str], List[dict]]:
@@ -13,10 +17,17 @@ def load_schedule(csv_path: Path) -> Tuple[List[str], List[dict]]:
 
 
 def save_schedule(csv_path: Path, fieldnames: Iterable[str], rows: Iterable[dict]) -> None:
-    with csv_path.open("w", newline="", encoding="utf-8") as handle:
-        writer = csv.DictWriter(handle, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(rows)
+    temp_path = csv_path.with_name(f".{csv_path.name}.{os.getpid()}.tmp")
+    try:
+        with temp_path.open("w", newline="", encoding="utf-8") as handle:
+            writer = csv.DictWriter(handle, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(rows)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_path, csv_path)
+    finally:
+        temp_path.unlink(missing_ok=True)
 
 
 def normalize_header(value: str) -> str:
@@ -37,3 +48,10 @@ def is_truthy(value: str) -> bool:
         return False
     cleaned = value.strip().lower()
     return cleaned in {"yes", "true", "1", "y"}
+
+
+def parse_run_at(value: str) -> Optional[datetime]:
+    try:
+        return datetime.strptime((value or "").strip(), RUN_AT_FORMAT)
+    except ValueError:
+        return None
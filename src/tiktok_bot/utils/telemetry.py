@@ -0,0 +1,196 @@
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+TELEMETRY_ENV = "TIKTOK_BOT_TELEMETRY"
+
+
+class StageTimings:
+    def __init__(self) -> None:
+        self.seconds: dict[str, float] = {}
+        self.counts: dict[str, int] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        self.seconds[name] = self.seconds.get(name, 0.0) + seconds
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+
+class Span:
+    def __init__(self, name: str, parent_id: Optional[str], attrs: dict) -> None:
+        self.name = name
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.attrs = attrs
+
+    def set(self, **attrs: Any) -> None:
+        self.attrs.update(attrs)
+
+    def add(self, key: str, amount: float = 1) -> None:
+        self.attrs[key] = self.attrs.get(key, 0) + amount
+
+
+class _NoopSpan(Span):
+    def __init__(self) -> None:
+        super().__init__("", None, {})
+
+    def set(self, **attrs: Any) -> None:
+        pass
+
+    def add(self, key: str, amount: float = 1) -> None:
+        pass
+
+
+class JsonLinesSink:
+    def __init__(self, target: str) -> None:
+        self._lock = threading.Lock()
+        if target == "-":
+            self._fd = sys.stderr.fileno()
+            return
+        path = Path(target)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+
+    def emit(self, record: dict) -> None:
+        line = json.dumps(record, default=str) + "\n"
+        with self._lock:
+            os.write(self._fd, line.encode("utf-8"))
+
+
+_NOOP_SPAN = _NoopSpan()
+_active: ContextVar[Optional[StageTimings]] = ContextVar("stage_timings", default=None)
+_current: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+_sink: Optional[JsonLinesSink] = None
+
+
+def configure_sink(target: Optional[str]) -> None:
+    global _sink
+    target = target or os.environ.get(TELEMETRY_ENV) or None
+    _sink = JsonLinesSink(target) if target else None
+
+
+@contextmanager
+def collect_timings() -> Iterator[StageTimings]:
+    timings = StageTimings()
+    token = _active.set(timings)
+    try:
+        yield timings
+    finally:
+        _active.reset(token)
+
+
+@contextmanager
+def span(name: str, **attrs: Any) -> Iterator[Span]:
+    timings = _active.get()
+    sink = _sink
+    if timings is None and sink is None:
+        yield _NOOP_SPAN
+        return
+
+    parent = _current.get()
+    current = Span(name, parent.span_id if parent is not None else None, attrs)
+    token = _current.set(current)
+    started_at = time.time()
+    started = time.perf_counter()
+    error = None
+    try:
+        yield current
+    except BaseException as exc:
+        error = f"{type(exc).__name__}: {exc}"
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        _current.reset(token)
+        if timings is not None:
+            timings.add(name, elapsed)
+        if sink is not None:
+            record = {
+                "ts": round(started_at, 6),
+                "span": name,
+                "id": current.span_id,
+                "parent": current.parent_id,
+                "duration_ms": round(elapsed * 1000, 3),
+                "pid": os.getpid(),
+                "thread": threading.current_thread().name,
+                "attrs": current.attrs,
+            }
+            if error is not None:
+                record["error"] = error
+            sink.emit(record)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time a hot-loop step without emitting a record of its own.
+
+    The time is added to the active collector and to ``<name>_ms`` on the
+    enclosing span.
+    """
+    timings = _active.get()
+    parent = _current.get() if _sink is not None else None
+    if timings is None and parent is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        if timings is not None:
+            timings.add(name, elapsed)
+        if parent is not None:
+            key = f"{name}_ms"
+            parent.attrs[key] = round(parent.attrs.get(key, 0.0) + elapsed * 1000, 3)
+
+
+@contextmanager
+def profile_run(output_path: Optional[Path]) -> Iterator[None]:
+    if output_path is None:
+        yield
+        return
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    if output_path.suffix.lower() == ".html":
+        from pyinstrument import Profiler
+
+        profiler = Profiler()
+        profiler.start()
+        try:
+            yield
+        finally:
+            profiler.stop()
+            output_path.write_text(profiler.output_html(), encoding="utf-8")
+            print(f"Wrote profile to {output_path}")
+        return
+
+    import cProfile
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(str(output_path))
+        print(f"Wrote profile to {output_path}")
+
+
+def resolve_sink(target: Optional[str], root: Path) -> Optional[str]:
+    if not target or target == "-":
+        return target
+    path = Path(target)
+    return str(path if path.is_absolute() else root / path)
+
+
+@contextmanager
+def instrument_run(
+    name: str, sink: Optional[str] = None, profile: Optional[Path] = None
+) -> Iterator[Span]:
+    configure_sink(sink)
+    with profile_run(profile), span("run", script=name, argv=sys.argv[1:]) as root:
+        yield root
@@ -0,0 +1,29 @@
+import re
+from pathlib import Path
+
+from ..domain.models import OutputVariant
+
+_SPEC = re.compile(
+    r"^(?P<width>\d+)x(?P<height>\d+)(?:@(?P<fps>\d+))?"
+    r"(?::(?P<bitrate>[^:]+)(?::(?P<preset>[^:]+))?)?$"
+)
+
+
+def parse_variant(spec: str, output_path: Path) -> OutputVariant:
+    """Parse ``WIDTHxHEIGHT[@FPS][:BITRATE[:PRESET]]``, e.g. ``360x640@15:600k``."""
+    match = _SPEC.match(spec.strip().lower())
+    if match is None:
+        raise ValueError(
+            f"Invalid variant {spec!r}; expected WIDTHxHEIGHT[@FPS][:BITRATE[:PRESET]]."
+        )
+    width, height = int(match["width"]), int(match["height"])
+    if width <= 0 or height <= 0:
+        raise ValueError(f"Variant size must be positive: {spec!r}")
+    return OutputVariant(
+        output_path=output_path,
+        width=width,
+        height=height,
+        fps=int(match["fps"]) if match["fps"] else None,
+        bitrate=match["bitrate"],
+        preset=match["preset"],
+    )
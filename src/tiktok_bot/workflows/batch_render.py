@@ -0,0 +1,73 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional, Sequence
+
+from ..domain.models import RenderConfig
+from ..ports.image_catalog import ImageCatalog
+from ..ports.video import VideoRenderer
+from .build_video import build_video
+
+
+@dataclass(frozen=True)
+class BatchJob:
+    name: str
+    image_dir: Path
+    output_path: Path
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    job: BatchJob
+    output_path: Optional[Path] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def batch_render(
+    jobs: Sequence[BatchJob],
+    config: RenderConfig,
+    renderer_factory: Callable[[str], VideoRenderer],
+    max_workers: Optional[int] = None,
+    catalog_factory: Optional[Callable[[RenderConfig], Optional[ImageCatalog]]] = None,
+) -> list[BatchResult]:
+    if not jobs:
+        return []
+
+    results: dict[BatchJob, BatchResult] = {}
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(
+                _render_job, job, config, renderer_factory, catalog_factory
+            ): job
+            for job in jobs
+        }
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                results[job] = future.result()
+            except Exception as exc:
+                results[job] = BatchResult(job=job, error=f"Worker failed: {exc}")
+    return [results[job] for job in jobs]
+
+
+def _render_job(
+    job: BatchJob,
+    config: RenderConfig,
+    renderer_factory: Callable[[str], VideoRenderer],
+    catalog_factory: Optional[Callable[[RenderConfig], Optional[ImageCatalog]]],
+) -> BatchResult:
+    try:
+        output_path = build_video(
+            image_dir=job.image_dir,
+            output_path=job.output_path,
+            renderer=renderer_factory(config.renderer),
+            config=config,
+            catalog=catalog_factory(config) if catalog_factory is not None else None,
+        )
+    except Exception as exc:
+        return BatchResult(job=job, error=f"{type(exc).__name__}: {exc}")
+    return BatchResult(job=job, output_path=output_path)
@@ -1,15 +1,51 @@
-from dataclasses import replace
+import hashlib
+import json
+import os
+from dataclasses import asdict, replace
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Sequence
 
-from ..domain.models import RenderConfig, RenderRequest
+from ..domain.models import OutputVariant, RenderConfig, RenderRequest
+from ..ports.image_catalog import ImageCatalog
 from ..ports.video import VideoRenderer
+from ..utils.contact_sheet import write_contact_sheet
+from ..utils.hashing import file_sha256
+from ..utils.music import choose_music_file, list_music_files
 from ..utils.paths import list_image_files
+from ..utils.telemetry import Span, span
 from ..utils.timing_table import (
     DEFAULT_FADE_DURATION,
+    MAX_IMAGE_COUNT,
     SLIDESHOW_IMAGE_DURATIONS,
     resolve_image_duration,
 )
+from .select_images import select_images
+
+# Settings that change how a render is produced or cached, not what it contains.
+_NON_OUTPUT_FIELDS = {
+    "music_dir",
+    "frame_cache_dir",
+    "frame_cache_max_mb",
+    "render_mode",
+    "segment_workers",
+    "segment_cache_dir",
+    "segment_cache_max_mb",
+    "music_cache_dir",
+    "music_cache_max_mb",
+    "image_store_dir",
+    # The images they keep are hashed into the key instead.
+    "dedupe_images",
+    "dedupe_distance",
+    "cap_images",
+    "reuse_renders",
+    "streaming",
+    # A draft is keyed by the size, fps and preset it resolves to.
+    "draft",
+    "draft_scale",
+    "draft_fps",
+}
+
+DRAFT_PRESET = "ultrafast"
 
 
 def build_video(
@@ -17,13 +53,39 @@ def build_video(
     output_path: Path,
     renderer: VideoRenderer,
     config: Optional[RenderConfig] = None,
+    variants: Sequence[OutputVariant] = (),
+    images: Optional[Sequence[Path]] = None,
+    catalog: Optional[ImageCatalog] = None,
+) -> Path:
+    """Render ``image_dir`` to ``output_path``.
+
+    ``images`` is a ``choose_images`` result computed earlier with the same
+    config; without it the images are chosen here, using what ``catalog``
+    knows about them.
+    """
+    with span("build_video", image_dir=str(image_dir)) as current:
+        return _build_video(
+            image_dir, output_path, renderer, config, variants, images, catalog, current
+        )
+
+
+def _build_video(
+    image_dir: Path,
+    output_path: Path,
+    renderer: VideoRenderer,
+    config: Optional[RenderConfig],
+    variants: Sequence[OutputVariant],
+    images: Optional[Sequence[Path]],
+    catalog: Optional[ImageCatalog],
+    current: Span,
 ) -> Path:
     if config is None:
         config = RenderConfig()
 
-    images = list_image_files(image_dir)
-    if not images:
-        raise ValueError(f"No images found in {image_dir}")
+    if images is None:
+        images = choose_images(image_dir, config, catalog)
+    images = list(images)
+    current.set(images=len(images))
 
     image_duration = resolve_image_duration(
         len(images), SLIDESHOW_IMAGE_DURATIONS, config.image_duration
@@ -34,5 +96,165 @@ def build_video(
         fade_duration=DEFAULT_FADE_DURATION,
     )
 
-    request = RenderRequest(images=images, output_path=output_path, config=config)
-    return renderer.render(request)
+    with span("hash_images", images=len(images)):
+        image_hashes = [file_sha256(path) for path in images]
+    # Seeded before the draft settings apply, so a draft previews the same
+    # track the full render will use.
+    music_path = (
+        choose_music_file(config.music_dir, seed=_input_key(image_hashes, config))
+        if config.include_music
+        else None
+    )
+    if config.draft:
+        config = draft_config(config)
+        output_path = draft_output_path(output_path)
+        variants = ()
+        current.set(draft=True)
+    input_key = _input_key(image_hashes, config)
+    render_key = _render_key(input_key, music_path, variants)
+    current.set(music=str(music_path) if music_path is not None else None)
+    manifest_path = _manifest_path(output_path)
+    outputs = [output_path, *(variant.output_path for variant in variants)]
+    if config.reuse_renders and _manifest_matches(manifest_path, outputs, render_key):
+        current.set(reused=True)
+        print(f"Reusing existing render {output_path}")
+        if config.draft and not contact_sheet_path(output_path).exists():
+            _write_draft_sheet(images, output_path, config)
+        return output_path
+
+    manifest_path.unlink(missing_ok=True)
+    request = RenderRequest(
+        images=images,
+        output_path=output_path,
+        config=config,
+        music_path=music_path,
+        variants=variants,
+    )
+    rendered_path = renderer.render(request)
+    if config.draft:
+        _write_draft_sheet(images, rendered_path, config)
+    _write_manifest(manifest_path, render_key, images, music_path, variants)
+    return rendered_path
+
+
+def choose_images(
+    image_dir: Path, config: RenderConfig, catalog: Optional[ImageCatalog] = None
+) -> list[Path]:
+    """The images of ``image_dir`` a render uses: near-duplicates dropped and
+    at most the timing table's largest count, best scoring first.
+
+    With ``dedupe_images`` and ``cap_images`` both off every file is used.
+    """
+    images = list_image_files(image_dir)
+    if not images:
+        raise ValueError(f"No images found in {image_dir}")
+    if not (config.dedupe_images or config.cap_images):
+        return images
+    images = select_images(
+        images,
+        limit=MAX_IMAGE_COUNT if config.cap_images else len(images),
+        width=config.width,
+        height=config.height,
+        max_distance=config.dedupe_distance if config.dedupe_images else None,
+        catalog=catalog,
+    )
+    if not images:
+        raise ValueError(f"No readable images in {image_dir}")
+    return images
+
+
+def draft_config(config: RenderConfig) -> RenderConfig:
+    return replace(
+        config,
+        width=_even(config.width * config.draft_scale),
+        height=_even(config.height * config.draft_scale),
+        fps=min(config.fps, config.draft_fps),
+        preset=DRAFT_PRESET,
+    )
+
+
+def draft_output_path(output_path: Path) -> Path:
+    return output_path.with_name(f"{output_path.stem}.draft{output_path.suffix}")
+
+
+def contact_sheet_path(output_path: Path) -> Path:
+    return output_path.with_suffix(".jpg")
+
+
+def _write_draft_sheet(
+    images: Sequence[Path], output_path: Path, config: RenderConfig
+) -> None:
+    sheet_path = write_contact_sheet(
+        images, contact_sheet_path(output_path), config.width, config.height
+    )
+    print(f"Wrote contact sheet to {sheet_path}")
+
+
+def _even(value: float) -> int:
+    return max(2, int(value) // 2 * 2)
+
+
+def _input_key(image_hashes: Sequence[str], config: RenderConfig) -> str:
+    settings = {
+        key: value
+        for key, value in asdict(config).items()
+        if key not in _NON_OUTPUT_FIELDS
+    }
+    library = []
+    if config.include_music:
+        for path in list_music_files(config.music_dir):
+            stat = path.stat()
+            library.append([path.name, stat.st_size, stat.st_mtime_ns])
+    return _digest({"images": list(image_hashes), "config": settings, "music": library})
+
+
+def _render_key(
+    input_key: str, music_path: Optional[Path], variants: Sequence[OutputVariant]
+) -> str:
+    music_hash = file_sha256(music_path) if music_path is not None else None
+    return _digest(
+        {
+            "inputs": input_key,
+            "music": music_hash,
+            "variants": [asdict(variant) for variant in variants],
+        }
+    )
+
+
+def _digest(payload: dict) -> str:
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _manifest_path(output_path: Path) -> Path:
+    return output_path.with_name(f"{output_path.name}.render.json")
+
+
+def _manifest_matches(
+    manifest_path: Path, outputs: Sequence[Path], render_key: str
+) -> bool:
+    if not all(path.exists() for path in outputs):
+        return False
+    try:
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return False
+    return isinstance(manifest, dict) and manifest.get("key") == render_key
+
+
+def _write_manifest(
+    manifest_path: Path,
+    render_key: str,
+    images: Sequence[Path],
+    music_path: Optional[Path],
+    variants: Sequence[OutputVariant],
+) -> None:
+    manifest = {
+        "key": render_key,
+        "images": [str(path) for path in images],
+        "music": str(music_path) if music_path is not None else None,
+        "variants": [str(variant.output_path) for variant in variants],
+    }
+    temp_path = manifest_path.with_name(f".{manifest_path.name}.{os.getpid()}.tmp")
+    temp_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    os.replace(temp_path, manifest_path)
@@ -4,6 +4,7 @@ from typing import Optional, Sequence
 from ..domain.models import ImageFetchRequest
 from ..ports.image_fetcher import ImageFetcher
 from ..utils.paths import safe_dir_name
+from ..utils.telemetry import span
 
 
 def fetch_images(
@@ -13,10 +14,22 @@ def fetch_images(
     max_num: int = 30,
     output_dir_name: Optional[str] = None,
 ) -> Sequence[Path]:
+    request = fetch_request(query, output_base_dir, max_num, output_dir_name)
+    with span("fetch_images", query=query, max_num=max_num) as current:
+        images = fetcher.fetch(request)
+        current.set(images=len(images))
+    return images
+
+
+def fetch_request(
+    query: str,
+    output_base_dir: Path,
+    max_num: int = 30,
+    output_dir_name: Optional[str] = None,
+) -> ImageFetchRequest:
     if not query.strip():
         raise ValueError("Query must be a non-empty string.")
 
     folder_name = output_dir_name or safe_dir_name(query)
     output_dir = output_base_dir / folder_name
-    request = ImageFetchRequest(query=query, output_dir=output_dir, max_num=max_num)
-    return fetcher.fetch(request)
+    return ImageFetchRequest(query=query, output_dir=output_dir, max_num=max_num)
@@ -0,0 +1,245 @@
+import contextvars
+import queue
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional, Sequence
+
+from ..domain.models import ImageFetchRequest
+from ..utils.telemetry import span
+
+STAGE_FETCH = "fetch"
+STAGE_PREPROCESS = "preprocess"
+STAGE_RENDER = "render"
+
+# How often a blocked stage checks whether the run was stopped.
+_STOP_POLL_SECONDS = 0.2
+
+
+@dataclass(frozen=True)
+class PipelineJob:
+    name: str
+    request: ImageFetchRequest
+    output_path: Path
+
+    @property
+    def image_dir(self) -> Path:
+        return self.request.output_dir
+
+
+@dataclass(frozen=True)
+class PipelineResult:
+    job: PipelineJob
+    images: int = 0
+    output_path: Optional[Path] = None
+    error: Optional[str] = None
+    stage: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class _Done:
+    """Queue marker: the stage upstream has no more jobs."""
+
+
+def run_pipeline(
+    jobs: Iterable[PipelineJob],
+    fetch: Callable[[PipelineJob], Sequence[Path]],
+    render: Callable[[PipelineJob], Path],
+    preprocess: Optional[Callable[[PipelineJob], None]] = None,
+    fetch_workers: int = 2,
+    queue_size: int = 1,
+    on_result: Optional[Callable[[PipelineResult], None]] = None,
+    stop: Optional[threading.Event] = None,
+) -> list[PipelineResult]:
+    """Fetch, preprocess and render ``jobs`` as overlapping stages.
+
+    Fetching runs on ``fetch_workers`` threads and preprocessing on one
+    thread, while renders run one at a time on the calling thread. The stages
+    are joined by queues of ``queue_size`` jobs, so a slow render holds back
+    the fetches: at most ``fetch_workers + 2 * queue_size + 2`` locations are
+    downloaded but not rendered yet. ``jobs`` is consumed lazily by the fetch
+    workers, so it may itself call out for each job.
+
+    A failing job is reported with the stage it failed in and does not stop
+    the rest. ``on_result`` is called on the calling thread as each job
+    finishes, in completion order.
+    """
+    if fetch_workers < 1:
+        raise ValueError("fetch_workers must be at least 1.")
+    if queue_size < 1:
+        raise ValueError("queue_size must be at least 1.")
+    stop = stop or threading.Event()
+    source = _SharedIterator(iter(jobs))
+    fetched: queue.Queue = queue.Queue(maxsize=queue_size)
+    ready: queue.Queue = queue.Queue(maxsize=queue_size)
+    # Failures skip the later stages and go straight to the render thread.
+    failed: queue.Queue = queue.Queue()
+    remaining_fetchers = [fetch_workers]
+    fetchers_lock = threading.Lock()
+
+    def _fetch_worker() -> None:
+        try:
+            for job in source:
+                if stop.is_set():
+                    break
+                try:
+                    with span("pipeline", stage=STAGE_FETCH, job=job.name) as current:
+                        images = fetch(job)
+                        current.set(images=len(images))
+                except Exception as exc:
+                    failed.put(_failure(job, STAGE_FETCH, exc))
+                    continue
+                if not images:
+                    error = "No images were downloaded."
+                    failed.put(PipelineResult(job=job, error=error, stage=STAGE_FETCH))
+                    continue
+                if not _put(fetched, (job, len(images)), stop):
+                    break
+        except Exception as exc:
+            # The job source itself failed: no new jobs, but the ones already
+            # fetched still go through.
+            print(f"Pipeline source failed: {exc}")
+        finally:
+            with fetchers_lock:
+                remaining_fetchers[0] -= 1
+                last = remaining_fetchers[0] == 0
+            if last:
+                _put(fetched, _Done, stop, force=True)
+
+    def _preprocess_worker() -> None:
+        while True:
+            item = _get(fetched, stop)
+            if item is _Done or item is None:
+                break
+            job, images = item
+            if preprocess is not None:
+                try:
+                    with span("pipeline", stage=STAGE_PREPROCESS, job=job.name):
+                        preprocess(job)
+                except Exception as exc:
+                    failed.put(_failure(job, STAGE_PREPROCESS, exc, images))
+                    continue
+            if not _put(ready, item, stop):
+                break
+        _put(ready, _Done, stop, force=True)
+
+    threads = [
+        threading.Thread(
+            target=contextvars.copy_context().run,
+            args=(_fetch_worker,),
+            name=f"pipeline-fetch-{index}",
+            daemon=True,
+        )
+        for index in range(fetch_workers)
+    ]
+    threads.append(
+        threading.Thread(
+            target=contextvars.copy_context().run,
+            args=(_preprocess_worker,),
+            name="pipeline-preprocess",
+            daemon=True,
+        )
+    )
+    for thread in threads:
+        thread.start()
+
+    results: list[PipelineResult] = []
+
+    def _report(result: PipelineResult) -> None:
+        results.append(result)
+        if on_result is not None:
+            on_result(result)
+
+    try:
+        while True:
+            _drain(failed, _report)
+            try:
+                item = ready.get(timeout=_STOP_POLL_SECONDS)
+            except queue.Empty:
+                if stop.is_set():
+                    break
+                continue
+            if item is _Done:
+                break
+            job, images = item
+            try:
+                with span("pipeline", stage=STAGE_RENDER, job=job.name):
+                    output_path = render(job)
+            except Exception as exc:
+                _report(_failure(job, STAGE_RENDER, exc, images))
+                continue
+            _report(PipelineResult(job=job, images=images, output_path=output_path))
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+        _drain(failed, _report)
+    return results
+
+
+class _SharedIterator:
+    """Hands out the items of one iterator to several threads.
+
+    Once the iterator raises, every thread sees it as exhausted.
+    """
+
+    def __init__(self, items: Iterator[PipelineJob]) -> None:
+        self._items = items
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def __iter__(self) -> "_SharedIterator":
+        return self
+
+    def __next__(self) -> PipelineJob:
+        with self._lock:
+            if self._closed:
+                raise StopIteration
+            try:
+                return next(self._items)
+            except BaseException:
+                self._closed = True
+                raise
+
+
+def _failure(
+    job: PipelineJob, stage: str, exc: Exception, images: int = 0
+) -> PipelineResult:
+    return PipelineResult(
+        job=job, images=images, error=f"{type(exc).__name__}: {exc}", stage=stage
+    )
+
+
+def _put(target: queue.Queue, item, stop: threading.Event, force: bool = False) -> bool:
+    """Block until ``item`` fits; give up if the run stops, unless ``force``."""
+    while True:
+        if stop.is_set() and not force:
+            return False
+        try:
+            target.put(item, timeout=_STOP_POLL_SECONDS)
+            return True
+        except queue.Full:
+            if stop.is_set():
+                # Nobody drains a stopped run; dropping the marker is safe.
+                return False
+
+
+def _get(source: queue.Queue, stop: threading.Event):
+    """Next item, or None once the run stops while nothing is queued."""
+    while True:
+        try:
+            return source.get(timeout=_STOP_POLL_SECONDS)
+        except queue.Empty:
+            if stop.is_set():
+                return None
+
+
+def _drain(source: queue.Queue, report: Callable[[PipelineResult], None]) -> None:
+    while True:
+        try:
+            report(source.get_nowait())
+        except queue.Empty:
+            return
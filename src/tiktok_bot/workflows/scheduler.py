@@ -0,0 +1,242 @@
+import contextvars
+import heapq
+import itertools
+import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Hashable, Mapping, Optional
+
+from ..ports.schedule_store import ScheduleStore
+from ..utils.schedule import parse_run_at
+from ..utils.telemetry import span
+
+
+@dataclass(frozen=True)
+class ScheduledItem:
+    name: str
+    run_at: datetime
+
+
+def load_pending_items(store: ScheduleStore) -> dict[str, ScheduledItem]:
+    """Rows that are not uploaded yet and have a parseable ``Run at``."""
+    items: dict[str, ScheduledItem] = {}
+    for row in store.pending():
+        run_at = parse_run_at(row.run_at)
+        if run_at is None:
+            print(f"Skipping '{row.name}': cannot parse Run at {row.run_at!r}")
+            continue
+        items.setdefault(row.name, ScheduledItem(name=row.name, run_at=run_at))
+    return items
+
+
+class DueQueue:
+    """Min-heap of names by time; rescheduling or removing leaves stale entries
+    that are skipped when they reach the top."""
+
+    def __init__(self) -> None:
+        self._heap: list[tuple[datetime, int, str]] = []
+        self._live: dict[str, tuple[datetime, int, str]] = {}
+        self._counter = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    def push(self, name: str, when: datetime) -> None:
+        entry = (when, next(self._counter), name)
+        self._live[name] = entry
+        heapq.heappush(self._heap, entry)
+
+    def remove(self, name: str) -> None:
+        self._live.pop(name, None)
+
+    def peek(self) -> Optional[datetime]:
+        self._drop_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: datetime) -> list[str]:
+        due = []
+        while True:
+            self._drop_stale()
+            if not self._heap or self._heap[0][0] > now:
+                return due
+            _, _, name = heapq.heappop(self._heap)
+            del self._live[name]
+            due.append(name)
+
+    def _drop_stale(self) -> None:
+        while self._heap and self._live.get(self._heap[0][2]) is not self._heap[0]:
+            heapq.heappop(self._heap)
+
+
+class Scheduler:
+    """Watch the schedule and drive each pending row through prepare and due.
+
+    ``prepare`` (fetch images, render) runs on a worker pool from ``lead``
+    before ``Run at``; ``on_due`` runs at ``Run at`` with the prepared video
+    and returns True when the row was handled, which applies ``due_flags``.
+    Flags are ``ScheduleStore.set_flags`` keywords.
+    """
+
+    def __init__(
+        self,
+        store: ScheduleStore,
+        prepare: Callable[[ScheduledItem], Path],
+        on_due: Callable[[ScheduledItem, Path], bool],
+        lead: timedelta = timedelta(minutes=30),
+        max_lateness: timedelta = timedelta(minutes=15),
+        poll_interval: float = 5.0,
+        prepare_workers: int = 1,
+        prepared_flags: Optional[Mapping[str, bool]] = None,
+        due_flags: Optional[Mapping[str, bool]] = None,
+        clock: Callable[[], datetime] = datetime.now,
+    ) -> None:
+        self._store = store
+        self._prepare = prepare
+        self._on_due = on_due
+        self._lead = lead
+        self._max_lateness = max_lateness
+        self._poll_interval = poll_interval
+        self._prepared_flags = dict(prepared_flags or {})
+        self._due_flags = dict(due_flags or {})
+        self._clock = clock
+        self._executor = ThreadPoolExecutor(
+            max_workers=prepare_workers, thread_name_prefix="prepare"
+        )
+        self._items: dict[str, ScheduledItem] = {}
+        self._prepare_queue = DueQueue()
+        self._due_queue = DueQueue()
+        self._prepared: dict[str, Future] = {}
+        self._recorded: set[str] = set()
+        self._revision: Optional[Hashable] = None
+
+    def refresh(self) -> bool:
+        """Reload the schedule if it changed and apply the difference."""
+        try:
+            revision = self._store.revision()
+            if revision == self._revision:
+                return False
+            items = load_pending_items(self._store)
+        except (OSError, ValueError, KeyError) as exc:
+            # Most likely caught mid-edit; retry on the next poll.
+            print(f"Could not read the schedule: {exc}", file=sys.stderr)
+            return False
+        self._revision = revision
+
+        for name in self._items.keys() - items.keys():
+            self._prepare_queue.remove(name)
+            self._due_queue.remove(name)
+            self._forget(name)
+        added = changed = 0
+        for name, item in items.items():
+            previous = self._items.get(name)
+            if previous == item:
+                continue
+            if previous is None:
+                added += 1
+            else:
+                changed += 1
+            self._prepare_queue.push(name, item.run_at - self._lead)
+            self._due_queue.push(name, item.run_at)
+        removed = len(self._items.keys() - items.keys())
+        self._items = items
+        if added or changed or removed:
+            print(
+                f"Schedule updated: {added} added, {changed} rescheduled, "
+                f"{removed} removed ({len(self._due_queue)} pending)"
+            )
+        return True
+
+    def run_pending(self) -> float:
+        """Handle everything that is due now; return seconds until the next event."""
+        self.refresh()
+        now = self._clock()
+        for name in self._prepare_queue.pop_due(now):
+            item = self._items[name]
+            # Rows already too late to post are skipped by _fire; preparing
+            # them would only fetch and render a video nobody uses.
+            if not self._is_stale(item, now):
+                self._start_prepare(item)
+        self._record_prepared()
+        for name in self._due_queue.pop_due(now):
+            self._fire(self._items[name], now)
+
+        upcoming = [
+            when
+            for when in (self._prepare_queue.peek(), self._due_queue.peek())
+            if when is not None
+        ]
+        wait = min(
+            [(when - now).total_seconds() for when in upcoming],
+            default=self._poll_interval,
+        )
+        return max(0.0, min(wait, self._poll_interval))
+
+    def run_forever(self, stop: threading.Event) -> None:
+        try:
+            while not stop.is_set():
+                stop.wait(self.run_pending())
+        finally:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def _start_prepare(self, item: ScheduledItem) -> Future:
+        future = self._prepared.get(item.name)
+        if future is None or (future.done() and future.exception() is not None):
+            print(f"Preparing '{item.name}' due {item.run_at:%d.%m.%Y %H:%M}")
+            future = self._executor.submit(
+                contextvars.copy_context().run, self._run_prepare, item
+            )
+            self._prepared[item.name] = future
+        return future
+
+    def _record_prepared(self) -> None:
+        # CSV writes stay on the scheduler thread; workers only return paths.
+        for name, future in list(self._prepared.items()):
+            if name in self._recorded or not future.done():
+                continue
+            if future.exception() is not None:
+                print(
+                    f"Failed to prepare '{name}': {future.exception()}", file=sys.stderr
+                )
+                del self._prepared[name]
+                continue
+            self._recorded.add(name)
+            print(f"Prepared '{name}': {future.result()}")
+            self._store.set_flags(name, **self._prepared_flags)
+
+    def _forget(self, name: str) -> None:
+        self._prepared.pop(name, None)
+        self._recorded.discard(name)
+
+    def _run_prepare(self, item: ScheduledItem) -> Path:
+        with span("prepare", row=item.name):
+            return self._prepare(item)
+
+    def _is_stale(self, item: ScheduledItem, now: datetime) -> bool:
+        return now - item.run_at > self._max_lateness
+
+    def _fire(self, item: ScheduledItem, now: datetime) -> None:
+        if self._is_stale(item, now):
+            print(f"Skipping '{item.name}': due {item.run_at:%d.%m.%Y %H:%M} has passed")
+            self._forget(item.name)
+            return
+        future = self._start_prepare(item)
+        with span("due", row=item.name) as current:
+            try:
+                # Normally finished long ago; otherwise the row is late by
+                # however long the rest of the preparation takes.
+                video_path = future.result()
+            except Exception as exc:
+                current.set(failed=str(exc))
+                print(f"Failed to prepare '{item.name}': {exc}", file=sys.stderr)
+                self._forget(item.name)
+                return
+            self._record_prepared()
+            handled = self._on_due(item, video_path)
+            current.set(handled=handled)
+        self._forget(item.name)
+        if handled:
+            self._store.set_flags(item.name, **self._due_flags)
+
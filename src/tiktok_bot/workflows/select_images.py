@@ -0,0 +1,177 @@
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Sequence
+
+from PIL import Image
+
+from ..ports.image_catalog import ImageCatalog
+from ..utils.bk_tree import BKTree
+from ..utils.image_hash import (
+    dhash_batch,
+    hamming_distance,
+    laplacian_variance,
+    load_thumbnail,
+    oriented_size,
+)
+from ..utils.telemetry import span
+
+# How much resolution, framing and sharpness count towards an image's score.
+_RESOLUTION_WEIGHT = 0.4
+_FIT_WEIGHT = 0.3
+_SHARPNESS_WEIGHT = 0.3
+
+
+@dataclass(frozen=True)
+class ImageCandidate:
+    index: int
+    path: Path
+    # Oriented size from the file header.
+    width: int
+    height: int
+    phash: str
+    # Variance of the Laplacian of the thumbnail; higher is sharper.
+    sharpness: float
+
+    @property
+    def pixels(self) -> int:
+        return self.width * self.height
+
+    def resolution_score(self, width: int, height: int) -> float:
+        """1.0 when the image covers the frame without upscaling."""
+        return min(1.0, self.width / width, self.height / height)
+
+    def fit_score(self, width: int, height: int) -> float:
+        """Share of the image left after cover-cropping it to the frame."""
+        aspect = self.width / self.height
+        target = width / height
+        return min(aspect, target) / max(aspect, target)
+
+
+def describe_candidates(
+    images: Sequence[Path], catalog: Optional[ImageCatalog] = None
+) -> list[ImageCandidate]:
+    """Header size, perceptual hash and sharpness of each image.
+
+    Images the ``catalog`` already describes are not opened; the rest are
+    decoded once to a small thumbnail. Images that fail to decode are left
+    out with a message; they would stop the render later anyway.
+    """
+    candidates: list[ImageCandidate] = []
+    loaded: list[tuple[int, Path, int, int, Image.Image]] = []
+    for index, path in enumerate(images):
+        info = catalog.info_for(path) if catalog is not None else None
+        if info is not None and not info.decodes:
+            print(f"Skipping unreadable image {path.name}: {info.error}")
+            continue
+        if (
+            info is not None
+            and info.phash
+            and info.sharpness is not None
+            and info.width
+            and info.height
+        ):
+            candidates.append(
+                ImageCandidate(
+                    index=index,
+                    path=path,
+                    width=info.width,
+                    height=info.height,
+                    phash=info.phash,
+                    sharpness=info.sharpness,
+                )
+            )
+            continue
+        thumbnail = _load_thumbnail(path)
+        if thumbnail is None:
+            continue
+        loaded.append((index, path, *thumbnail))
+    hashes = dhash_batch([item[4] for item in loaded])
+    candidates.extend(
+        ImageCandidate(
+            index=index,
+            path=path,
+            width=width,
+            height=height,
+            phash=phash,
+            sharpness=laplacian_variance(thumbnail),
+        )
+        for (index, path, width, height, thumbnail), phash in zip(loaded, hashes)
+    )
+    return sorted(candidates, key=lambda item: item.index)
+
+
+def drop_near_duplicates(
+    candidates: Sequence[ImageCandidate], max_distance: int
+) -> list[ImageCandidate]:
+    """Keep the highest-resolution image of each group of near-duplicates.
+
+    Two images are near-duplicates when their hashes differ in at most
+    ``max_distance`` bits. The survivors keep their original order.
+    """
+    tree: BKTree[str] = BKTree(hamming_distance)
+    kept = []
+    # Best copies first, so each group is represented by its largest image.
+    for candidate in sorted(candidates, key=lambda item: (-item.pixels, item.index)):
+        if tree.search(candidate.phash, max_distance):
+            continue
+        tree.add(candidate.phash)
+        kept.append(candidate)
+    return sorted(kept, key=lambda item: item.index)
+
+
+def top_candidates(
+    candidates: Sequence[ImageCandidate], limit: int, width: int, height: int
+) -> list[ImageCandidate]:
+    """The ``limit`` best-scoring candidates for a ``width`` x ``height``
+    frame, in their original order.
+
+    Resolution and framing are scored against the frame; sharpness against
+    the sharpest candidate, since its scale depends on the content.
+    """
+    if len(candidates) <= limit:
+        return list(candidates)
+    sharpest = max(candidate.sharpness for candidate in candidates) or 1.0
+
+    def _score(candidate: ImageCandidate) -> float:
+        return (
+            _RESOLUTION_WEIGHT * candidate.resolution_score(width, height)
+            + _FIT_WEIGHT * candidate.fit_score(width, height)
+            + _SHARPNESS_WEIGHT * candidate.sharpness / sharpest
+        )
+
+    ranked = sorted(candidates, key=lambda item: (-_score(item), item.index))
+    return sorted(ranked[:limit], key=lambda item: item.index)
+
+
+def select_images(
+    images: Sequence[Path],
+    limit: int,
+    width: int,
+    height: int,
+    max_distance: Optional[int] = None,
+    catalog: Optional[ImageCatalog] = None,
+) -> list[Path]:
+    """Up to ``limit`` images worth rendering in a ``width`` x ``height``
+    video, in folder order.
+
+    Near-duplicates are dropped first unless ``max_distance`` is None.
+    """
+    with span("select_images", images=len(images)) as current:
+        candidates = describe_candidates(images, catalog)
+        if max_distance is not None:
+            candidates = drop_near_duplicates(candidates, max_distance)
+            current.set(unique=len(candidates))
+        candidates = top_candidates(candidates, limit, width, height)
+        current.set(kept=len(candidates))
+    return [candidate.path for candidate in candidates]
+
+
+def _load_thumbnail(path: Path) -> Optional[tuple[int, int, Image.Image]]:
+    try:
+        with Image.open(path) as image:
+            width, height = oriented_size(image)
+            thumbnail = load_thumbnail(image)
+    except (OSError, ValueError, Image.DecompressionBombError) as exc:
+        print(f"Skipping unreadable image {path.name}: {exc}")
+        return None
+    return width, height, thumbnail
@@ -0,0 +1,10 @@
+from tiktok_bot.cli.startup import DEFAULT_BUDGET_MS, measure_startup
+
+
+def test_cli_starts_within_budget_without_heavy_imports():
+    best, heavy = measure_startup(runs=5)
+
+    assert not heavy, f"loaded at startup: {', '.join(sorted(heavy))}"
+    assert best <= DEFAULT_BUDGET_MS, (
+        f"CLI import took {best:.1f} ms, budget is {DEFAULT_BUDGET_MS:g} ms"
+    )